@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f"accounts:user:{user_id}"
+
+
+def invalidate_user(sender, instance, **kwargs):
+    """Descarta el usuario cacheado al modificarlo o eliminarlo."""
+    cache.delete(user_cache_key(instance.pk))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend que guarda en la caché el usuario de la sesión.
+
+    AuthenticationMiddleware llama a get_user() en cada request
+    autenticado; con este backend la consulta a auth_user se hace una vez
+    por usuario y vida de la caché (AUTH_USER_CACHE_TIMEOUT). Los cambios
+    en el usuario (incluida la contraseña, que invalida la sesión) lo
+    descartan por medio de las señales de accounts.apps.
+
+    Los permisos no se cachean: se siguen consultando cuando se usan.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
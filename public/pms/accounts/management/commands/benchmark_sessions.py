@@ -0,0 +1,152 @@
+import importlib.util
+import os
+import time
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from pms import settings as base_settings
+
+# Configuración previa: sesiones en la base de datos y sin caché del
+# usuario (valores por defecto de pms/settings.py)
+BEFORE = {
+    "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+    "AUTHENTICATION_BACKENDS": base_settings.AUTHENTICATION_BACKENDS,
+    "AXES_HANDLER": "axes.handlers.database.AxesDatabaseHandler",
+}
+
+# Caché en memoria para medir en un único proceso: la cantidad de
+# consultas no depende del backend de caché
+LOCMEM = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmark-sessions",
+    }
+}
+
+
+def production_profile(cache_backend):
+    """
+    Sesiones, backends y handler de axes que pms/settings_production.py
+    elige con CACHE_BACKEND=cache_backend.
+    """
+    previous = os.environ.get("CACHE_BACKEND")
+    os.environ["CACHE_BACKEND"] = cache_backend
+    try:
+        # Módulo nuevo en cada llamada: importlib.reload conservaría los
+        # ajustes de la carga anterior (por ejemplo AXES_HANDLER)
+        spec = importlib.util.find_spec("pms.settings_production")
+        production = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(production)
+    finally:
+        if previous is None:
+            del os.environ["CACHE_BACKEND"]
+        else:
+            os.environ["CACHE_BACKEND"] = previous
+    return {
+        "CACHES": LOCMEM,
+        "SESSION_ENGINE": production.SESSION_ENGINE,
+        "AUTHENTICATION_BACKENDS": production.AUTHENTICATION_BACKENDS,
+        "AXES_HANDLER": getattr(
+            production, "AXES_HANDLER", BEFORE["AXES_HANDLER"]
+        ),  # noqa
+    }
+
+
+# Tablas que se informan por separado
+TABLES = {
+    "django_session": "sesión",
+    "auth_user": "usuario",
+    "axes_": "axes",
+}
+
+
+class _Rollback(Exception):
+    """Se usa para descartar los datos sembrados al terminar."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara las consultas por request autenticado con sesiones en la "
+        "base de datos y con el perfil de producción (sesiones y usuario "
+        "cacheados) con CACHE_BACKEND file/locmem (axes en la base de datos) "
+        "y redis (axes en la caché)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Ruta a pedir (por defecto, el dashboard)",
+        )
+
+    def handle(self, *args, **options):
+        url = options["url"] or reverse("dashboard")
+        try:
+            with transaction.atomic():
+                User.objects.create_user(
+                    username="benchmark", password="benchmark-secret"
+                )  # noqa
+                profiles = [
+                    ("Antes", BEFORE),
+                    ("Después (file/locmem)", production_profile("file")),
+                    ("Después (redis)", production_profile("redis")),
+                ]
+                for label, profile in profiles:
+                    with override_settings(**profile):
+                        self.measure(label, url, options["requests"])
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write("Datos sembrados descartados.")
+
+    def measure(self, label, url, requests):
+        client = Client(HTTP_HOST="localhost")
+
+        with CaptureQueriesContext(connection) as ctx:
+            client.post(
+                reverse("login"),
+                {"username": "benchmark", "password": "benchmark-secret"},
+            )
+        login = self.by_table(ctx.captured_queries)
+
+        # Primer request fuera de la medición: carga las cachés
+        client.get(url)
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            self.stderr.write(f"{url} respondió {response.status_code}")
+        per_request = self.by_table(ctx.captured_queries, requests)
+
+        timings.sort()
+        self.stdout.write(
+            f"{label}: login {self.format(login)}; "
+            f"por request {self.format(per_request)}; "
+            f"p50={timings[len(timings) // 2] * 1000:.1f}ms"
+        )
+
+    def by_table(self, queries, requests=1):
+        counts = Counter()
+        for query in queries:
+            sql = query["sql"]
+            counts["total"] += 1
+            for table, name in TABLES.items():
+                if f'"{table}' in sql:
+                    counts[name] += 1
+        return {name: count / requests for name, count in counts.items()}
+
+    def format(self, counts):
+        parts = [f"{counts.get('total', 0):.1f} consultas"]
+        parts += [
+            f"{name} {counts.get(name, 0):.1f}" for name in TABLES.values()
+        ]  # noqa
+        return ", ".join(parts)
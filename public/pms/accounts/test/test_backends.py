@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.backends import CachedModelBackend
+from accounts.management.commands.benchmark_sessions import production_profile
+
+PRODUCTION = {
+    "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+    "AUTHENTICATION_BACKENDS": [
+        "axes.backends.AxesStandaloneBackend",
+        "accounts.backends.CachedModelBackend",
+    ],
+}
+
+
+class CachedModelBackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reception", password="x")  # noqa
+        self.backend = CachedModelBackend()
+
+    def test_user_is_cached(self):
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+
+    def test_invalidated_on_save(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_invalidated_on_delete(self):
+        self.backend.get_user(self.user.pk)
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(user_id))
+
+    @override_settings(**PRODUCTION)
+    def test_authenticated_request_skips_session_and_user(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("dashboard"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        tables = " ".join(query["sql"] for query in ctx.captured_queries)
+        self.assertNotIn('"django_session"', tables)
+        self.assertNotIn('"auth_user"', tables)
+
+    @override_settings(**PRODUCTION)
+    def test_password_change_ends_session(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("dashboard"))
+
+        self.user.set_password("changed")
+        self.user.save()
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 302)
+
+
+class BenchmarkProfileTest(TestCase):
+    def test_axes_uses_the_cache_only_with_redis(self):
+        for backend, handler in (
+            ("file", "axes.handlers.database.AxesDatabaseHandler"),
+            ("locmem", "axes.handlers.database.AxesDatabaseHandler"),
+            ("redis", "axes.handlers.cache.AxesCacheHandler"),
+        ):
+            with self.subTest(backend=backend):
+                profile = production_profile(backend)
+                self.assertEqual(profile["AXES_HANDLER"], handler)
+                backends = profile["AUTHENTICATION_BACKENDS"]
+                self.assertIn("accounts.backends.CachedModelBackend", backends)
+                self.assertNotIn(
+                    "django.contrib.auth.backends.ModelBackend", backends
+                )  # noqa
@@ -1,7 +1,23 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
+from django.utils import timezone
+
+from payments.models import CashRegisterEntry
+from reports.kpis import PERIOD_DAYS, dashboard_kpis
 
 
 @login_required
 def dashboard(request):
-    return render(request, "accounts/dashboard.html")
+    """Indicadores operativos por propiedad leídos de la tabla diaria."""
+    today = timezone.localdate()
+    return render(
+        request,
+        "accounts/dashboard.html",
+        {
+            "today": today,
+            "month_start": today.replace(day=1),
+            "period_days": PERIOD_DAYS,
+            "kpis": dashboard_kpis(today),
+            "cash_balance": CashRegisterEntry.get_current_balance(),
+        },
+    )
@@ -0,0 +1,165 @@
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from knox.auth import TokenAuthentication
+from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+from bookings.availability import find_available_units
+from rooms.models import Property, Unit
+from rooms.pricing import RateCalendar
+
+from . import serializers
+from .views import availability_results
+
+
+def api_response(data, status=200, **kwargs):
+    """JsonResponse con el mismo formato que las respuestas de DRF."""
+    return JsonResponse(data, status=status, encoder=JSONEncoder, **kwargs)
+
+
+def token_required(view):
+    """
+    Autentica el request con el token de knox, como la API sincrónica.
+
+    DRF no admite vistas async: la autenticación (una consulta) corre en
+    el hilo sincrónico del request y el usuario queda en request.user.
+    """
+    authentication = TokenAuthentication()
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await sync_to_async(authentication.authenticate)(request)
+        except exceptions.AuthenticationFailed as error:
+            result, detail = None, error.detail
+        else:
+            detail = exceptions.NotAuthenticated.default_detail
+        if result is None:
+            header = authentication.authenticate_header(request)
+            return api_response(
+                {"detail": str(detail)},
+                status=401,
+                headers={"WWW-Authenticate": header},
+            )
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+async def available_in_property(property_id, params):
+    """Unidades libres de una propiedad."""
+    return [
+        unit
+        async for unit in find_available_units(
+            params["check_in"],
+            params["check_out"],
+            property=property_id,
+            room_type=params.get("room_type"),
+            capacity=params.get("capacity"),
+        )
+    ]
+
+
+@require_GET
+@token_required
+async def availability(request):
+    """
+    Versión async de AvailabilityView, para servir con ASGI
+    (SERVER_MODE=asgi, ver gunicorn.conf.py).
+
+    Busca en cada propiedad por separado y lanza las búsquedas juntas con
+    asyncio.gather; después cotiza todas las unidades de una vez. Mientras
+    esperan a la base de datos, el event loop atiende otros requests.
+    Devuelve las mismas filas y en el mismo orden que la vista
+    sincrónica.
+    """
+    query = serializers.AvailabilityQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return api_response(query.errors, status=400)
+    params = query.validated_data
+
+    if params.get("property") is not None:
+        properties = [params["property"]]
+    else:
+        properties = [
+            pk
+            async for pk in Property.objects.filter(is_active=True)
+            .order_by("name")
+            .values_list("pk", flat=True)
+        ]
+
+    results = await asyncio.gather(
+        *(available_in_property(pk, params) for pk in properties)
+    )
+    units = [unit for units in results for unit in units]
+    if not units:
+        return api_response({"results": []})
+
+    # Las tarifas salen de la caché de rooms.cache, que es sincrónica
+    rates = await sync_to_async(RateCalendar)(
+        units, params["check_in"], params["check_out"]
+    )
+    return api_response({"results": availability_results(units, rates)})
+
+
+@require_GET
+@token_required
+async def quote(request):
+    """
+    Cotización de una o más unidades (?unit=1&unit=2) para una estadía.
+
+    Las unidades y su disponibilidad se piden juntas con asyncio.gather.
+    Las unidades ocupadas o inactivas se cotizan igual, con
+    "available": false.
+    """
+    query = serializers.QuoteQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return api_response(query.errors, status=400)
+    params = query.validated_data
+    unit_ids = list(dict.fromkeys(params["unit"]))
+
+    async def available_ids():
+        return {
+            pk
+            async for pk in find_available_units(
+                params["check_in"], params["check_out"]
+            )
+            .filter(pk__in=unit_ids)
+            .values_list("pk", flat=True)
+        }
+
+    units, available = await asyncio.gather(
+        Unit.objects.select_related("room").ain_bulk(unit_ids),
+        available_ids(),
+    )
+    missing = [pk for pk in unit_ids if pk not in units]
+    if missing:
+        return api_response(
+            {"unit": [f"No existen las unidades {missing}"]}, status=400
+        )
+
+    rates = await sync_to_async(RateCalendar)(
+        units.values(), params["check_in"], params["check_out"]
+    )
+    return api_response(
+        {
+            "check_in": params["check_in"],
+            "check_out": params["check_out"],
+            "results": [
+                {
+                    "unit": pk,
+                    "unit_name": units[pk].name,
+                    "room": units[pk].room_id,
+                    "available": pk in available,
+                    "total_price": rates.total(pk),
+                    "nightly_prices": rates.prices(pk),
+                }
+                for pk in unit_ids
+            ],
+        }
+    )
@@ -0,0 +1,127 @@
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from bookings.models import Booking
+from bookings.signals import bookings_bulk_changed
+from payments.models import Payment
+from payments.signals import payments_bulk_changed
+from rooms.models import Plan
+
+from .models import Change
+
+# Modelos publicados en el feed, por nombre público
+TRACKED_MODELS = {
+    "booking": Booking,
+    "plan": Plan,
+    "payment": Payment,
+}
+
+MODEL_NAMES = {model: name for name, model in TRACKED_MODELS.items()}
+
+# Transacción en curso más antigua: las anteriores ya terminaron y sus
+# cambios no pueden aparecer después
+OLDEST_ACTIVE_TXID = RawSQL(
+    "pg_snapshot_xmin(pg_current_snapshot())::text::bigint", []
+)  # noqa
+
+
+def record_changes(model, object_ids, action="UPSERT"):
+    """
+    Registra cambios en el feed para un conjunto de objetos.
+
+    Las operaciones en lote (QuerySet.update(), bulk_create()) no disparan
+    señales, por lo que deben llamar a esta función explícitamente.
+    """
+    Change.objects.bulk_create(
+        Change(model=MODEL_NAMES[model], object_id=object_id, action=action)
+        for object_id in object_ids
+    )
+
+
+def on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_changes(sender, [instance.pk])
+
+
+def on_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], action="DELETE")
+
+
+def on_bookings_bulk_changed(sender, booking_ids, **kwargs):
+    record_changes(Booking, booking_ids)
+
+
+def on_payments_bulk_changed(sender, payment_ids, **kwargs):
+    record_changes(Payment, payment_ids)
+
+
+def connect_signals():
+    bookings_bulk_changed.connect(
+        on_bookings_bulk_changed, dispatch_uid="feed_bookings_bulk"
+    )
+    payments_bulk_changed.connect(
+        on_payments_bulk_changed, dispatch_uid="feed_payments_bulk"
+    )
+    for model in TRACKED_MODELS.values():
+        post_save.connect(on_save, sender=model, dispatch_uid=f"feed_{model}")
+        post_delete.connect(
+            on_delete, sender=model, dispatch_uid=f"feed_delete_{model}"
+        )
+
+
+def read_changes(since=0, limit=500, models=None):
+    """
+    Lee una página del feed de cambios posteriores al cursor `since`.
+
+    Dentro de la página se conserva solo el último cambio de cada objeto,
+    y los objetos vigentes se cargan con una consulta por modelo.
+
+    La secuencia se toma al insertar el cambio, pero la transacción que lo
+    insertó puede confirmarse mucho después que otras con secuencias
+    mayores (una importación o un lote de archivado). Por eso el feed se
+    recorre en orden de transacción y luego de secuencia, y solo hasta la
+    transacción en curso más antigua: los cambios de las transacciones
+    anteriores son definitivos y los que se confirmen después quedan
+    siempre detrás del cursor.
+
+    Returns:
+        tuple: (cambios, cursor, hay_más) donde cada cambio es
+            (modelo, id, acción, número de secuencia)
+    """
+    changes = Change.objects.filter(txid__lt=OLDEST_ACTIVE_TXID).order_by(
+        "txid", "pk"
+    )  # noqa
+    if since:
+        txid = (
+            Change.objects.filter(pk=since)
+            .values_list("txid", flat=True)
+            .first()  # noqa
+        )  # noqa
+        if txid is None:
+            # El cambio del cursor ya se depuró (prune_changes)
+            changes = changes.filter(pk__gt=since)
+        else:
+            changes = changes.filter(
+                Q(txid__gt=txid) | Q(txid=txid, pk__gt=since)
+            )  # noqa
+    if models:
+        changes = changes.filter(model__in=models)
+
+    rows = list(
+        changes.values_list("pk", "model", "object_id", "action")[: limit + 1]
+    )  # noqa
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest = {}
+    for seq, model, object_id, action in rows:
+        latest.pop((model, object_id), None)
+        latest[(model, object_id)] = (action, seq)
+
+    result = [
+        (model, object_id, action, seq)
+        for (model, object_id), (action, seq) in latest.items()
+    ]
+    cursor = rows[-1][0] if rows else since
+    return result, cursor, has_more
@@ -0,0 +1,85 @@
+from django_filters import rest_framework as filters
+
+from bookings.models import ArchivedBooking, Booking
+from guests.models import Guest
+from payments.models import Payment
+from rooms.models import Property, Room, Unit
+
+
+class PropertyFilter(filters.FilterSet):
+    class Meta:
+        model = Property
+        fields = ["property_type", "is_active"]
+
+
+class RoomFilter(filters.FilterSet):
+    class Meta:
+        model = Room
+        fields = ["property", "room_type", "is_active"]
+
+
+class UnitFilter(filters.FilterSet):
+    property = filters.NumberFilter(field_name="room__property")
+
+    class Meta:
+        model = Unit
+        fields = ["room", "property", "unit_type", "is_active"]
+
+
+class BookingFilter(filters.FilterSet):
+    status = filters.MultipleChoiceFilter(choices=Booking.STATUS_CHOICES)
+    property = filters.NumberFilter(field_name="unit__room__property")
+    check_in = filters.DateFromToRangeFilter(field_name="check_in_date")
+    check_out = filters.DateFromToRangeFilter(field_name="check_out_date")
+    # Estadías que se superponen con [stay_after, stay_before)
+    stay = filters.DateFromToRangeFilter(method="filter_stay")
+    updated_since = filters.IsoDateTimeFilter(
+        field_name="updated_at", lookup_expr="gte"
+    )
+    # Reservas activas que llegan o se van en la fecha indicada
+    arriving = filters.DateFilter(method="filter_arriving")
+    departing = filters.DateFilter(method="filter_departing")
+
+    class Meta:
+        model = Booking
+        fields = ["status", "unit", "guest", "property"]
+
+    def filter_stay(self, queryset, name, value):
+        if value.start is None and value.stop is None:
+            return queryset
+        return queryset.overlapping(value.start, value.stop)
+
+    def filter_arriving(self, queryset, name, value):
+        return queryset.arrivals(value)
+
+    def filter_departing(self, queryset, name, value):
+        return queryset.departures(value)
+
+
+class ArchivedBookingFilter(filters.FilterSet):
+    status = filters.MultipleChoiceFilter(choices=Booking.STATUS_CHOICES)
+    property = filters.NumberFilter(field_name="unit__room__property")
+    check_in = filters.DateFromToRangeFilter(field_name="check_in_date")
+
+    class Meta:
+        model = ArchivedBooking
+        fields = ["status", "unit", "guest", "property"]
+
+
+class PaymentFilter(filters.FilterSet):
+    payment_date = filters.IsoDateTimeFromToRangeFilter()
+
+    class Meta:
+        model = Payment
+        fields = [
+            "booking",
+            "status",
+            "payment_method",
+            "payment_type",
+        ]
+
+
+class GuestFilter(filters.FilterSet):
+    class Meta:
+        model = Guest
+        fields = ["document_type", "document_number", "email", "nationality"]
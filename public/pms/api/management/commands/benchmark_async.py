@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from knox.models import AuthToken
+
+from rooms.models import Property, Room, Unit
+
+from .loadtest import run_load, serve, summarize
+
+# Rutas que se comparan, con la misma consulta
+PATHS = {
+    "sync": "/api/v1/availability/",
+    "async": "/api/v1/async/availability/",
+}
+
+# Prefijo de las propiedades sembradas, que se eliminan al terminar
+PREFIX = "Async bench"
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra propiedades y compara, bajo carga concurrente, la "
+        "búsqueda de disponibilidad sincrónica (/api/v1/availability/) con "
+        "la async (/api/v1/async/availability/) en cada modo de gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--properties", type=int, default=10)
+        parser.add_argument(
+            "--units", type=int, default=20, help="Por propiedad"
+        )  # noqa
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=["wsgi", "asgi"],
+            default=["wsgi", "asgi"],
+        )
+        parser.add_argument("--port", type=int, default=8766)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        # El servidor corre en otro proceso: los datos se confirman y se
+        # eliminan al terminar
+        self.seed(options)
+        user = User.objects.create_user(username="benchmark-async")
+        instance, token = AuthToken.objects.create(user)
+        headers = {"Authorization": f"Token {token}"}
+
+        check_in = date.today() + timedelta(days=7)
+        query = urlencode(
+            {"check_in": check_in, "check_out": check_in + timedelta(days=2)}
+        )
+        try:
+            for mode in options["modes"]:
+                with serve(mode, options["port"]) as server:
+                    if not server.ready:
+                        self.stderr.write(
+                            f"{mode}: el servidor no inició\n{server.output()}"
+                        )
+                        continue
+                    url = f"http://localhost:{options['port']}"
+                    for label, path in PATHS.items():
+                        result = run_load(
+                            url, [f"{path}?{query}"], headers, options
+                        )  # noqa
+                        self.stdout.write(
+                            f"{mode}, vista {label}: {summarize(result)}"
+                        )  # noqa
+        finally:
+            user.delete()
+            Property.objects.filter(name__startswith=PREFIX).delete()
+
+    def seed(self, options):
+        properties = Property.objects.bulk_create(
+            Property(name=f"{PREFIX} {i}", property_type="HOSTEL")
+            for i in range(options["properties"])
+        )
+        rooms = Room.objects.bulk_create(
+            Room(
+                property=prop,
+                name=f"{PREFIX} room",
+                room_type="DORM",
+                capacity=4,
+                base_price=Decimal("20.00"),
+            )
+            for prop in properties
+        )
+        Unit.objects.bulk_create(
+            Unit(name=f"{i}", room=room)
+            for room in rooms
+            for i in range(options["units"])
+        )
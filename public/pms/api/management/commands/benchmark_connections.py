@@ -0,0 +1,157 @@
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.db.utils import load_backend
+
+# Configuraciones que se comparan. La primera es la de pms/settings.py
+# por defecto y la segunda, la del perfil de producción
+SCENARIOS = [
+    ("una conexión por request", {"CONN_MAX_AGE": 0}),
+    ("persistente", {"CONN_MAX_AGE": 600}),
+    (
+        "persistente con verificación",
+        {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+    ),
+]
+
+# Pool de psycopg 3 (DB_POOL=1), solo si el driver lo admite
+POOL_SCENARIO = (
+    "pool de psycopg 3",
+    {"CONN_MAX_AGE": 0, "pool": {"min_size": 1, "max_size": 2}},
+)
+
+
+def pool_available():
+    if not is_psycopg3:
+        return False
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@contextmanager
+def database(overrides):
+    """
+    Reemplaza la conexión por defecto del hilo por una con `overrides`
+    aplicados a su configuración, y la restaura al salir.
+
+    La clave "pool" se agrega a OPTIONS; sin ella, se quita el pool que
+    pudiera tener la configuración actual.
+    """
+    overrides = dict(overrides)
+    pool = overrides.pop("pool", None)
+    original = connections[DEFAULT_DB_ALIAS]
+    original.close()
+    if original.pool:
+        original.close_pool()
+
+    options = {
+        key: value
+        for key, value in original.settings_dict["OPTIONS"].items()
+        if key != "pool"
+    }
+    if pool:
+        options["pool"] = pool
+    settings_dict = {
+        **original.settings_dict,
+        "CONN_HEALTH_CHECKS": False,
+        **overrides,
+        "OPTIONS": options,
+    }
+    backend = load_backend(settings_dict["ENGINE"])
+    wrapper = backend.DatabaseWrapper(settings_dict, DEFAULT_DB_ALIAS)
+    connections[DEFAULT_DB_ALIAS] = wrapper
+    try:
+        yield wrapper
+    finally:
+        wrapper.close()
+        if wrapper.pool:
+            wrapper.close_pool()
+        connections[DEFAULT_DB_ALIAS] = original
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo de conectarse a PostgreSQL en cada request frente a "
+        "conexiones persistentes (CONN_MAX_AGE) y al pool de psycopg 3. "
+        "Para medir a través de pgbouncer, ejecutarlo con "
+        "DJANGO_SETTINGS_MODULE=pms.settings_pgbouncer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=5,
+            help="Consultas por request",
+        )
+
+    def handle(self, *args, **options):
+        scenarios = list(SCENARIOS)
+        if pool_available():
+            scenarios.append(POOL_SCENARIO)
+        else:
+            self.stdout.write(
+                "pool de psycopg 3: omitido (requiere psycopg[pool])"
+            )  # noqa
+
+        results = {}
+        for label, overrides in scenarios:
+            with database(overrides):
+                results[label] = self.measure(
+                    options["requests"], options["queries"]
+                )  # noqa
+            self.report(label, results[label])
+
+        baseline = results[SCENARIOS[0][0]]
+        persistent = results[SCENARIOS[1][0]]
+        overhead = baseline["mean"] - persistent["mean"]
+        self.stdout.write(
+            f"Costo de conexión por request: {overhead * 1000:.2f}ms "
+            f"({overhead / baseline['mean']:.0%} del request)"
+        )
+
+    def measure(self, requests, queries):
+        """
+        Simula `requests` requests con las señales que envía el handler
+        de Django, que cierran las conexiones según CONN_MAX_AGE, y cuenta
+        las sesiones de PostgreSQL usadas.
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+        timings = []
+        sessions = set()
+        # Un request previo fuera de la medición (abre el pool)
+        for index in range(requests + 1):
+            start = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_backend_pid()")
+                sessions.add(cursor.fetchone()[0])
+                for _ in range(queries - 1):
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            request_finished.send(sender=self.__class__)
+            if index:
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        return {
+            "mean": sum(timings) / len(timings),
+            "p50": timings[len(timings) // 2],
+            "p95": timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+            "sessions": len(sessions),
+        }
+
+    def report(self, label, result):
+        self.stdout.write(
+            f"{label}: media={result['mean'] * 1000:.2f}ms "
+            f"p50={result['p50'] * 1000:.2f}ms "
+            f"p95={result['p95'] * 1000:.2f}ms, "
+            f"sesiones de PostgreSQL={result['sessions']}"
+        )
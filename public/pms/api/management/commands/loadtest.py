@@ -0,0 +1,216 @@
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from itertools import cycle
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from knox.models import AuthToken
+
+
+def default_paths():
+    check_in = date.today() + timedelta(days=7)
+    check_out = check_in + timedelta(days=2)
+    return [
+        f"/api/v1/availability/?check_in={check_in}&check_out={check_out}",
+        "/api/v1/bookings/",
+        "/api/v1/rooms/",
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga contra un servidor HTTP. Con --modes levanta "
+        "gunicorn (gunicorn.conf.py) en cada modo, WSGI o ASGI, y compara "
+        "requests por segundo y latencias."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="http://localhost:8000",
+            help="Servidor ya iniciado (se ignora con --modes)",
+        )
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=["wsgi", "asgi"],
+            help="Levanta gunicorn en cada modo y lo mide",
+        )
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Ruta a pedir (repetible). Por defecto, endpoints de la API",
+        )
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument(
+            "--user",
+            help="Usuario para el token de la API (por defecto, uno temporal)",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or default_paths()
+
+        temporary = None
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+            if user is None:
+                raise CommandError(f"No existe el usuario {options['user']}")
+        else:
+            # El servidor corre en otro proceso: el usuario se confirma y
+            # se elimina (con su token) al terminar
+            user = temporary = User.objects.create_user(username="loadtest")
+        instance, token = AuthToken.objects.create(user)
+        headers = {"Authorization": f"Token {token}"}
+
+        try:
+            if not options["modes"]:
+                result = run_load(options["url"], paths, headers, options)
+                self.report(options["url"], result)
+                return
+            for mode in options["modes"]:
+                url = f"http://localhost:{options['port']}"
+                with serve(mode, options["port"]) as server:
+                    if not server.ready:
+                        self.stderr.write(
+                            f"{mode}: el servidor no inició\n{server.output()}"
+                        )
+                        continue
+                    self.report(mode, run_load(url, paths, headers, options))
+        finally:
+            instance.delete()
+            if temporary is not None:
+                temporary.delete()
+
+    def report(self, label, result):
+        self.stdout.write(f"{label}: {summarize(result)}")
+
+
+def summarize(result):
+    """Requests por segundo, percentiles de latencia y errores."""
+    latencies = sorted(result["latencies"])
+    if not latencies:
+        return "sin respuestas"
+
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)]
+
+    return (
+        f"{len(latencies)} requests, "
+        f"{len(latencies) / result['elapsed']:.0f} req/s, "
+        f"p50={percentile(0.5) * 1000:.1f}ms "
+        f"p95={percentile(0.95) * 1000:.1f}ms "
+        f"p99={percentile(0.99) * 1000:.1f}ms, "
+        f"errores={result['errors']}, "
+        f"estados={dict(sorted(result['statuses'].items()))}"
+    )
+
+
+def run_load(url, paths, headers, options):
+    """
+    Hilos con una conexión keep-alive cada uno, que piden las rutas en
+    ronda durante `duration` segundos.
+    """
+    parts = urlsplit(url)
+    lock = threading.Lock()
+    result = {"latencies": [], "errors": 0, "statuses": Counter()}
+    deadline = time.monotonic() + options["duration"]
+
+    def worker(offset):
+        connection = http.client.HTTPConnection(
+            parts.hostname, parts.port or 80, timeout=30
+        )
+        # Cada hilo arranca por una ruta distinta
+        first = offset % len(paths)
+        latencies, statuses, errors = [], Counter(), 0
+        for path in cycle(paths[first:] + paths[:first]):
+            if time.monotonic() >= deadline:
+                break
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status] += 1
+        connection.close()
+        with lock:
+            result["latencies"].extend(latencies)
+            result["errors"] += errors
+            result["statuses"].update(statuses)
+
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=worker, args=(offset,))
+        for offset in range(options["concurrency"])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+class serve:
+    """Levanta gunicorn en el modo indicado y lo detiene al salir."""
+
+    def __init__(self, mode, port, wait=30):
+        self.mode = mode
+        self.port = port
+        self.wait = wait
+        self.ready = False
+        self.log = tempfile.TemporaryFile()
+
+    def output(self, lines=5):
+        """Últimas líneas de la salida de gunicorn."""
+        self.log.seek(0)
+        return b"".join(self.log.readlines()[-lines:]).decode(errors="replace")
+
+    def __enter__(self):
+        env = {
+            **os.environ,
+            "SERVER_MODE": self.mode,
+            "GUNICORN_BIND": f"127.0.0.1:{self.port}",
+        }
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=self.log,
+        )
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline and self.process.poll() is None:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), 1).close()
+                self.ready = True
+                break
+            except OSError:
+                time.sleep(0.2)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Change
+
+
+class Command(BaseCommand):
+    help = "Elimina del feed de cambios los registros más antiguos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Conserva los cambios de los últimos N días",
+        )
+
+    def handle(self, *args, **options):
+        limit = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = Change.objects.filter(changed_at__lt=limit).delete()
+        self.stdout.write(f"Cambios eliminados: {deleted}")
@@ -0,0 +1,131 @@
+import http.client
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Codificaciones que anuncia el navegador simulado
+ACCEPT_ENCODING = "br, gzip"
+
+
+class AssetParser(HTMLParser):
+    """Junta las hojas de estilo y scripts que referencia una página."""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and attrs.get("rel") == "stylesheet":
+            self.assets.append(attrs.get("href"))
+        elif tag == "script" and attrs.get("src"):
+            self.assets.append(attrs["src"])
+
+
+def fetch(url, headers=None):
+    """
+    GET de `url` sin descomprimir la respuesta.
+
+    Returns:
+        tuple: (estado, encabezados, cuerpo, bytes transferidos), donde
+        los bytes incluyen la línea de estado y los encabezados
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(
+        parts.hostname, parts.port or 80, timeout=30
+    )
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    try:
+        connection.request("GET", path, headers=headers or {})
+        response = connection.getresponse()
+        body = response.read()
+    except (OSError, http.client.HTTPException) as error:
+        raise CommandError(f"{url}: {error}") from error
+    finally:
+        connection.close()
+    head = sum(
+        len(f"{key}: {value}\r\n") for key, value in response.getheaders()
+    )  # noqa
+    return response.status, response.headers, body, head + len(body) + 17
+
+
+def max_age(headers):
+    match = re.search(r"max-age=(\d+)", headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide los bytes que transfiere una página y sus estáticos en la "
+        "primera carga y al volver a cargarla, simulando la caché de un "
+        "navegador según Cache-Control, ETag y Last-Modified. Pensado para "
+        "el despliegue con nginx (docker-compose.prod.yml)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost")
+        parser.add_argument(
+            "--path",
+            default="/",
+            help="Página a cargar (por defecto, el login)",
+        )
+
+    def handle(self, *args, **options):
+        page_url = urljoin(options["url"], options["path"])
+        status, headers, body, transferred = fetch(page_url)
+        if status != 200:
+            raise CommandError(f"{page_url} respondió {status}")
+
+        parser = AssetParser()
+        parser.feed(body.decode(errors="replace"))
+        assets = [urljoin(page_url, asset) for asset in parser.assets if asset]
+        if not assets:
+            raise CommandError(f"{page_url} no referencia estáticos")
+
+        cache = {}
+        first = self.load(assets, cache)
+        repeat = self.load(assets, cache)
+        self.stdout.write(
+            f"Página: {transferred} bytes en cada carga "
+            f"(no se cachea, no se incluye abajo)"
+        )
+        self.report("Primera carga", first)
+        self.report("Segunda carga", repeat)
+
+    def load(self, assets, cache):
+        """
+        Pide cada estático como lo haría un navegador con la caché
+        `cache` ({url: encabezados}), que se actualiza con las respuestas.
+        """
+        rows = []
+        for url in assets:
+            cached = cache.get(url)
+            if cached is not None and max_age(cached) > 0:
+                # Vigente en la caché: el navegador no hace el request
+                rows.append((url, "caché", 0, cached))
+                continue
+
+            headers = {"Accept-Encoding": ACCEPT_ENCODING}
+            if cached is not None:
+                if cached.get("ETag"):
+                    headers["If-None-Match"] = cached["ETag"]
+                if cached.get("Last-Modified"):
+                    headers["If-Modified-Since"] = cached["Last-Modified"]
+            status, response, body, transferred = fetch(url, headers)
+            if status == 200:
+                cache[url] = response
+            rows.append((url, status, transferred, response))
+        return rows
+
+    def report(self, label, rows):
+        total = sum(transferred for url, status, transferred, headers in rows)
+        requests = sum(1 for row in rows if row[1] != "caché")
+        self.stdout.write(f"{label}: {total} bytes en {requests} requests")
+        for url, status, transferred, headers in rows:
+            self.stdout.write(
+                f"  {urlsplit(url).path}: {status}, {transferred} bytes, "
+                f"{headers.get('Content-Encoding', 'sin comprimir')}, "
+                f"Cache-Control: {headers.get('Cache-Control', '-')}"
+            )
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=32, verbose_name="Modelo")),
+                ("object_id", models.BigIntegerField(verbose_name="ID del objeto")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("UPSERT", "Alta o modificación"), ("DELETE", "Baja")],
+                        max_length=6,
+                        verbose_name="Acción",
+                    ),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha del cambio"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cambio",
+                "verbose_name_plural": "Cambios",
+                "indexes": [
+                    models.Index(
+                        fields=["changed_at"], name="api_change_changed_b92375_idx"
+                    )
+                ],
+            },
+        ),
+    ]
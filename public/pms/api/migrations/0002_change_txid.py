@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:47
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_change"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="change",
+            name="txid",
+            field=models.BigIntegerField(
+                db_default=django.db.models.expressions.RawSQL(
+                    "pg_current_xact_id()::text::bigint", []
+                ),
+                editable=False,
+                verbose_name="Transacción",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                fields=["txid", "id"], name="api_change_txid_dfd289_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import models
+from django.db.models.expressions import RawSQL
+from django.utils.translation import gettext_lazy as _
+
+
+class Change(models.Model):
+    """
+    Feed incremental de cambios para la sincronización de canales.
+
+    Cada alta, modificación o baja de las entidades sincronizadas agrega
+    una fila con un identificador creciente (la secuencia del feed). Los
+    clientes consultan los cambios posteriores a su último cursor, por lo
+    que el costo de sincronizar depende del volumen de cambios y no del
+    tamaño de las tablas. Las bajas se publican como tombstones.
+
+    La secuencia se asigna al insertar y no al confirmar: el feed se lee
+    en orden de transacción (`txid`) y solo hasta la transacción en curso
+    más antigua (ver api.changes.read_changes).
+    """
+
+    ACTION_CHOICES = [
+        ("UPSERT", _("Alta o modificación")),
+        ("DELETE", _("Baja")),
+    ]
+
+    model = models.CharField(max_length=32, verbose_name=_("Modelo"))
+
+    object_id = models.BigIntegerField(verbose_name=_("ID del objeto"))
+
+    action = models.CharField(
+        max_length=6,
+        choices=ACTION_CHOICES,
+        verbose_name=_("Acción"),
+    )
+
+    changed_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Fecha del cambio")
+    )
+
+    # Transacción que registró el cambio, asignada por la base de datos
+    txid = models.BigIntegerField(
+        db_default=RawSQL("pg_current_xact_id()::text::bigint", []),
+        editable=False,
+        verbose_name=_("Transacción"),
+    )
+
+    class Meta:
+        verbose_name = _("Cambio")
+        verbose_name_plural = _("Cambios")
+        indexes = [
+            models.Index(fields=["changed_at"]),
+            models.Index(fields=["txid", "id"]),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Paginación por cursor sobre la clave primaria.
+
+    A diferencia de la paginación por página/offset, el costo de cada
+    página no crece con la profundidad y los resultados no se desplazan
+    cuando se insertan filas nuevas entre dos consultas.
+    """
+
+    ordering = "-id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
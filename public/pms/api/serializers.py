@@ -0,0 +1,238 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from bookings.models import ArchivedBooking, Booking
+from guests.models import Guest
+from payments.models import ArchivedPayment, Payment
+from rooms.models import Plan, Property, Room, Unit
+
+
+class PropertySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Property
+        fields = [
+            "id",
+            "name",
+            "property_type",
+            "description",
+            "address",
+            "is_active",
+            "updated_at",
+        ]
+
+
+class RoomSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Room
+        fields = [
+            "id",
+            "property",
+            "name",
+            "room_type",
+            "capacity",
+            "base_price",
+            "description",
+            "is_active",
+            "updated_at",
+        ]
+
+
+class UnitSerializer(serializers.ModelSerializer):
+    property = serializers.IntegerField(source="room.property_id")
+    room_name = serializers.CharField(source="room.name")
+
+    class Meta:
+        model = Unit
+        fields = [
+            "id",
+            "name",
+            "unit_type",
+            "room",
+            "room_name",
+            "property",
+            "is_active",
+            "updated_at",
+        ]
+
+
+class PlanSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Plan
+        fields = [
+            "id",
+            "name",
+            "room",
+            "start_date",
+            "end_date",
+            "price",
+            "is_active",
+            "updated_at",
+        ]
+
+
+class GuestSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Guest
+        fields = [
+            "id",
+            "name",
+            "document_type",
+            "document_number",
+            "birth_date",
+            "phone_number",
+            "nationality",
+            "email",
+            "updated_at",
+        ]
+
+
+class BookingSerializer(serializers.ModelSerializer):
+    guest_name = serializers.CharField(source="guest.name", read_only=True)
+    property = serializers.IntegerField(
+        source="unit.room.property_id", read_only=True
+    )  # noqa
+    payment_status = serializers.CharField(
+        source="get_payment_status", read_only=True
+    )  # noqa
+    # Anotaciones de Booking.objects.with_payment_summary()
+    total_paid = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+    total_refunded = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+    pending_debt = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
+
+    class Meta:
+        model = Booking
+        fields = [
+            "id",
+            "guest",
+            "guest_name",
+            "unit",
+            "property",
+            "check_in_date",
+            "check_out_date",
+            "status",
+            "total_price",
+            "notes",
+            "payment_status",
+            "total_paid",
+            "total_refunded",
+            "pending_debt",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["status"]
+        extra_kwargs = {"total_price": {"required": False}}
+
+    def create(self, validated_data):
+        booking = Booking(**validated_data)
+        try:
+            booking.clean()
+            booking.save()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(
+                serializers.as_serializer_error(error)
+            )  # noqa
+        return booking
+
+
+class PaymentSerializer(serializers.ModelSerializer):
+    refunds = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
+    class Meta:
+        model = Payment
+        fields = [
+            "id",
+            "booking",
+            "amount",
+            "payment_date",
+            "payment_method",
+            "status",
+            "payment_type",
+            "original_payment",
+            "refunds",
+            "transaction_id",
+            "updated_at",
+        ]
+
+
+class ArchivedPaymentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedPayment
+        fields = [
+            "id",
+            "amount",
+            "payment_date",
+            "payment_method",
+            "status",
+            "payment_type",
+            "original_payment",
+            "transaction_id",
+        ]
+
+
+class ArchivedBookingSerializer(serializers.ModelSerializer):
+    payments = ArchivedPaymentSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedBooking
+        fields = [
+            "id",
+            "guest",
+            "unit",
+            "check_in_date",
+            "check_out_date",
+            "status",
+            "total_price",
+            "notes",
+            "payments",
+            "created_at",
+            "updated_at",
+            "archived_at",
+        ]
+
+
+class StayQuerySerializer(serializers.Serializer):
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["check_in"] >= attrs["check_out"]:
+            raise serializers.ValidationError(
+                "La fecha de entrada debe ser anterior a la fecha de salida"
+            )
+        return attrs
+
+
+class AvailabilityQuerySerializer(StayQuerySerializer):
+    property = serializers.IntegerField(required=False)
+    room_type = serializers.ChoiceField(choices=Room.ROOM_TYPES, required=False)  # noqa
+    capacity = serializers.IntegerField(required=False, min_value=1)
+
+
+class QuoteQuerySerializer(StayQuerySerializer):
+    # Se repite en la query string: ?unit=1&unit=2
+    unit = serializers.ListField(
+        child=serializers.IntegerField(), min_length=1, max_length=100
+    )
+
+
+class GuestSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(
+        required=False, default=20, min_value=1, max_value=100
+    )
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(required=False, default=0, min_value=0)
+    limit = serializers.IntegerField(
+        required=False, default=500, min_value=1, max_value=5000
+    )
+    models = serializers.MultipleChoiceField(
+        choices=["booking", "plan", "payment"], required=False
+    )
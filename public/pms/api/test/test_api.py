@@ -0,0 +1,279 @@
+from base64 import b64encode
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.archive import archive_closed
+from payments.models import Payment
+from rooms.models import Plan, Property, Room, Unit
+
+
+class ApiTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="channel", password="secret123"
+        )  # noqa
+        self.client.force_authenticate(self.user)
+
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=Decimal("20.00"),
+        )
+        self.units = [
+            Unit.objects.create(name=f"{i}", room=self.room) for i in range(3)
+        ]
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.check_in = date.today() + timedelta(days=1)
+        self.check_out = self.check_in + timedelta(days=2)
+
+    def book(self, unit, **kwargs):
+        return Booking.objects.create(
+            guest=self.guest,
+            unit=unit,
+            check_in_date=kwargs.pop("check_in_date", self.check_in),
+            check_out_date=kwargs.pop("check_out_date", self.check_out),
+            total_price=Decimal("40.00"),
+            **kwargs,
+        )
+
+
+class AuthenticationTest(ApiTestCase):
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get("/api/v1/bookings/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_knox_token_login(self):
+        self.client.force_authenticate(None)
+        credentials = b64encode(b"channel:secret123").decode()
+        response = self.client.post(
+            "/api/v1/auth/login/", HTTP_AUTHORIZATION=f"Basic {credentials}"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        token = response.data["token"]
+        response = self.client.get(
+            "/api/v1/units/", HTTP_AUTHORIZATION=f"Token {token}"
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class BookingApiTest(ApiTestCase):
+    def test_list_uses_a_constant_number_of_queries(self):
+        booking = self.book(self.units[0])
+        Payment.objects.create(
+            booking=booking,
+            amount=Decimal("10.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+
+        with CaptureQueriesContext(connection) as few:
+            self.client.get("/api/v1/bookings/")
+
+        for unit in self.units[1:]:
+            self.book(unit)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get("/api/v1/bookings/")
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+        paid = next(
+            row for row in response.data["results"] if row["id"] == booking.pk
+        )  # noqa
+        self.assertEqual(paid["payment_status"], "PARTIAL_PAYMENT")
+        self.assertEqual(paid["pending_debt"], "30.00")
+        self.assertEqual(paid["property"], self.property.pk)
+
+    def test_cursor_pagination(self):
+        for unit in self.units:
+            self.book(unit)
+
+        response = self.client.get("/api/v1/bookings/", {"page_size": 2})
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_filters(self):
+        self.book(self.units[0], status="CONFIRMED")
+        self.book(self.units[1])
+
+        response = self.client.get("/api/v1/bookings/", {"status": "CONFIRMED"})  # noqa
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(
+            "/api/v1/bookings/",
+            {"property": self.property.pk, "check_in_after": self.check_in},
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_stay_filter(self):
+        booking = self.book(self.units[0])
+        self.book(
+            self.units[1],
+            check_in_date=self.check_out,
+            check_out_date=self.check_out + timedelta(days=2),
+        )
+
+        response = self.client.get(
+            "/api/v1/bookings/",
+            {"stay_after": self.check_in, "stay_before": self.check_out},
+        )
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [booking.pk]
+        )  # noqa
+
+        response = self.client.get(
+            "/api/v1/bookings/", {"stay_after": self.check_in}
+        )  # noqa
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_arriving_and_departing_filters(self):
+        booking = self.book(self.units[0])
+        cancelled = self.book(self.units[1])
+        cancelled.status = "CANCELLED"
+        cancelled.save()
+
+        response = self.client.get(
+            "/api/v1/bookings/", {"arriving": self.check_in}
+        )  # noqa
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [booking.pk]
+        )  # noqa
+        response = self.client.get(
+            "/api/v1/bookings/", {"departing": self.check_out}
+        )  # noqa
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [booking.pk]
+        )  # noqa
+        response = self.client.get(
+            "/api/v1/bookings/", {"departing": self.check_in}
+        )  # noqa
+        self.assertEqual(response.data["results"], [])
+
+    def test_create_booking(self):
+        data = {
+            "guest": self.guest.pk,
+            "unit": self.units[0].pk,
+            "check_in_date": self.check_in,
+            "check_out_date": self.check_out,
+        }
+        response = self.client.post("/api/v1/bookings/", data)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["total_price"], "40.00")
+
+        # La misma unidad ya no está disponible
+        response = self.client.post("/api/v1/bookings/", data)
+        self.assertEqual(response.status_code, 400)
+
+
+class ArchivedBookingApiTest(ApiTestCase):
+    def test_list_with_payments(self):
+        check_in = date.today() - timedelta(days=900)
+        booking = Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=self.guest,
+                    unit=self.units[0],
+                    check_in_date=check_in,
+                    check_out_date=check_in + timedelta(days=2),
+                    status="CHECKED_OUT",
+                    total_price=Decimal("40.00"),
+                )
+            ]
+        )[0]
+        payment = Payment.objects.create(
+            booking=booking,
+            amount=Decimal("40.00"),
+            payment_method="BANK_TRANSFER",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        self.book(self.units[1])
+        archive_closed(date.today() - timedelta(days=365))
+
+        response = self.client.get(
+            "/api/v1/archive/bookings/", {"guest": self.guest.pk}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([row["id"] for row in results], [booking.pk])
+        self.assertEqual(results[0]["payments"][0]["id"], payment.pk)
+
+        response = self.client.get("/api/v1/bookings/")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.post(
+            "/api/v1/archive/bookings/", {"guest": self.guest.pk}
+        )
+        self.assertEqual(response.status_code, 405)
+
+
+class GuestApiTest(ApiTestCase):
+    def test_search(self):
+        Guest.objects.create(
+            name="Jane Roe", document_type="DNI", document_number="87654321"
+        )
+        response = self.client.get(
+            "/api/v1/guests/search/", {"q": "12345678", "limit": 5}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([guest["id"] for guest in results], [self.guest.pk])
+
+        response = self.client.get("/api/v1/guests/search/", {"q": "doe"})
+        self.assertEqual(response.json()["results"][0]["name"], "John Doe")
+
+    def test_search_requires_query(self):
+        response = self.client.get("/api/v1/guests/search/")
+        self.assertEqual(response.status_code, 400)
+
+
+class AvailabilityApiTest(ApiTestCase):
+    def test_available_units_with_quote(self):
+        self.book(self.units[0])
+        Plan.objects.create(
+            name="Temporada",
+            room=self.room,
+            price=Decimal("25.00"),
+            start_date=self.check_in,
+            end_date=self.check_in,
+        )
+
+        response = self.client.get(
+            "/api/v1/availability/",
+            {"check_in": self.check_in, "check_out": self.check_out},
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertCountEqual(
+            [row["unit"] for row in results],
+            [unit.pk for unit in self.units[1:]],
+        )
+        self.assertEqual(results[0]["total_price"], Decimal("45.00"))
+
+    def test_invalid_dates(self):
+        response = self.client.get(
+            "/api/v1/availability/",
+            {"check_in": self.check_out, "check_out": self.check_in},
+        )
+        self.assertEqual(response.status_code, 400)
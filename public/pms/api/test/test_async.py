@@ -0,0 +1,129 @@
+from decimal import Decimal
+
+from knox.models import AuthToken
+
+from rooms.models import Plan, Property, Room, Unit
+
+from .test_api import ApiTestCase
+
+
+class AsyncApiTestCase(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        instance, token = AuthToken.objects.create(self.user)
+        self.headers = {"Authorization": f"Token {token}"}
+
+        other = Property.objects.create(
+            name="Apart Andes", property_type="APARTMENT"
+        )  # noqa
+        self.other_room = Room.objects.create(
+            property=other,
+            name="Apart 1",
+            room_type="PRIVATE_ROOM",
+            capacity=2,
+            base_price=Decimal("50.00"),
+        )
+        self.other_unit = Unit.objects.create(name="A", room=self.other_room)
+
+    @property
+    def stay(self):
+        return {"check_in": self.check_in, "check_out": self.check_out}
+
+
+class AsyncAvailabilityTest(AsyncApiTestCase):
+    async def test_matches_sync_view(self):
+        await Unit.objects.filter(pk=self.units[0].pk).aupdate(is_active=False)
+        await Plan.objects.acreate(
+            name="Temporada",
+            room=self.room,
+            price=Decimal("25.00"),
+            start_date=self.check_in,
+            end_date=self.check_in,
+        )
+
+        response = await self.async_client.get(
+            "/api/v1/async/availability/", self.stay, headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        sync_response = await self.async_client.get(
+            "/api/v1/availability/", self.stay, headers=self.headers
+        )
+        self.assertEqual(response.json(), sync_response.json())
+
+        results = response.json()["results"]
+        self.assertEqual(
+            [row["unit"] for row in results],
+            [self.other_unit.pk, *(unit.pk for unit in self.units[1:])],
+        )
+        self.assertEqual(results[1]["total_price"], 45.0)
+        self.assertIn("queries", response["Server-Timing"])
+
+    async def test_filters(self):
+        response = await self.async_client.get(
+            "/api/v1/async/availability/",
+            {**self.stay, "property": self.property.pk, "capacity": 3},
+            headers=self.headers,
+        )
+        self.assertEqual(
+            [row["unit"] for row in response.json()["results"]],
+            [unit.pk for unit in self.units],
+        )
+
+    async def test_requires_token(self):
+        response = await self.async_client.get(
+            "/api/v1/async/availability/", self.stay
+        )  # noqa
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        response = await self.async_client.get(
+            "/api/v1/async/availability/",
+            self.stay,
+            headers={"Authorization": "Token invalid"},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_invalid_dates(self):
+        response = await self.async_client.get(
+            "/api/v1/async/availability/",
+            {"check_in": self.check_out, "check_out": self.check_in},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.json())
+
+
+class AsyncQuoteTest(AsyncApiTestCase):
+    def test_quote(self):
+        self.book(self.units[0])
+        response = self.client.get(
+            "/api/v1/async/quote/",
+            {
+                **self.stay,
+                "unit": [self.units[0].pk, self.other_unit.pk],
+            },
+            HTTP_AUTHORIZATION=self.headers["Authorization"],
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(
+            [(row["unit"], row["available"]) for row in results],
+            [(self.units[0].pk, False), (self.other_unit.pk, True)],
+        )
+        self.assertEqual(results[0]["total_price"], 40.0)
+        self.assertEqual(results[1]["nightly_prices"], [50.0, 50.0])
+
+    async def test_unknown_unit(self):
+        response = await self.async_client.get(
+            "/api/v1/async/quote/",
+            {**self.stay, "unit": [self.other_unit.pk, 0]},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("unit", response.json())
+
+    async def test_requires_unit(self):
+        response = await self.async_client.get(
+            "/api/v1/async/quote/", self.stay, headers=self.headers
+        )
+        self.assertEqual(response.status_code, 400)
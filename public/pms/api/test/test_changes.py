@@ -0,0 +1,196 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from rest_framework.test import APITransactionTestCase
+
+from api.changes import record_changes
+from api.models import Change
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import Payment
+from rooms.models import Plan, Property, Room, Unit
+
+
+class ChangeFeedTest(APITransactionTestCase):
+    """
+    Sin la transacción envolvente de TestCase: el feed solo publica los
+    cambios de transacciones terminadas.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="channel", password="secret123"
+        )  # noqa
+        self.client.force_authenticate(self.user)
+
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=Decimal("20.00"),
+        )
+        self.unit = Unit.objects.create(name="1", room=self.room)
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.check_in = date.today() + timedelta(days=1)
+
+    def book(self):
+        return Booking.objects.create(
+            guest=self.guest,
+            unit=self.unit,
+            check_in_date=self.check_in,
+            check_out_date=self.check_in + timedelta(days=2),
+            total_price=Decimal("40.00"),
+        )
+
+    def fetch(self, since=0, **params):
+        response = self.client.get(
+            "/api/v1/changes/", {"since": since, **params}
+        )  # noqa
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_saves_and_deletes_are_recorded(self):
+        booking = self.book()
+        plan = Plan.objects.create(
+            name="Verano",
+            room=self.room,
+            start_date=self.check_in,
+            end_date=self.check_in + timedelta(days=10),
+            price=Decimal("30.00"),
+        )
+        plan_id = plan.pk
+        plan.delete()
+
+        self.assertEqual(
+            list(
+                Change.objects.order_by("pk").values_list(
+                    "model", "object_id", "action"
+                )
+            ),
+            [
+                ("booking", booking.pk, "UPSERT"),
+                ("plan", plan_id, "UPSERT"),
+                ("plan", plan_id, "DELETE"),
+            ],
+        )
+
+    def test_returns_only_changes_after_cursor(self):
+        first = self.book()
+        feed = self.fetch()
+        self.assertEqual([row["id"] for row in feed["results"]], [first.pk])
+        self.assertFalse(feed["has_more"])
+
+        first.status = "CONFIRMED"
+        first.save()
+        feed = self.fetch(feed["cursor"])
+        self.assertEqual(len(feed["results"]), 1)
+        self.assertEqual(feed["results"][0]["data"]["status"], "CONFIRMED")
+
+        feed = self.fetch(feed["cursor"])
+        self.assertEqual(feed["results"], [])
+
+    def test_deletes_are_published_as_tombstones(self):
+        booking = self.book()
+        payment = Payment.objects.create(
+            booking=booking,
+            amount=Decimal("10.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        cursor = self.fetch()["cursor"]
+        payment_id = payment.pk
+        payment.delete()
+
+        feed = self.fetch(cursor)
+        self.assertEqual(
+            feed["results"],
+            [
+                {
+                    "seq": feed["cursor"],
+                    "model": "payment",
+                    "id": payment_id,
+                    "deleted": True,
+                    "data": None,
+                }
+            ],
+        )
+
+    def test_page_keeps_the_latest_change_per_object(self):
+        booking = self.book()
+        booking.status = "CONFIRMED"
+        booking.notes = "Llega tarde"
+        booking.save()
+
+        feed = self.fetch()
+        self.assertEqual(len(feed["results"]), 1)
+        self.assertEqual(feed["results"][0]["data"]["notes"], "Llega tarde")
+
+    def test_pagination_with_limit_and_model_filter(self):
+        record_changes(Booking, [1, 2, 3])
+        record_changes(Plan, [1])
+
+        feed = self.fetch(limit=2, models="booking")
+        self.assertTrue(feed["has_more"])
+        self.assertEqual(len(feed["results"]), 2)
+
+        feed = self.fetch(feed["cursor"], limit=2, models="booking")
+        self.assertFalse(feed["has_more"])
+        self.assertEqual([row["id"] for row in feed["results"]], [3])
+
+    def test_query_count_does_not_grow_with_changes(self):
+        for day in range(0, 10, 2):
+            self.check_in = date.today() + timedelta(days=day + 1)
+            self.book()
+
+        # Una consulta al feed y una por modelo con cambios
+        with self.assertNumQueries(2):
+            feed = self.fetch()
+        self.assertEqual(len(feed["results"]), 5)
+
+    def test_open_transaction_is_not_skipped(self):
+        # Una transacción larga toma su secuencia antes que otra que se
+        # confirma primero
+        other = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {Change._meta.db_table} "
+                    "(model, object_id, action, changed_at) "
+                    "VALUES ('plan', 1, 'DELETE', now()) RETURNING id"
+                )
+                (pending,) = cursor.fetchone()
+            booking = self.book()
+
+            feed = self.fetch()
+            self.assertEqual(feed["results"], [])
+            self.assertEqual(feed["cursor"], 0)
+
+            other.commit()
+        finally:
+            other.close()
+
+        feed = self.fetch(feed["cursor"])
+        self.assertEqual(
+            [(row["seq"], row["model"]) for row in feed["results"]],
+            [(pending, "plan"), (feed["cursor"], "booking")],
+        )
+        self.assertEqual(feed["results"][1]["id"], booking.pk)
+
+    def test_prune_command(self):
+        self.book()
+        Change.objects.update(changed_at=timezone.now() - timedelta(days=31))
+        call_command("prune_changes", "--days", "30", stdout=StringIO())
+        self.assertFalse(Change.objects.exists())
@@ -0,0 +1,45 @@
+from django.urls import include, path
+from knox import views as knox_views
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.routers import DefaultRouter
+
+from . import async_views, views
+
+router = DefaultRouter()
+router.register("properties", views.PropertyViewSet)
+router.register("rooms", views.RoomViewSet)
+router.register("units", views.UnitViewSet)
+router.register("guests", views.GuestViewSet)
+router.register("bookings", views.BookingViewSet)
+router.register("payments", views.PaymentViewSet)
+router.register("archive/bookings", views.ArchivedBookingViewSet)
+
+urlpatterns = [
+    path(
+        "auth/login/",
+        # El token se obtiene con usuario y contraseña (HTTP Basic)
+        knox_views.LoginView.as_view(
+            authentication_classes=[BasicAuthentication]
+        ),  # noqa
+        name="api_login",
+    ),
+    path("auth/logout/", knox_views.LogoutView.as_view(), name="api_logout"),
+    path(
+        "auth/logoutall/",
+        knox_views.LogoutAllView.as_view(),
+        name="api_logoutall",
+    ),
+    path(
+        "availability/",
+        views.AvailabilityView.as_view(),
+        name="api_availability",
+    ),
+    path(
+        "async/availability/",
+        async_views.availability,
+        name="api_async_availability",
+    ),
+    path("async/quote/", async_views.quote, name="api_async_quote"),
+    path("changes/", views.ChangesView.as_view(), name="api_changes"),
+    path("", include(router.urls)),
+]
@@ -0,0 +1,187 @@
+from rest_framework import decorators, mixins, viewsets
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from bookings.availability import find_available_units
+from bookings.models import ArchivedBooking, Booking
+from guests.models import Guest
+from guests.search import search_guests
+from payments.models import Payment
+from rooms.models import Plan, Property, Room, Unit
+from rooms.pricing import RateCalendar
+
+from . import filters, serializers
+from .changes import read_changes
+
+
+class PropertyViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Property.objects.all()
+    serializer_class = serializers.PropertySerializer
+    filterset_class = filters.PropertyFilter
+
+
+class RoomViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Room.objects.all()
+    serializer_class = serializers.RoomSerializer
+    filterset_class = filters.RoomFilter
+
+
+class UnitViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Unit.objects.select_related("room")
+    serializer_class = serializers.UnitSerializer
+    filterset_class = filters.UnitFilter
+
+
+class GuestViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Guest.objects.all()
+    serializer_class = serializers.GuestSerializer
+    filterset_class = filters.GuestFilter
+
+    @decorators.action(detail=False)
+    def search(self, request, *args, **kwargs):
+        """
+        Huéspedes que coinciden con `q` por documento, nombre, teléfono o
+        correo, ordenados por relevancia (ver guests.search).
+        """
+        query = serializers.GuestSearchQuerySerializer(
+            data=request.query_params
+        )  # noqa
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        guests = search_guests(params["q"], limit=params["limit"])
+        serializer = self.get_serializer(guests, many=True)
+        return Response({"results": serializer.data})
+
+
+class BookingViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = Booking.objects.select_related(
+        "guest", "unit__room"
+    ).with_payment_summary()
+    serializer_class = serializers.BookingSerializer
+    filterset_class = filters.BookingFilter
+
+
+class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Payment.objects.prefetch_related("refunds")
+    serializer_class = serializers.PaymentSerializer
+    filterset_class = filters.PaymentFilter
+
+
+class ArchivedBookingViewSet(viewsets.ReadOnlyModelViewSet):
+    """Reservas archivadas con sus pagos (ver payments.archive)."""
+
+    queryset = ArchivedBooking.objects.prefetch_related("payments")
+    serializer_class = serializers.ArchivedBookingSerializer
+    filterset_class = filters.ArchivedBookingFilter
+
+
+class AvailabilityView(APIView):
+    """
+    Unidades libres para un rango de fechas con su cotización por noche.
+
+    Resuelve la búsqueda con find_available_units() (una consulta) y la
+    cotización de todas las unidades con RateCalendar (una consulta más).
+    """
+
+    def get(self, request, *args, **kwargs):
+        query = serializers.AvailabilityQuerySerializer(
+            data=request.query_params
+        )  # noqa
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        units = list(
+            find_available_units(
+                params["check_in"],
+                params["check_out"],
+                property=params.get("property"),
+                room_type=params.get("room_type"),
+                capacity=params.get("capacity"),
+            )
+        )
+        if not units:
+            return Response({"results": []})
+
+        rates = RateCalendar(units, params["check_in"], params["check_out"])
+        return Response({"results": availability_results(units, rates)})
+
+
+def availability_results(units, rates):
+    """Filas de la respuesta de disponibilidad (vista sync y async)."""
+    return [
+        {
+            "unit": unit.pk,
+            "unit_name": unit.name,
+            "room": unit.room_id,
+            "room_name": unit.room.name,
+            "property": unit.room.property_id,
+            "total_price": rates.total(unit),
+            "nightly_prices": rates.prices(unit),
+        }
+        for unit in units
+    ]
+
+
+class ChangesView(APIView):
+    """
+    Feed incremental de reservas, planes y pagos.
+
+    El cliente envía el último cursor recibido (`since`) y obtiene solo los
+    objetos modificados desde entonces, con su estado actual, y las bajas
+    como tombstones ({"deleted": true}). Cuando `has_more` es verdadero
+    debe volver a consultar con el nuevo cursor.
+    """
+
+    # Consultas y serializadores con los que se publica cada modelo
+    sources = {
+        "booking": (BookingViewSet.queryset, serializers.BookingSerializer),
+        "plan": (Plan.objects.all(), serializers.PlanSerializer),
+        "payment": (PaymentViewSet.queryset, serializers.PaymentSerializer),
+    }
+
+    def get(self, request, *args, **kwargs):
+        query = serializers.ChangesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        changes, cursor, has_more = read_changes(
+            since=params["since"],
+            limit=params["limit"],
+            models=params.get("models"),
+        )
+
+        upserts = {}
+        for model, object_id, action, seq in changes:
+            if action == "UPSERT":
+                upserts.setdefault(model, []).append(object_id)
+
+        # Una consulta por modelo con los objetos vigentes
+        objects = {}
+        for model, ids in upserts.items():
+            queryset, serializer_class = self.sources[model]
+            for instance in queryset.filter(pk__in=ids):
+                objects[(model, instance.pk)] = serializer_class(instance).data  # noqa
+
+        results = []
+        for model, object_id, action, seq in changes:
+            data = objects.get((model, object_id))
+            results.append(
+                {
+                    "seq": seq,
+                    "model": model,
+                    "id": object_id,
+                    # Si el objeto ya no existe se publica como baja
+                    "deleted": data is None,
+                    "data": data,
+                }
+            )
+
+        return Response(
+            {"cursor": cursor, "has_more": has_more, "results": results}
+        )  # noqa
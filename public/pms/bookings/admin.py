@@ -1,6 +1,13 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
-from .models import Booking
+from .models import ArchivedBooking, Booking
+
+PAYMENT_STATUS_LABELS = {
+    "NO_PAYMENT": _("Sin pagos"),
+    "PARTIAL_PAYMENT": _("Pago parcial"),
+    "FULLY_PAID": _("Pagado"),
+}
 
 
 @admin.register(Booking)
@@ -12,7 +19,9 @@ class BookingAdmin(admin.ModelAdmin):
         "check_out_date",
         "status",
         "total_price",
+        "payment_status",
     )
+    list_select_related = ("guest", "unit")
     list_filter = ("status", "unit", "check_in_date", "check_out_date")
     search_fields = ("guest__name", "unit__name", "notes")
     date_hierarchy = "check_in_date"
@@ -34,3 +43,45 @@ class BookingAdmin(admin.ModelAdmin):
         ),
     )
     readonly_fields = ("created_at", "updated_at")
+
+    def payment_status(self, obj):
+        """Muestra el estado de pago a partir de la anotación de la consulta."""  # noqa
+        return PAYMENT_STATUS_LABELS[obj.get_payment_status()]
+
+    payment_status.short_description = _("Estado de pago")
+
+    def get_queryset(self, request):
+        """Anota el resumen de pagos para no consultar reserva por reserva."""
+        return super().get_queryset(request).with_payment_summary()
+
+
+class ReadOnlyAdminMixin:
+    """Admin de solo consulta para las tablas de archivo."""
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = (
+        "id",
+        "guest",
+        "unit",
+        "check_in_date",
+        "check_out_date",
+        "status",
+        "total_price",
+        "archived_at",
+    )
+    list_select_related = ("guest", "unit")
+    list_filter = ("status", "check_in_date")
+    search_fields = ("=id", "guest__name", "unit__name", "notes")
+    date_hierarchy = "check_in_date"
+    ordering = ("-check_in_date",)
@@ -0,0 +1,71 @@
+from django.db.models import Exists, OuterRef
+
+from rooms.models import Unit
+
+from .models import Booking, UnitNight
+
+
+def occupied_nights(check_in_date, check_out_date):
+    """
+    Noches ocupadas por reservas activas en el rango [check_in, check_out).
+    """
+    return UnitNight.objects.filter(
+        status__in=Booking.ACTIVE_STATUSES,
+        date__gte=check_in_date,
+        date__lt=check_out_date,
+    )
+
+
+def find_available_units(
+    check_in_date,
+    check_out_date,
+    property=None,
+    room_type=None,
+    capacity=None,
+):
+    """
+    Devuelve todas las unidades libres para el rango de fechas indicado.
+
+    La búsqueda se resuelve en una sola consulta: un anti-join
+    (NOT EXISTS) correlacionado por unidad sobre el inventario por noche
+    (índice (unit, date) de UnitNight), en lugar de consultar la
+    disponibilidad unidad por unidad.
+
+    Args:
+        check_in_date (date): Fecha de entrada
+        check_out_date (date): Fecha de salida (no incluida)
+        property (Property | int, optional): Propiedad a filtrar
+        room_type (str, optional): Tipo de habitación (Room.ROOM_TYPES)
+        capacity (int, optional): Capacidad mínima de la habitación
+
+    Returns:
+        QuerySet: Unidades activas sin reservas superpuestas
+    """
+    if not check_in_date or not check_out_date:
+        raise ValueError("Las fechas de entrada y salida son obligatorias")
+    if check_in_date >= check_out_date:
+        raise ValueError(
+            "La fecha de entrada debe ser anterior a la fecha de salida",
+        )
+
+    units = Unit.objects.filter(
+        is_active=True,
+        room__is_active=True,
+        room__property__is_active=True,
+    )
+    if property is not None:
+        units = units.filter(room__property=property)
+    if room_type:
+        units = units.filter(room__room_type=room_type)
+    if capacity:
+        units = units.filter(room__capacity__gte=capacity)
+
+    busy = occupied_nights(check_in_date, check_out_date).filter(
+        unit=OuterRef("pk"),
+    )
+
+    return (
+        units.filter(~Exists(busy))
+        .select_related("room", "room__property")
+        .order_by("room__property__name", "room__name", "name")
+    )
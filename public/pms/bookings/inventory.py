@@ -0,0 +1,87 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+
+from .models import Booking, UnitNight
+
+REBUILD_SQL = """
+    INSERT INTO {nights} (unit_id, date, booking_id, status)
+    SELECT b.unit_id, night::date, b.id, b.status
+    FROM {bookings} b,
+        generate_series(
+            b.check_in_date,
+            b.check_out_date - 1,
+            interval '1 day'
+        ) AS night
+    WHERE b.status <> 'CANCELLED' {where}
+    ON CONFLICT DO NOTHING
+"""
+
+
+def rebuild_inventory(booking_ids=None):
+    """
+    Reconstruye el inventario por noche a partir de las reservas.
+
+    Las noches se generan del lado de la base de datos con una única
+    sentencia INSERT ... SELECT sobre generate_series, sin materializar
+    las reservas en Python.
+
+    Args:
+        booking_ids (list, optional): Limita la reconstrucción a estas
+            reservas. Si no se indica, se reconstruye la tabla completa.
+
+    Returns:
+        int: Cantidad de noches insertadas
+    """
+    sql = REBUILD_SQL.format(
+        nights=UnitNight._meta.db_table,
+        bookings=Booking._meta.db_table,
+        where="AND b.id = ANY(%s)" if booking_ids is not None else "",
+    )
+    params = [list(booking_ids)] if booking_ids is not None else []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        nights = UnitNight.objects.all()
+        if booking_ids is not None:
+            nights = nights.filter(booking_id__in=booking_ids)
+        nights.delete()
+
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def occupancy_grid(start_date, end_date, units=None, property=None):
+    """
+    Calendario de ocupación unidades x noches para [start_date, end_date).
+
+    Se resuelve con un único escaneo por rango sobre el índice de fechas
+    de UnitNight.
+
+    Returns:
+        dict: {unit_id: {fecha: {"booking_id": ..., "status": ...}}}
+    """
+    nights = UnitNight.objects.filter(date__gte=start_date, date__lt=end_date)
+    if units is not None:
+        nights = nights.filter(unit__in=units)
+    if property is not None:
+        nights = nights.filter(unit__room__property=property)
+
+    grid = defaultdict(dict)
+    for unit_id, night, booking_id, status in nights.values_list(
+        "unit_id", "date", "booking_id", "status"
+    ):
+        current = grid[unit_id].get(night)
+        # Si conviven una reserva finalizada y una activa, prima la activa
+        if current and current["status"] in Booking.ACTIVE_STATUSES:
+            continue
+        grid[unit_id][night] = {"booking_id": booking_id, "status": status}
+    return grid
+
+
+def calendar_dates(start_date, end_date):
+    """Lista de fechas (columnas del calendario) de [start_date, end_date)."""
+    return [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days)
+    ]
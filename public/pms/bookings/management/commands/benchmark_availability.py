@@ -0,0 +1,194 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from bookings.availability import find_available_units
+from bookings.inventory import rebuild_inventory
+from bookings.models import Booking
+from guests.models import Guest
+from rooms.models import Property, Room, Unit
+from rooms.pricing import RateCalendar
+
+
+class _Rollback(Exception):
+    """Se usa para descartar los datos sembrados al terminar."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra unidades y reservas de prueba y compara la búsqueda de "
+        "disponibilidad en una consulta contra la consulta por unidad."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--units", type=int, default=10_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--properties", type=int, default=20)
+        parser.add_argument("--searches", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Conserva los datos sembrados en lugar de descartarlos",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                self.seed(options)
+                self.run_searches(options)
+                if not options["keep"]:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write("Datos sembrados descartados.")
+
+    def seed(self, options):
+        start = time.perf_counter()
+        properties = Property.objects.bulk_create(
+            Property(name=f"Bench {i}", property_type="HOSTEL")
+            for i in range(options["properties"])
+        )
+
+        rooms_per_property = max(options["units"] // (len(properties) * 8), 1)
+        rooms = Room.objects.bulk_create(
+            Room(
+                property=prop,
+                name=f"Bench room {i}",
+                room_type=random.choice(["DORM", "PRIVATE_ROOM"]),
+                capacity=random.choice([1, 2, 4, 8]),
+                base_price=Decimal("20.00"),
+            )
+            for prop in properties
+            for i in range(rooms_per_property)
+        )
+
+        units = Unit.objects.bulk_create(
+            (
+                Unit(name=f"{i}", room=rooms[i % len(rooms)])
+                for i in range(options["units"])
+            ),
+            batch_size=options["batch_size"],
+        )
+
+        guests = Guest.objects.bulk_create(
+            (
+                Guest(
+                    name=f"Bench guest {i}",
+                    document_type="DNI",
+                    document_number=f"B{i:08d}",
+                    phone_number="0",
+                    nationality="AR",
+                )
+                for i in range(1_000)
+            ),
+            batch_size=options["batch_size"],
+        )
+
+        per_unit = max(options["bookings"] // len(units), 1)
+        batch = []
+        total = 0
+        for unit in units:
+            day = date.today() - timedelta(days=per_unit * 2)
+            for _ in range(per_unit):
+                nights = random.randint(1, 4)
+                check_out = day + timedelta(days=nights)
+                if check_out <= date.today():
+                    status = "CHECKED_OUT"
+                else:
+                    status = random.choice(
+                        ["PENDING", "CONFIRMED", "CONFIRMED", "CANCELLED"]
+                    )
+                batch.append(
+                    Booking(
+                        guest=random.choice(guests),
+                        unit=unit,
+                        check_in_date=day,
+                        check_out_date=check_out,
+                        status=status,
+                        total_price=Decimal("20.00") * nights,
+                    )
+                )
+                day = check_out + timedelta(days=random.randint(0, 2))
+                if len(batch) >= options["batch_size"]:
+                    total += len(Booking.objects.bulk_create(batch))
+                    batch = []
+        if batch:
+            total += len(Booking.objects.bulk_create(batch))
+
+        # bulk_create no pasa por Booking.save(): se genera el inventario
+        nights = rebuild_inventory()
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        self.stdout.write(
+            f"Sembradas {len(units)} unidades, {total} reservas y "
+            f"{nights} noches en {time.perf_counter() - start:.1f}s"
+        )
+
+    def run_searches(self, options):
+        properties = list(Property.objects.filter(name__startswith="Bench"))
+        timings = []
+        for _ in range(options["searches"]):
+            check_in = date.today() + timedelta(days=random.randint(0, 60))
+            check_out = check_in + timedelta(days=random.randint(1, 7))
+            prop = random.choice([None, random.choice(properties)])
+
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                units = find_available_units(
+                    check_in,
+                    check_out,
+                    property=prop,
+                )
+                free = list(units)
+                timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        self.stdout.write(
+            f"Búsqueda en una consulta: {len(ctx.captured_queries)} "
+            f"consulta(s), {len(free)} libres, "
+            f"p50={timings[len(timings) // 2] * 1000:.1f}ms "
+            f"max={timings[-1] * 1000:.1f}ms"
+        )
+
+        # Cotización por noche de hasta 500 unidades en un solo lote
+        quoted = list(Unit.objects.select_related("room")[:500])
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            RateCalendar(quoted, check_in, check_out).totals()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Cotización de {len(quoted)} unidades: "
+            f"{len(ctx.captured_queries)} consulta(s), {elapsed * 1000:.1f}ms"
+        )
+
+        # Línea base: una consulta de superposición por unidad
+        units = Unit.objects.filter(
+            is_active=True,
+            room__is_active=True,
+            room__property__is_active=True,
+        )
+        if prop is not None:
+            units = units.filter(room__property=prop)
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            free = [
+                unit
+                for unit in units
+                if Booking(
+                    unit=unit, check_in_date=check_in, check_out_date=check_out
+                ).is_unit_available()
+            ]
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Búsqueda por unidad: {len(ctx.captured_queries)} consultas, "
+            f"{len(free)} libres, {elapsed * 1000:.1f}ms"
+        )
@@ -0,0 +1,105 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from pms import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Administra el particionado por fecha de reservas y pagos (ver "
+        "DB_PARTITIONING): status muestra las particiones, convert "
+        "convierte las tablas que falten, create crea las particiones "
+        "futuras y detach separa (o archiva con --archive) las viejas que "
+        "ya no están en uso."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "action",
+            nargs="?",
+            default="status",
+            choices=["status", "convert", "create", "detach"],
+        )
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=partitioning.AHEAD_MONTHS,
+            help="create: meses hacia adelante con partición",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=36,
+            help="detach: meses de antigüedad de las particiones a separar",
+        )
+        parser.add_argument(
+            "--archive",
+            help="detach: directorio donde exportar las particiones a "
+            "<partición>.csv.gz antes de eliminarlas",
+        )
+
+    def handle(self, *args, **options):
+        action = options["action"]
+        if action == "convert" and not settings.DB_PARTITIONING:
+            raise CommandError("Definir DB_PARTITIONING (monthly o yearly)")
+
+        for model in partitioning.partitioned_models():
+            table = model._meta.db_table
+            partitioned = partitioning.is_partitioned(table)
+            if action == "status":
+                self.status(model, partitioned)
+            elif action == "convert":
+                if partitioned:
+                    continue
+                with connection.schema_editor() as schema_editor:
+                    dropped = partitioning.partition_table(
+                        schema_editor,
+                        model,
+                        settings.DB_PARTITIONING,
+                        options["months"],
+                    )
+                self.stdout.write(f"{table}: particionada")
+                for name in dropped:
+                    self.stdout.write(f"  clave foránea eliminada: {name}")
+            elif not partitioned:
+                self.stdout.write(f"{table}: sin particionar")
+            elif action == "create":
+                with connection.schema_editor() as schema_editor:
+                    created = partitioning.create_partitions(
+                        schema_editor, model, options["months"]
+                    )
+                self.stdout.write(f"{table}: {len(created)} creadas")
+            else:
+                before = partitioning.add_months(
+                    date.today(), -options["older_than"]
+                )  # noqa
+                with connection.schema_editor() as schema_editor:
+                    detached, kept = partitioning.detach_partitions(
+                        schema_editor, model, before, options["archive"]
+                    )
+                self.stdout.write(f"{table}: {len(detached)} separadas")
+                for name in detached:
+                    self.stdout.write(f"  {name}")
+                for name in kept:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  {name}: conservada, con reservas activas o "
+                            "filas en uso (ejecutar antes archive_closed)"
+                        )
+                    )
+
+    def status(self, model, partitioned):
+        table = model._meta.db_table
+        if not partitioned:
+            self.stdout.write(f"{table}: sin particionar")
+            return
+        partitions = partitioning.partitions(model)
+        self.stdout.write(
+            f"{table}: {len(partitions)} particiones "
+            f"({partitions[0][0]} a {partitions[-1][0]})"
+            if partitions
+            else f"{table}: sin particiones"
+        )
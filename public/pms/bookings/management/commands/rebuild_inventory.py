@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from bookings.inventory import rebuild_inventory
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero el inventario por noche (UnitNight)."
+
+    def handle(self, *args, **options):
+        nights = rebuild_inventory()
+        self.stdout.write(
+            self.style.SUCCESS(f"Inventario reconstruido: {nights} noches.")
+        )
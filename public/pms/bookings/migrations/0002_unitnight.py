@@ -0,0 +1,97 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0001_initial"),
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnitNight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Fecha")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pendiente"),
+                            ("CONFIRMED", "Confirmada"),
+                            ("CHECKED_IN", "Registrado"),
+                            ("CHECKED_OUT", "Salida"),
+                            ("CANCELLED", "Cancelada"),
+                        ],
+                        max_length=11,
+                        verbose_name="Estado",
+                    ),
+                ),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="nights",
+                        to="bookings.booking",
+                        verbose_name="Reserva",
+                    ),
+                ),
+                (
+                    "unit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="nights",
+                        to="rooms.unit",
+                        verbose_name="Unidad",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Noche ocupada",
+                "verbose_name_plural": "Noches ocupadas",
+                "indexes": [
+                    models.Index(
+                        fields=["unit", "date"], name="bookings_un_unit_id_36e910_idx"
+                    ),
+                    models.Index(fields=["date"], name="bookings_un_date_c35ffa_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(
+                            ("status__in", ["PENDING", "CONFIRMED", "CHECKED_IN"])
+                        ),
+                        fields=("unit", "date"),
+                        name="unique_active_unit_night",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            # Carga inicial del inventario con las reservas existentes
+            """
+            INSERT INTO bookings_unitnight (unit_id, date, booking_id, status)
+            SELECT b.unit_id, night::date, b.id, b.status
+            FROM bookings_booking b,
+                generate_series(
+                    b.check_in_date,
+                    b.check_out_date - 1,
+                    interval '1 day'
+                ) AS night
+            WHERE b.status <> 'CANCELLED'
+            ON CONFLICT DO NOTHING
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:02
+
+import bookings.models
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0002_unitnight"),
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        # btree_gist permite combinar la igualdad de unit_id con el
+        # solapamiento de rangos en un mismo índice GiST
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "CHECKED_IN"])
+                ),
+                expressions=[
+                    ("unit", "="),
+                    (
+                        bookings.models.DateRange("check_in_date", "check_out_date"),
+                        "&&",
+                    ),
+                ],
+                name="exclude_overlapping_bookings",
+                violation_error_message="Esta cama no está disponible para las fechas seleccionadas",
+            ),
+        ),
+    ]
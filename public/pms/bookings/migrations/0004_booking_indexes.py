@@ -0,0 +1,71 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:06
+
+import bookings.models
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no bloquea las escrituras en la tabla de
+    # reservas mientras se construyen los índices, pero no puede correr
+    # dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("bookings", "0003_booking_exclude_overlapping"),
+        ("guests", "0003_guest_dedupe"),
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="booking",
+            index=django.contrib.postgres.indexes.GistIndex(
+                bookings.models.DateRange("check_in_date", "check_out_date"),
+                name="booking_stay_gist_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="booking_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["check_in_date"],
+                include=("unit", "status"),
+                name="booking_check_in_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                fields=["check_out_date"],
+                include=("unit", "status"),
+                name="booking_check_out_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "CHECKED_IN"])
+                ),
+                fields=["check_in_date"],
+                name="booking_active_arrival_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "CHECKED_IN"])
+                ),
+                fields=["check_out_date"],
+                name="booking_active_departure_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import migrations
+
+from pms import partitioning
+
+
+def partition_bookings(apps, schema_editor):
+    # Opcional: sin DB_PARTITIONING la tabla queda como está (ver
+    # pms/partitioning.py y el comando partitions)
+    if settings.DB_PARTITIONING:
+        partitioning.partition_table(
+            schema_editor,
+            apps.get_model("bookings", "Booking"),
+            settings.DB_PARTITIONING,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0004_booking_indexes"),
+        # Después de crear las claves foráneas hacia reservas
+        ("payments", "0008_cashregisterentry_balance"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_partition_booking"),
+        ("guests", "0003_guest_dedupe"),
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBooking",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("check_in_date", models.DateField(verbose_name="Fecha de entrada")),
+                ("check_out_date", models.DateField(verbose_name="Fecha de salida")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pendiente"),
+                            ("CONFIRMED", "Confirmada"),
+                            ("CHECKED_IN", "Registrado"),
+                            ("CHECKED_OUT", "Salida"),
+                            ("CANCELLED", "Cancelada"),
+                        ],
+                        max_length=11,
+                        verbose_name="Estado",
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Precio total"
+                    ),
+                ),
+                ("notes", models.TextField(blank=True, verbose_name="Notas")),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha de archivado"
+                    ),
+                ),
+                (
+                    "guest",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_bookings",
+                        to="guests.guest",
+                        verbose_name="Huésped",
+                    ),
+                ),
+                (
+                    "unit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_bookings",
+                        to="rooms.unit",
+                        verbose_name="Unidad",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reserva archivada",
+                "verbose_name_plural": "Reservas archivadas",
+                "indexes": [
+                    models.Index(
+                        fields=["check_in_date"], name="bookings_ar_check_i_26f061_idx"
+                    )
+                ],
+            },
+        ),
+    ]
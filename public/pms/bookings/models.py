@@ -1,12 +1,139 @@
-from datetime import date
+from datetime import date, timedelta
 
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.contrib.postgres.indexes import GistIndex
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Q, Sum
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Case,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 from guests.models import Guest
 from rooms.models import Unit
+from rooms.pricing import RateCalendar
+
+UNAVAILABLE_MESSAGE = _(
+    "Esta cama no está disponible para las fechas seleccionadas"
+)  # noqa
+
+# Estados que ocupan la unidad y bloquean nuevas reservas
+ACTIVE_STATUSES = ["PENDING", "CONFIRMED", "CHECKED_IN"]
+
+# Restricciones de la base de datos que impiden reservas superpuestas
+OVERLAP_CONSTRAINTS = (
+    "exclude_overlapping_bookings",
+    "unique_active_unit_night",
+)
+
+
+class DateRange(models.Func):
+    """daterange(check_in, check_out) con límites [), es decir por noches."""
+
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+
+class BookingQuerySet(models.QuerySet):
+    def overlapping(self, start_date, end_date):
+        """
+        Reservas cuya estadía se superpone con [start_date, end_date).
+
+        Compara los rangos con el operador && sobre
+        daterange(check_in_date, check_out_date), que usa los índices GiST
+        (booking_stay_gist_idx y, para reservas activas de una unidad, el
+        de la restricción exclude_overlapping_bookings). Cualquiera de las
+        fechas puede ser None para dejar el rango abierto.
+        """
+        return self.alias(
+            stay=DateRange("check_in_date", "check_out_date")
+        ).filter(  # noqa
+            stay__overlap=DateRange(
+                Value(start_date, output_field=models.DateField()),
+                Value(end_date, output_field=models.DateField()),
+            )
+        )
+
+    def arrivals(self, day):
+        """Reservas activas que llegan en `day` (lista de recepción)."""
+        return self.filter(check_in_date=day, status__in=ACTIVE_STATUSES)
+
+    def departures(self, day):
+        """Reservas activas que se van en `day` (lista de recepción)."""
+        return self.filter(check_out_date=day, status__in=ACTIVE_STATUSES)
+
+    def with_payment_summary(self):
+        """
+        Anota el resumen de pagos de cada reserva en una sola consulta.
+
+        Los totales salen de subconsultas por reserva en lugar de un JOIN
+        con GROUP BY: agrupar por el id no alcanza cuando la tabla está
+        particionada (ver pms/partitioning.py), porque la clave primaria
+        incluye la fecha de entrada.
+
+        Anotaciones:
+            total_paid: Suma de pagos completados
+            total_refunded: Suma (en positivo) de reembolsos completados
+            pending_debt: Precio total menos lo pagado neto de reembolsos
+            payment_status: 'NO_PAYMENT', 'PARTIAL_PAYMENT' o 'FULLY_PAID'
+        """
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+        completed = (
+            self.model._meta.get_field("payments")
+            .related_model.objects.filter(
+                booking=OuterRef("pk"), status="COMPLETED"
+            )  # noqa
+            .order_by()
+            .values("booking")
+        )
+
+        return self.annotate(
+            total_paid=Coalesce(
+                Subquery(
+                    completed.filter(payment_type="PAYMENT")
+                    .annotate(total=Sum("amount"))
+                    .values("total")
+                ),
+                Value(0),
+                output_field=money,
+            ),
+            total_refunded=Coalesce(
+                Subquery(
+                    completed.filter(payment_type="REFUND")
+                    .annotate(total=-Sum("amount"))
+                    .values("total")
+                ),
+                Value(0),
+                output_field=money,
+            ),
+        ).annotate(
+            pending_debt=ExpressionWrapper(
+                F("total_price") - F("total_paid") + F("total_refunded"),
+                output_field=money,
+            ),
+            payment_status=Case(
+                When(
+                    total_paid=F("total_refunded"),
+                    then=Value("NO_PAYMENT"),
+                ),
+                When(
+                    pending_debt__gt=0,
+                    then=Value("PARTIAL_PAYMENT"),
+                ),
+                default=Value("FULLY_PAID"),
+                output_field=models.CharField(),
+            ),
+        )
 
 
 class Booking(models.Model):
@@ -18,6 +145,8 @@ class Booking(models.Model):
         ("CANCELLED", _("Cancelada")),  # Reserva cancelada
     ]
 
+    ACTIVE_STATUSES = ACTIVE_STATUSES
+
     guest = models.ForeignKey(
         Guest,
         on_delete=models.CASCADE,
@@ -53,6 +182,8 @@ class Booking(models.Model):
 
     notes = models.TextField(blank=True, verbose_name=_("Notas"))
 
+    objects = BookingQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Reserva")
         verbose_name_plural = _("Reservas")
@@ -60,6 +191,57 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=["unit", "check_in_date", "check_out_date"]),
             models.Index(fields=["status"]),
+            # Superposición de estadías sin filtrar por unidad
+            # (BookingQuerySet.overlapping)
+            GistIndex(
+                DateRange("check_in_date", "check_out_date"),
+                name="booking_stay_gist_idx",
+            ),
+            # Orden por defecto del admin (más recientes primero)
+            models.Index(
+                fields=["-created_at", "-id"], name="booking_created_idx"
+            ),  # noqa
+            # Orden y filtros por fecha del admin, y llegadas y salidas de
+            # los KPIs (reports.kpis), que se resuelven sin leer la tabla
+            models.Index(
+                fields=["check_in_date"],
+                include=["unit", "status"],
+                name="booking_check_in_idx",
+            ),
+            models.Index(
+                fields=["check_out_date"],
+                include=["unit", "status"],
+                name="booking_check_out_idx",
+            ),
+            # Llegadas y salidas activas de un día (BookingQuerySet.arrivals
+            # y departures): solo las reservas que no terminaron ni se
+            # cancelaron, una fracción chica de la tabla
+            models.Index(
+                fields=["check_in_date"],
+                condition=Q(status__in=ACTIVE_STATUSES),
+                name="booking_active_arrival_idx",
+            ),
+            models.Index(
+                fields=["check_out_date"],
+                condition=Q(status__in=ACTIVE_STATUSES),
+                name="booking_active_departure_idx",
+            ),
+        ]
+        constraints = [
+            # Evita el doble booking a nivel de base de datos: dos reservas
+            # activas de la misma unidad no pueden superponer sus noches
+            ExclusionConstraint(
+                name="exclude_overlapping_bookings",
+                expressions=[
+                    ("unit", RangeOperators.EQUAL),
+                    (
+                        DateRange("check_in_date", "check_out_date"),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                condition=Q(status__in=ACTIVE_STATUSES),
+                violation_error_message=UNAVAILABLE_MESSAGE,
+            ),
         ]
 
     def __str__(self):
@@ -70,6 +252,17 @@ class Booking(models.Model):
         if not self.check_in_date or not self.check_out_date:
             return
 
+        self.validate_dates()
+
+        # Validar disponibilidad de la cama
+        if not self.is_unit_available():
+            raise ValidationError(UNAVAILABLE_MESSAGE)
+
+    def validate_dates(self):
+        """Valida el rango de fechas de la reserva"""
+        if not self.check_in_date or not self.check_out_date:
+            return
+
         # Validar que check_in sea anterior a check_out
         if self.check_in_date >= self.check_out_date:
             raise ValidationError(
@@ -86,24 +279,14 @@ class Booking(models.Model):
                 {"check_in_date": _("No se pueden crear reservas en el pasado")}  # noqa
             )
 
-        # Validar disponibilidad de la cama
-        if not self.is_unit_available():
-            raise ValidationError(
-                _("Esta cama no está disponible para las fechas seleccionadas")
-            )  # noqa
-
     def is_unit_available(self):
         """
         Verifica si la cama está disponible para las fechas seleccionadas
         """
         overlapping_bookings = Booking.objects.filter(
-            unit=self.unit,
-            status__in=["PENDING", "CONFIRMED", "CHECKED_IN"],
-        ).filter(
-            # Busca superposición de fechas
-            Q(check_in_date__lt=self.check_out_date)
-            & Q(check_out_date__gt=self.check_in_date)
-        )
+            unit_id=self.unit_id,
+            status__in=Booking.ACTIVE_STATUSES,
+        ).overlapping(self.check_in_date, self.check_out_date)
 
         # Excluir la reserva actual (importante para actualizaciones)
         if self.pk:
@@ -112,12 +295,48 @@ class Booking(models.Model):
         return not overlapping_bookings.exists()
 
     def save(self, *args, **kwargs):
-        self.clean()  # Ejecutar validaciones antes de guardar
+        # La disponibilidad la garantiza la restricción de exclusión, sin
+        # consultar antes de insertar (check-then-insert no es seguro entre
+        # workers concurrentes)
+        self.validate_dates()
         if not self.total_price:
-            # Calcular el precio total si no está establecido
-            nights = (self.check_out_date - self.check_in_date).days
-            self.total_price = self.room.base_price * nights
-        super().save(*args, **kwargs)
+            # Calcular el precio total por noche si no está establecido
+            # Sin la unidad cargada alcanza con su ID: la habitación y los
+            # planes salen de la caché de datos de referencia
+            unit = self.unit if Booking.unit.is_cached(self) else self.unit_id
+            self.total_price = RateCalendar(
+                [unit], self.check_in_date, self.check_out_date
+            ).total(unit)
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                self.sync_nights()
+        except IntegrityError as error:
+            if any(name in str(error) for name in OVERLAP_CONSTRAINTS):
+                raise ValidationError(UNAVAILABLE_MESSAGE) from error
+            raise
+
+    def sync_nights(self):
+        """
+        Sincroniza el inventario por noche (UnitNight) con la reserva.
+
+        Las reservas canceladas liberan sus noches; el resto deja una fila
+        por noche ocupada con el estado actual de la reserva.
+        """
+        UnitNight.objects.filter(booking=self).delete()
+        if self.status == "CANCELLED":
+            return
+
+        nights = (self.check_out_date - self.check_in_date).days
+        UnitNight.objects.bulk_create(
+            UnitNight(
+                unit_id=self.unit_id,
+                date=self.check_in_date + timedelta(days=offset),
+                booking=self,
+                status=self.status,
+            )
+            for offset in range(nights)
+        )
 
     def confirm_booking(self):
         """Confirma una reserva pendiente"""
@@ -159,11 +378,16 @@ class Booking(models.Model):
         """
         Determina el estado de pago de la reserva.
 
+        Si la reserva se obtuvo con Booking.objects.with_payment_summary()
+        se reutiliza la anotación en lugar de consultar los pagos.
+
         Returns:
             str: Estado de pago: 'NO_PAYMENT' (sin pagos),
                 'PARTIAL_PAYMENT' (pagos parciales),
                 o 'FULLY_PAID' (pagado completamente)
         """
+        if hasattr(self, "payment_status"):
+            return self.payment_status
 
         # Obtenemos la suma de todos los pagos completados
         payments_sum = (
@@ -181,3 +405,143 @@ class Booking(models.Model):
             return "PARTIAL_PAYMENT"  # Pago parcial
         else:
             return "FULLY_PAID"  # Completamente pagado
+
+
+class UnitNight(models.Model):
+    """
+    Inventario materializado por noche: una fila por unidad y fecha ocupada.
+
+    Se mantiene sincronizado desde Booking.save() (y por lo tanto desde
+    confirm_booking(), check_in(), check_out() y cancel()); al borrar una
+    reserva sus noches se eliminan en cascada.
+    """
+
+    unit = models.ForeignKey(
+        Unit,
+        on_delete=models.CASCADE,
+        related_name="nights",
+        verbose_name=_("Unidad"),
+    )
+
+    date = models.DateField(verbose_name=_("Fecha"))
+
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.CASCADE,
+        related_name="nights",
+        verbose_name=_("Reserva"),
+    )
+
+    status = models.CharField(
+        max_length=11,
+        choices=Booking.STATUS_CHOICES,
+        verbose_name=_("Estado"),
+    )
+
+    class Meta:
+        verbose_name = _("Noche ocupada")
+        verbose_name_plural = _("Noches ocupadas")
+        indexes = [
+            models.Index(fields=["unit", "date"]),
+            models.Index(fields=["date"]),
+        ]
+        constraints = [
+            # Una unidad no puede tener dos reservas activas la misma noche
+            models.UniqueConstraint(
+                fields=["unit", "date"],
+                condition=Q(status__in=Booking.ACTIVE_STATUSES),
+                name="unique_active_unit_night",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.unit} - {self.date} ({self.get_status_display()})"
+
+
+class ArchivedBooking(models.Model):
+    """
+    Reserva cerrada (salida o cancelada) que el archivado sacó de la tabla
+    de reservas (ver payments.archive).
+
+    Conserva el id y los datos de la reserva original, sin las
+    restricciones ni los índices de la tabla activa. Es de solo lectura:
+    se consulta desde el admin y desde /api/v1/archive/bookings/.
+    """
+
+    # El mismo id de la reserva original
+    id = models.BigIntegerField(primary_key=True)
+
+    guest = models.ForeignKey(
+        Guest,
+        on_delete=models.CASCADE,
+        related_name="archived_bookings",
+        verbose_name=_("Huésped"),
+    )
+
+    unit = models.ForeignKey(
+        Unit,
+        on_delete=models.CASCADE,
+        related_name="archived_bookings",
+        verbose_name=_("Unidad"),
+    )
+
+    check_in_date = models.DateField(verbose_name=_("Fecha de entrada"))
+
+    check_out_date = models.DateField(verbose_name=_("Fecha de salida"))
+
+    status = models.CharField(
+        max_length=11,
+        choices=Booking.STATUS_CHOICES,
+        verbose_name=_("Estado"),
+    )
+
+    total_price = models.DecimalField(
+        max_digits=10, decimal_places=2, verbose_name=_("Precio total")
+    )
+
+    notes = models.TextField(blank=True, verbose_name=_("Notas"))
+
+    created_at = models.DateTimeField()
+
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Fecha de archivado")
+    )
+
+    class Meta:
+        verbose_name = _("Reserva archivada")
+        verbose_name_plural = _("Reservas archivadas")
+        indexes = [
+            models.Index(fields=["check_in_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.guest} - {self.unit} ({self.check_in_date} to {self.check_out_date})"  # noqa
+
+
+class ImportRun(models.Model):
+    """
+    Avance de una importación de reservas (comando import_bookings).
+
+    La cantidad de filas procesadas se actualiza en la misma transacción
+    que el lote importado, de modo que --resume nunca vuelve a importar un
+    lote ya confirmado.
+    """
+
+    source = models.CharField(
+        max_length=255, unique=True, verbose_name=_("Origen")
+    )  # noqa
+
+    processed = models.PositiveIntegerField(
+        default=0, verbose_name=_("Filas procesadas")
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Importación de reservas")
+        verbose_name_plural = _("Importaciones de reservas")
+
+    def __str__(self):
+        return f"{self.source} ({self.processed})"
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Se envía después de crear o modificar reservas en lote (bulk_create() o
+# QuerySet.update(), que no disparan post_save). Argumentos: booking_ids.
+bookings_bulk_changed = Signal()
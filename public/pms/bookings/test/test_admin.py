@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bookings.models import Booking
+from guests.models import Guest
+from rooms.models import Property, Room, Unit
+
+
+class BookingAdminQueriesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        self.client.force_login(self.user)
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        self.room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        self.seeded = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            i = self.seeded = self.seeded + 1
+            check_in = date.today() + timedelta(days=1)
+            Booking.objects.create(
+                guest=Guest.objects.create(
+                    name=f"Guest {i}",
+                    document_type="DNI",
+                    document_number=f"{i:08d}",
+                ),
+                unit=Unit.objects.create(name=f"{i}", room=self.room),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=2),
+                total_price=40,
+            )
+
+    def changelist_queries(self):
+        url = reverse("admin:bookings_booking_changelist")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_booking_changelist(self):
+        self.seed(2)
+        few = self.changelist_queries()
+        self.seed(20)
+        self.assertEqual(self.changelist_queries(), few)
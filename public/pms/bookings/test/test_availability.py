@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from bookings.availability import find_available_units
+from bookings.models import Booking
+from guests.models import Guest
+from rooms.models import Property, Room, Unit
+
+
+class AvailabilitySearchTest(TestCase):
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.other_property = Property.objects.create(
+            name="Hotel Example", property_type="HOTEL"
+        )
+        self.dorm = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        self.private = Room.objects.create(
+            property=self.other_property,
+            name="Room 1",
+            room_type="PRIVATE_ROOM",
+            capacity=2,
+            base_price=80,
+        )
+        self.bed1 = Unit.objects.create(name="1", room=self.dorm)
+        self.bed2 = Unit.objects.create(name="2", room=self.dorm)
+        self.suite = Unit.objects.create(
+            name="1", unit_type="PRIVATE_ROOM", room=self.private
+        )
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.check_in = date.today() + timedelta(days=5)
+        self.check_out = self.check_in + timedelta(days=3)
+
+    def book(self, unit, check_in, check_out, status="CONFIRMED"):
+        return Booking.objects.create(
+            guest=self.guest,
+            unit=unit,
+            check_in_date=check_in,
+            check_out_date=check_out,
+            status=status,
+            total_price=60,
+        )
+
+    def test_returns_all_units_when_nothing_is_booked(self):
+        units = find_available_units(self.check_in, self.check_out)
+        self.assertCountEqual(units, [self.bed1, self.bed2, self.suite])
+
+    def test_excludes_overlapping_bookings(self):
+        self.book(
+            self.bed1,
+            self.check_in - timedelta(days=1),
+            self.check_in + timedelta(days=1),
+        )
+        units = find_available_units(self.check_in, self.check_out)
+        self.assertCountEqual(units, [self.bed2, self.suite])
+
+    def test_adjacent_bookings_do_not_block(self):
+        self.book(self.bed1, self.check_in - timedelta(days=2), self.check_in)
+        self.book(
+            self.bed2,
+            self.check_out,
+            self.check_out + timedelta(days=2),
+        )
+        units = find_available_units(self.check_in, self.check_out)
+        self.assertCountEqual(units, [self.bed1, self.bed2, self.suite])
+
+    def test_cancelled_bookings_do_not_block(self):
+        booking = self.book(self.bed1, self.check_in, self.check_out)
+        booking.cancel()
+        units = find_available_units(self.check_in, self.check_out)
+        self.assertIn(self.bed1, units)
+
+    def test_filters_by_property_room_type_and_capacity(self):
+        self.assertCountEqual(
+            find_available_units(
+                self.check_in,
+                self.check_out,
+                property=self.property,
+            ),
+            [self.bed1, self.bed2],
+        )
+        self.assertCountEqual(
+            find_available_units(
+                self.check_in, self.check_out, room_type="PRIVATE_ROOM"
+            ),
+            [self.suite],
+        )
+        self.assertCountEqual(
+            find_available_units(self.check_in, self.check_out, capacity=3),
+            [self.bed1, self.bed2],
+        )
+
+    def test_excludes_inactive_units(self):
+        self.bed2.is_active = False
+        self.bed2.save()
+        units = find_available_units(
+            self.check_in, self.check_out, property=self.property
+        )
+        self.assertCountEqual(units, [self.bed1])
+
+    def test_search_runs_in_a_single_query(self):
+        self.book(self.bed1, self.check_in, self.check_out)
+        with self.assertNumQueries(1):
+            units = list(find_available_units(self.check_in, self.check_out))
+            # Las relaciones ya vienen en la misma consulta
+            [unit.room.property.name for unit in units]
+
+    def test_invalid_dates(self):
+        with self.assertRaises(ValueError):
+            find_available_units(self.check_out, self.check_in)
@@ -0,0 +1,260 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Change
+from bookings.models import Booking, ImportRun, UnitNight
+from guests.models import Guest
+from payments.models import Payment
+from rooms.models import Property, Room, Unit
+
+FIELDS = [
+    "document_type",
+    "document_number",
+    "guest_name",
+    "unit",
+    "check_in_date",
+    "check_out_date",
+    "status",
+    "total_price",
+    "paid_amount",
+    "payment_method",
+    "payment_date",
+]
+
+
+class ImportBookingsTest(TestCase):
+    def setUp(self):
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        self.unit = Unit.objects.create(name="1", room=room)
+        self.other = Unit.objects.create(name="2", room=room)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.directory.name, "bookings.csv")
+        with open(path, "w", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+        return path
+
+    def row(self, number, unit, check_in, check_out, **extra):
+        return {
+            "document_type": "DNI",
+            "document_number": number,
+            "guest_name": f"Guest {number}",
+            "unit": unit.pk,
+            "check_in_date": check_in,
+            "check_out_date": check_out,
+            "status": "CHECKED_OUT",
+            "total_price": "100.00",
+            **extra,
+        }
+
+    def run_import(self, path, *args):
+        output = StringIO()
+        call_command("import_bookings", path, *args, stdout=output)
+        return output.getvalue()
+
+    def test_imports_bookings_guests_and_payments(self):
+        path = self.write_csv(
+            [
+                self.row(
+                    "111",
+                    self.unit,
+                    "2020-01-01",
+                    "2020-01-03",
+                    paid_amount="100.00",
+                    payment_method="CASH",
+                    payment_date="2020-01-01",
+                ),
+                self.row("111", self.other, "2020-02-01", "2020-02-05"),
+                self.row("222", self.unit, "2020-01-03", "2020-01-04"),
+            ]
+        )
+
+        output = self.run_import(path, "--batch-size", "2")
+
+        self.assertIn("3 reservas, 2 huéspedes nuevos, 1 pagos", output)
+        self.assertEqual(Booking.objects.count(), 3)
+        self.assertEqual(Guest.objects.count(), 2)
+        self.assertEqual(UnitNight.objects.count(), 2 + 4 + 1)
+
+        payment = Payment.objects.get()
+        self.assertEqual(payment.amount, Decimal("100.00"))
+        self.assertEqual(payment.payment_date.date(), date(2020, 1, 1))
+        # Los cambios en lote llegan al feed
+        self.assertEqual(Change.objects.filter(model="booking").count(), 3)  # noqa
+        self.assertEqual(Change.objects.filter(model="payment").count(), 1)
+
+    def test_reuses_existing_guests_by_document(self):
+        guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="111"
+        )
+        path = self.write_csv(
+            [self.row("111", self.unit, "2020-01-01", "2020-01-03")]
+        )  # noqa
+        self.run_import(path)
+        self.assertEqual(Booking.objects.get().guest, guest)
+
+    def test_rejects_overlapping_active_bookings(self):
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=Guest.objects.create(
+                        name="Existing",
+                        document_type="DNI",
+                        document_number="999",
+                    ),
+                    unit=self.unit,
+                    check_in_date=date(2030, 1, 10),
+                    check_out_date=date(2030, 1, 15),
+                    status="CONFIRMED",
+                    total_price=100,
+                )
+            ]
+        )
+        errors = os.path.join(self.directory.name, "errors.jsonl")
+        path = self.write_csv(
+            [
+                # Se superpone con la reserva existente
+                self.row(
+                    "1",
+                    self.unit,
+                    "2030-01-08",
+                    "2030-01-11",
+                    status="CONFIRMED",  # noqa
+                ),
+                self.row(
+                    "2",
+                    self.unit,
+                    "2030-01-01",
+                    "2030-01-05",
+                    status="CONFIRMED",  # noqa
+                ),
+                # Se superpone con la fila anterior del archivo
+                self.row(
+                    "3", self.unit, "2030-01-04", "2030-01-06", status="PENDING"  # noqa
+                ),  # noqa
+                # Las reservas finalizadas no bloquean la unidad
+                self.row("4", self.unit, "2030-01-04", "2030-01-06"),
+                self.row("5", self.unit, "invalid", "2030-01-06"),
+            ]
+        )
+
+        output = self.run_import(path, "--errors", errors)
+
+        self.assertIn("2 reservas", output)
+        self.assertIn("3 filas rechazadas", output)
+        with open(errors) as rejected:
+            lines = [json.loads(line)["line"] for line in rejected]
+        self.assertEqual(lines, [1, 3, 5])
+
+    def test_resumes_from_checkpoint(self):
+        path = self.write_csv(
+            [
+                self.row(
+                    str(i),
+                    self.unit,
+                    f"2020-01-{i:02d}",
+                    f"2020-01-{i + 1:02d}",  # noqa
+                )  # noqa
+                for i in range(1, 6)
+            ]
+        )
+        ImportRun.objects.create(source=path, processed=3)
+
+        self.run_import(
+            path, "--resume", "--batch-size", "1", "--checkpoint", path
+        )  # noqa
+
+        self.assertEqual(
+            sorted(
+                Booking.objects.values_list("guest__document_number", flat=True)  # noqa
+            ),  # noqa
+            ["4", "5"],
+        )
+        self.assertEqual(ImportRun.objects.get(source=path).processed, 5)
+
+    def test_resume_after_a_crash_does_not_repeat_a_batch(self):
+        path = self.write_csv(
+            [
+                self.row(
+                    str(i),
+                    self.unit,
+                    f"2020-01-{i:02d}",
+                    f"2020-01-{i + 1:02d}",  # noqa
+                )  # noqa
+                for i in range(1, 6)
+            ]
+        )
+        # Falla justo después de confirmar el primer lote
+        with mock.patch(
+            "bookings.management.commands.import_bookings.time.perf_counter",
+            side_effect=[0, RuntimeError],
+        ):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, "--batch-size", "2")
+        self.assertEqual(Booking.objects.count(), 2)
+
+        self.run_import(path, "--resume", "--batch-size", "2")
+
+        self.assertEqual(
+            sorted(
+                Booking.objects.values_list("guest__document_number", flat=True)  # noqa
+            ),  # noqa
+            ["1", "2", "3", "4", "5"],
+        )
+
+    def test_reuses_guests_by_normalized_document(self):
+        guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        path = self.write_csv(
+            [
+                self.row("12.345.678", self.unit, "2020-01-01", "2020-01-03"),
+                self.row("12 345 678", self.other, "2020-01-01", "2020-01-03"),
+                self.row("98.765.432", self.unit, "2020-02-01", "2020-02-03"),
+                self.row("98765432", self.other, "2020-02-01", "2020-02-03"),
+            ]
+        )
+
+        output = self.run_import(path)
+
+        self.assertIn("1 huéspedes nuevos", output)
+        self.assertEqual(Booking.objects.filter(guest=guest).count(), 2)
+        self.assertEqual(Guest.objects.count(), 2)
+
+    def test_reads_jsonl_with_payment_lists(self):
+        path = os.path.join(self.directory.name, "bookings.jsonl")
+        with open(path, "w") as output:
+            row = self.row("1", self.unit, "2020-01-01", "2020-01-03")
+            row["payments"] = [
+                {"amount": "60", "payment_method": "QR"},
+                {"amount": "-10", "payment_type": "REFUND"},
+            ]
+            output.write(json.dumps(row) + "\n")
+
+        self.run_import(path)
+
+        self.assertEqual(
+            sorted(Payment.objects.values_list("amount", flat=True)),
+            [Decimal("-10.00"), Decimal("60.00")],
+        )
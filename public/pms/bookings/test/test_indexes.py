@@ -0,0 +1,195 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+
+from bookings.models import Booking
+from guests.models import Guest
+from pms.partitioning import is_partitioned
+from rooms.models import Property, Room, Unit
+
+UNITS = 100
+STAYS_PER_UNIT = 500
+
+# Estadías de 3 noches cada 4 días por unidad, desde ~5 años atrás: las
+# pasadas quedan CHECKED_OUT, las futuras CONFIRMED y una de cada siete,
+# CANCELLED
+SEED_SQL = """
+    INSERT INTO {bookings} (
+        guest_id, unit_id, check_in_date, check_out_date, status,
+        created_at, updated_at, total_price, notes
+    )
+    SELECT
+        %(guest)s,
+        u.id,
+        %(start)s::date + s * 4,
+        %(start)s::date + s * 4 + 3,
+        CASE
+            WHEN s %% 7 = 0 THEN 'CANCELLED'
+            WHEN %(start)s::date + s * 4 < CURRENT_DATE THEN 'CHECKED_OUT'
+            ELSE 'CONFIRMED'
+        END,
+        NOW() - (s * %(units)s + u.id) * interval '1 minute',
+        NOW(),
+        60,
+        ''
+    FROM {units} u
+    CROSS JOIN generate_series(0, %(stays)s - 1) AS s
+    WHERE u.id = ANY(%(unit_ids)s)
+"""
+
+
+def parent_index(name):
+    """
+    Índice de la tabla del que sale el índice de una partición (ver
+    DB_PARTITIONING); para una tabla sin particionar, el mismo índice.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT parent.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE pg_inherits.inhrelid = to_regclass(%s)",
+            [name],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else name
+
+
+def plan_nodes(queryset):
+    """Nodos del plan de EXPLAIN (FORMAT JSON) de un QuerySet."""
+    pending = [json.loads(queryset.explain(format="json"))[0]["Plan"]]
+    nodes = []
+    while pending:
+        node = pending.pop()
+        nodes.append(node)
+        pending.extend(node.get("Plans", []))
+    return nodes
+
+
+class BookingIndexesTest(TestCase):
+    """
+    Verifica con EXPLAIN que las consultas frecuentes sobre reservas usan
+    los índices de Booking.Meta.indexes sobre un volumen de datos en el
+    que recorrer la tabla completa es más caro.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=Decimal("20.00"),
+        )
+        units = Unit.objects.bulk_create(
+            Unit(name=f"{i}", room=room) for i in range(UNITS)
+        )
+        guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        cls.start = date.today() - timedelta(days=1800)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                SEED_SQL.format(
+                    bookings=Booking._meta.db_table,
+                    units=Unit._meta.db_table,
+                ),
+                {
+                    "guest": guest.pk,
+                    "start": cls.start,
+                    "units": UNITS,
+                    "stays": STAYS_PER_UNIT,
+                    "unit_ids": [unit.pk for unit in units],
+                },
+            )
+            cursor.execute(f"ANALYZE {Booking._meta.db_table}")
+        cls.unit = units[0]
+
+    def assertUsesIndex(self, queryset, name):
+        nodes = plan_nodes(queryset)
+        used = {
+            parent_index(node["Index Name"])
+            for node in nodes
+            if "Index Name" in node  # noqa
+        }
+        # Las restricciones de exclusión se crean por partición, con el
+        # nombre de la tabla como prefijo
+        self.assertTrue(
+            any(index.endswith(name) for index in used),
+            f"{name} no usado: {used}",
+        )
+        # Con la tabla particionada (DB_PARTITIONING), las particiones con
+        # pocas filas se pueden recorrer enteras
+        if not is_partitioned(Booking._meta.db_table):
+            self.assertNotIn("Seq Scan", [node["Node Type"] for node in nodes])
+
+    def test_seeded(self):
+        self.assertEqual(Booking.objects.count(), UNITS * STAYS_PER_UNIT)
+
+    def test_unit_availability(self):
+        check_in = date.today() + timedelta(days=10)
+        self.assertUsesIndex(
+            Booking.objects.filter(
+                unit=self.unit, status__in=Booking.ACTIVE_STATUSES
+            ).overlapping(check_in, check_in + timedelta(days=3)),
+            "exclude_overlapping_bookings",
+        )
+
+    def test_stays_in_period(self):
+        start = date.today() - timedelta(days=30)
+        self.assertUsesIndex(
+            Booking.objects.overlapping(start, start + timedelta(days=2)),
+            "booking_stay_gist_idx",
+        )
+
+    def test_admin_default_ordering(self):
+        self.assertUsesIndex(
+            Booking.objects.order_by("-created_at", "-id")[:100],
+            "booking_created_idx",
+        )
+
+    def test_kpi_arrivals_and_departures(self):
+        start = date.today() - timedelta(days=7)
+        end = date.today()
+        for field, index in (
+            ("check_in_date", "booking_check_in_idx"),
+            ("check_out_date", "booking_check_out_idx"),
+        ):
+            with self.subTest(field=field):
+                self.assertUsesIndex(
+                    Booking.objects.exclude(status="CANCELLED")
+                    .filter(**{f"{field}__range": (start, end)})
+                    .values_list("unit_id", field),
+                    index,
+                )
+
+    def test_front_desk_arrivals_and_departures(self):
+        day = date.today() + timedelta(days=8)
+        for queryset, index in (
+            (Booking.objects.arrivals(day), "booking_active_arrival_idx"),
+            (Booking.objects.departures(day), "booking_active_departure_idx"),  # noqa
+        ):
+            with self.subTest(index=index):
+                self.assertUsesIndex(queryset, index)
+
+    def test_overlapping(self):
+        day = self.start + timedelta(days=4)
+        stays = Booking.objects.filter(unit=self.unit)
+        # [day, day + 1) solo cae en la segunda estadía; el día de salida
+        # de una estadía no se superpone con la siguiente entrada
+        self.assertEqual(
+            list(
+                stays.overlapping(day, day + timedelta(days=1)).values_list(
+                    "check_in_date", flat=True
+                )
+            ),
+            [day],
+        )
+        self.assertEqual(
+            stays.overlapping(day - timedelta(days=1), day).count(), 0
+        )  # noqa
+        self.assertEqual(stays.overlapping(None, day).count(), 1)
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from bookings.inventory import occupancy_grid, rebuild_inventory
+from bookings.models import Booking, UnitNight
+from guests.models import Guest
+from rooms.models import Property, Room, Unit
+
+
+class UnitNightInventoryTest(TestCase):
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        self.unit = Unit.objects.create(name="1", room=self.room)
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.check_in = date.today() + timedelta(days=1)
+        self.booking = Booking.objects.create(
+            guest=self.guest,
+            unit=self.unit,
+            check_in_date=self.check_in,
+            check_out_date=self.check_in + timedelta(days=3),
+            status="PENDING",
+            total_price=60,
+        )
+
+    def nights(self):
+        return list(
+            UnitNight.objects.filter(booking=self.booking)
+            .order_by("date")
+            .values_list("date", "status")
+        )
+
+    def statuses(self):
+        return {status for _, status in self.nights()}
+
+    def test_save_creates_one_row_per_night(self):
+        self.assertEqual(
+            self.nights(),
+            [
+                (self.check_in, "PENDING"),
+                (self.check_in + timedelta(days=1), "PENDING"),
+                (self.check_in + timedelta(days=2), "PENDING"),
+            ],
+        )
+
+    def test_status_changes_are_mirrored(self):
+        self.booking.confirm_booking()
+        self.assertEqual(self.statuses(), {"CONFIRMED"})
+        self.booking.check_in()
+        self.booking.check_out()
+        self.assertEqual(self.statuses(), {"CHECKED_OUT"})
+
+    def test_changing_dates_moves_the_nights(self):
+        self.booking.check_out_date = self.check_in + timedelta(days=1)
+        self.booking.save()
+        self.assertEqual(self.nights(), [(self.check_in, "PENDING")])
+
+    def test_cancel_releases_the_nights(self):
+        self.booking.cancel()
+        self.assertEqual(self.nights(), [])
+
+    def test_delete_removes_the_nights(self):
+        self.booking.delete()
+        self.assertFalse(UnitNight.objects.exists())
+
+    def test_rebuild_from_scratch(self):
+        UnitNight.objects.all().delete()
+        self.assertEqual(rebuild_inventory(), 3)
+        self.assertEqual(len(self.nights()), 3)
+
+    def test_occupancy_grid(self):
+        with self.assertNumQueries(1):
+            grid = occupancy_grid(
+                self.check_in,
+                self.check_in + timedelta(days=7),
+            )
+        self.assertEqual(len(grid[self.unit.pk]), 3)
+        self.assertEqual(
+            grid[self.unit.pk][self.check_in],
+            {"booking_id": self.booking.pk, "status": "PENDING"},
+        )
+
+    def test_calendar_view(self):
+        user = User.objects.create_user(username="desk", password="pass1234")
+        self.client.force_login(user)
+        response = self.client.get(reverse("booking_calendar"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f"Reserva #{self.booking.pk}")
+
+    def test_calendar_view_ignores_invalid_dates(self):
+        user = User.objects.create_user(username="desk", password="pass1234")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("booking_calendar"), {"start": "2024-02-30"}
+        )  # noqa
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["dates"][0], date.today())
+
+    def test_calendar_view_ignores_invalid_property(self):
+        user = User.objects.create_user(username="desk", password="pass1234")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("booking_calendar"), {"property": "abc"}
+        )  # noqa
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context["property_id"])
+        self.assertContains(response, f"Reserva #{self.booking.pk}")
@@ -0,0 +1,103 @@
+import threading
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from bookings.models import Booking
+from guests.models import Guest
+from rooms.models import Property, Room, Unit
+
+
+def create_unit_and_guest():
+    property = Property.objects.create(
+        name="Hostel Example",
+        property_type="HOSTEL",
+    )
+    room = Room.objects.create(
+        property=property, name="Dorm 1", room_type="DORM", base_price=20
+    )
+    unit = Unit.objects.create(name="1", room=room)
+    guest = Guest.objects.create(
+        name="John Doe", document_type="DNI", document_number="12345678"
+    )
+    return unit, guest
+
+
+class BookingOverlapConstraintTest(TestCase):
+    def setUp(self):
+        self.unit, self.guest = create_unit_and_guest()
+        self.check_in = date.today() + timedelta(days=1)
+        self.check_out = self.check_in + timedelta(days=3)
+        self.booking = self.build()
+        self.booking.save()
+
+    def build(self, check_in=None, check_out=None, status="CONFIRMED"):
+        return Booking(
+            guest=self.guest,
+            unit=self.unit,
+            check_in_date=check_in or self.check_in,
+            check_out_date=check_out or self.check_out,
+            status=status,
+            total_price=60,
+        )
+
+    def test_save_relies_on_the_constraint(self):
+        # Aunque la verificación previa no detecte la superposición,
+        # la base de datos la rechaza y save() la traduce
+        with mock.patch.object(
+            Booking, "is_unit_available", return_value=True
+        ) as check:
+            with self.assertRaises(ValidationError) as ctx:
+                self.build(check_out=self.check_in + timedelta(days=1)).save()
+        check.assert_not_called()
+        self.assertIn("no está disponible", str(ctx.exception))
+
+    def test_failed_save_keeps_the_transaction_usable(self):
+        with self.assertRaises(ValidationError):
+            self.build().save()
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_adjacent_and_cancelled_bookings_are_allowed(self):
+        self.build(self.check_out, self.check_out + timedelta(days=2)).save()
+        self.build(status="CANCELLED").save()
+        self.assertEqual(Booking.objects.count(), 3)
+
+    def test_constraint_also_applies_to_bulk_inserts(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Booking.objects.bulk_create([self.build()])
+
+
+class ConcurrentBookingTest(TransactionTestCase):
+    def test_only_one_concurrent_booking_wins(self):
+        unit, guest = create_unit_and_guest()
+        check_in = date.today() + timedelta(days=1)
+        barrier = threading.Barrier(2)
+        results = []
+
+        def book():
+            barrier.wait()
+            try:
+                Booking(
+                    guest=guest,
+                    unit=unit,
+                    check_in_date=check_in,
+                    check_out_date=check_in + timedelta(days=2),
+                    total_price=40,
+                ).save()
+                results.append("ok")
+            except ValidationError:
+                results.append("rejected")
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertCountEqual(results, ["ok", "rejected"])
+        self.assertEqual(Booking.objects.count(), 1)
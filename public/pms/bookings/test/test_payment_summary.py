@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import Payment
+from rooms.models import Property, Room, Unit
+
+
+class BookingPaymentSummaryTest(TestCase):
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property, name="Dorm 1", room_type="DORM"
+        )
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.check_in = date.today() + timedelta(days=1)
+        self.bookings = []
+        for i in range(4):
+            unit = Unit.objects.create(name=f"{i}", room=self.room)
+            self.bookings.append(
+                Booking.objects.create(
+                    guest=self.guest,
+                    unit=unit,
+                    check_in_date=self.check_in,
+                    check_out_date=self.check_in + timedelta(days=2),
+                    total_price=Decimal("100.00"),
+                )
+            )
+
+        self.user = User.objects.create_user(username="desk", password="x")
+        no_payment, partial, paid, refunded = self.bookings
+        Payment.objects.create(
+            booking=partial,
+            amount=Decimal("40.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        Payment.objects.create(
+            booking=partial,
+            amount=Decimal("60.00"),
+            payment_method="QR",
+            status="PENDING",
+            created_by=self.user,
+        )
+        Payment.objects.create(
+            booking=paid,
+            amount=Decimal("100.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        payment = Payment.objects.create(
+            booking=refunded,
+            amount=Decimal("100.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        payment.refund(amount=Decimal("30.00"), user=self.user)
+
+    def test_summary_is_annotated_in_one_query(self):
+        with self.assertNumQueries(1):
+            summary = {
+                booking.pk: (
+                    booking.total_paid,
+                    booking.total_refunded,
+                    booking.pending_debt,
+                    booking.get_payment_status(),
+                )
+                for booking in Booking.objects.with_payment_summary()
+            }
+
+        no_payment, partial, paid, refunded = self.bookings
+        self.assertEqual(summary[no_payment.pk], (0, 0, 100, "NO_PAYMENT"))
+        self.assertEqual(summary[partial.pk], (40, 0, 60, "PARTIAL_PAYMENT"))
+        self.assertEqual(summary[paid.pk], (100, 0, 0, "FULLY_PAID"))
+        self.assertEqual(summary[refunded.pk], (100, 30, 30, "PARTIAL_PAYMENT"))  # noqa
+
+    def test_annotation_matches_get_payment_status(self):
+        annotated = Booking.objects.with_payment_summary().in_bulk()
+        for booking in self.bookings:
+            self.assertEqual(
+                annotated[booking.pk].get_payment_status(),
+                Booking.objects.get(pk=booking.pk).get_payment_status(),
+            )
+
+    def test_payment_clean_reuses_the_annotation(self):
+        bookings = Booking.objects.with_payment_summary()
+        partial = bookings.get(pk=self.bookings[1].pk)
+        payment = Payment(
+            booking=partial,
+            amount=Decimal("70.00"),
+            payment_method="CASH",
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        with self.assertNumQueries(0):
+            with self.assertRaisesMessage(ValidationError, "excede la deuda"):
+                payment.clean()
@@ -1,3 +1,62 @@
-from django.shortcuts import render  # noqa
+from datetime import date, timedelta
 
-# Create your views here.
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render
+from django.utils.dateparse import parse_date
+
+from rooms.models import Property, Unit
+
+from .inventory import calendar_dates, occupancy_grid
+
+CALENDAR_DAYS = 14
+
+
+def _start_date(value):
+    """Fecha inicial del calendario; hoy si falta o no es válida."""
+    try:
+        return parse_date(value or "") or date.today()
+    except ValueError:  # p. ej. 2024-02-30
+        return date.today()
+
+
+def _property_id(value):
+    """ID de propiedad a filtrar; se ignora si no es un entero."""
+    try:
+        return str(int(value)) if value else None
+    except ValueError:
+        return None
+
+
+@login_required
+def calendar(request):
+    """Calendario de ocupación unidades x noches leído de UnitNight."""
+    start_date = _start_date(request.GET.get("start"))
+    end_date = start_date + timedelta(days=CALENDAR_DAYS)
+    property_id = _property_id(request.GET.get("property"))
+
+    units = Unit.objects.filter(is_active=True).select_related(
+        "room",
+        "room__property",
+    )
+    if property_id:
+        units = units.filter(room__property_id=property_id)
+    units = units.order_by("room__property__name", "room__name", "name")
+
+    dates = calendar_dates(start_date, end_date)
+    grid = occupancy_grid(start_date, end_date, property=property_id)
+    rows = []
+    for unit in units:
+        rows.append((unit, [grid[unit.pk].get(night) for night in dates]))
+
+    return render(
+        request,
+        "bookings/calendar.html",
+        {
+            "dates": dates,
+            "rows": rows,
+            "properties": Property.objects.filter(is_active=True),
+            "property_id": property_id,
+            "previous_start": start_date - timedelta(days=CALENDAR_DAYS),
+            "next_start": end_date,
+        },
+    )
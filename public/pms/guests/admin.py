@@ -1,6 +1,21 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.utils.translation import gettext_lazy as _
 
-from .models import Guest
+from bookings.admin import ReadOnlyAdminMixin
+
+from .models import Guest, GuestMerge
+from .search import search_guests
+
+
+class GuestChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        # Con una búsqueda activa, y salvo que se ordene por una columna,
+        # se listan primero los más relevantes
+        if self.query.strip() and ORDER_VAR not in self.params:
+            queryset = queryset.order_by("-search_rank", "name", "pk")
+        return queryset
 
 
 @admin.register(Guest)
@@ -14,7 +29,10 @@ class GuestAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("name", "nationality")
-    search_fields = ("name", "phone_number", "email", "nationality")
+    # La búsqueda se resuelve con search_guests() (índices trigram y de
+    # documento); search_fields solo habilita la caja de búsqueda
+    search_fields = ("name", "document_number", "phone_number", "email")
+    search_help_text = _("Nombre, documento, teléfono o correo electrónico")
     date_hierarchy = "created_at"
     ordering = ("-created_at",)
     fieldsets = (
@@ -32,3 +50,27 @@ class GuestAdmin(admin.ModelAdmin):
         ),
     )
     readonly_fields = ("created_at", "updated_at")
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return search_guests(search_term, queryset=queryset), False
+
+    def get_changelist(self, request, **kwargs):
+        return GuestChangeList
+
+
+@admin.register(GuestMerge)
+class GuestMergeAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = (
+        "merged_name",
+        "merged_document",
+        "survivor",
+        "score",
+        "bookings",
+        "merged_at",
+    )
+    list_select_related = ("survivor",)
+    search_fields = ("merged_name", "merged_document")
+    date_hierarchy = "merged_at"
+    ordering = ("-merged_at",)
@@ -0,0 +1,380 @@
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.models import ArchivedBooking, Booking
+from bookings.signals import bookings_bulk_changed
+
+from .models import DedupeRun, Guest, GuestMerge
+
+# Puntaje mínimo para fusionar dos huéspedes
+MERGE_THRESHOLD = 0.8
+
+# Dígitos mínimos para usar el teléfono como clave de bloqueo
+MIN_PHONE_DIGITS = 6
+
+# Bloques más grandes se descartan: suelen ser valores de relleno
+# (p. ej. el teléfono "000000") y no identifican a una persona
+MAX_BLOCK_SIZE = 50
+
+# Campos que se comparan al puntuar un par de candidatos
+FIELDS = (
+    "id",
+    "name",
+    "document_type",
+    "document_normalized",
+    "email_normalized",
+    "phone_normalized",
+    "birth_date",
+)
+
+# Datos de contacto que el huésped conservado toma de sus duplicados
+# cuando no los tiene cargados
+FILL_FIELDS = ("birth_date", "phone_number", "email", "nationality")
+
+REPOINT_SQL = """
+    UPDATE {bookings} AS b
+    SET guest_id = m.survivor_id, updated_at = %s
+    FROM unnest(%s::bigint[], %s::bigint[]) AS m(duplicate_id, survivor_id)
+    WHERE b.guest_id = m.duplicate_id
+    RETURNING b.id, m.duplicate_id
+"""
+
+# Las reservas archivadas conservan su fecha de modificación
+REPOINT_ARCHIVED_SQL = """
+    UPDATE {bookings} AS b
+    SET guest_id = m.survivor_id
+    FROM unnest(%s::bigint[], %s::bigint[]) AS m(duplicate_id, survivor_id)
+    WHERE b.guest_id = m.duplicate_id
+    RETURNING b.id, m.duplicate_id
+"""
+
+
+def normalize_name(value):
+    """Nombre en minúsculas, sin acentos ni espacios repetidos."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.casefold().split())
+
+
+def block_keys(guest):
+    """Claves de bloqueo: solo se comparan huéspedes que compartan una."""
+    keys = []
+    if guest["document_normalized"]:
+        keys.append(("document", guest["document_normalized"]))
+    if guest["email_normalized"]:
+        keys.append(("email", guest["email_normalized"]))
+    if len(guest["phone_normalized"]) >= MIN_PHONE_DIGITS:
+        keys.append(("phone", guest["phone_normalized"]))
+    return keys
+
+
+def score(a, b):
+    """
+    Puntaje de similitud entre dos huéspedes (diccionarios con FIELDS).
+
+    El documento pesa más que el correo y el teléfono, y el nombre suma
+    de forma proporcional a su parecido. Una fecha de nacimiento distinta
+    resta, ya que suele indicar familiares que comparten contacto.
+    """
+    points = 0.0
+    if a["document_normalized"] and (
+        a["document_normalized"] == b["document_normalized"]
+    ):
+        points += 0.6 if a["document_type"] == b["document_type"] else 0.4
+    if a["email_normalized"] and a["email_normalized"] == b["email_normalized"]:  # noqa
+        points += 0.3
+    if len(a["phone_normalized"]) >= MIN_PHONE_DIGITS and (
+        a["phone_normalized"] == b["phone_normalized"]
+    ):
+        points += 0.2
+    points += (
+        0.3
+        * SequenceMatcher(
+            None, normalize_name(a["name"]), normalize_name(b["name"])
+        ).ratio()
+    )
+    if a["birth_date"] and b["birth_date"]:
+        points += 0.1 if a["birth_date"] == b["birth_date"] else -0.3
+    return round(points, 3)
+
+
+class GuestDeduplicator:
+    """
+    Detecta y fusiona huéspedes duplicados de forma incremental.
+
+    Cada ejecución revisa solo los huéspedes creados después de la marca
+    de agua de la ejecución anterior (DedupeRun.last_guest_id). Los
+    candidatos se buscan por bloqueo (documento, correo o teléfono
+    normalizados, con índice) en lugar de comparar todos contra todos, y
+    cada par se puntúa con score(). Los grupos que superan el umbral se
+    fusionan en el huésped más antiguo: sus reservas se reasignan con un
+    único UPDATE y los duplicados se eliminan.
+
+    Ejemplo:
+        deduplicator = GuestDeduplicator(batch_size=1000)
+        for last_guest_id in deduplicator.run():
+            ...
+        deduplicator.stats  # {"checked": ..., "merged": ..., ...}
+    """
+
+    def __init__(
+        self, batch_size=1000, threshold=MERGE_THRESHOLD, dry_run=False
+    ):  # noqa
+        self.batch_size = batch_size
+        self.threshold = threshold
+        self.dry_run = dry_run
+        self.stats = Counter()
+        self.matches = []
+
+    def run(self, since=None):
+        """
+        Revisa los huéspedes posteriores a `since` (por defecto, la marca
+        de agua de la última ejecución) en lotes.
+
+        Genera, después de confirmar cada lote, el último ID revisado. La
+        marca de agua se guarda por lote, así que una ejecución
+        interrumpida continúa desde el último lote confirmado.
+        """
+        if since is None:
+            since = last_checked_guest_id()
+
+        dedupe_run = None
+        if not self.dry_run:
+            dedupe_run = DedupeRun.objects.create(last_guest_id=since)
+
+        last_id = since
+        while True:
+            batch = list(
+                Guest.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values(*FIELDS)[: self.batch_size]
+            )
+            if not batch:
+                break
+
+            with transaction.atomic():
+                clusters = self.cluster(self.find_matches(batch))
+                if not self.dry_run:
+                    self.merge(clusters)
+                last_id = batch[-1]["id"]
+                self.stats["checked"] += len(batch)
+                if dedupe_run is not None:
+                    dedupe_run.last_guest_id = last_id
+                    dedupe_run.checked = self.stats["checked"]
+                    dedupe_run.merged = self.stats["merged"]
+                    dedupe_run.save()
+            yield last_id
+
+        if dedupe_run is not None:
+            dedupe_run.finished_at = timezone.now()
+            dedupe_run.save(update_fields=["finished_at"])
+
+    def find_matches(self, batch):
+        """
+        Pares (id_anterior, id_nuevo, puntaje) que superan el umbral.
+
+        Los candidatos de todo el lote se cargan en una sola consulta por
+        sus claves de bloqueo; solo se comparan con huéspedes anteriores,
+        de modo que cada par se evalúa una única vez.
+        """
+        keys = defaultdict(set)
+        for guest in batch:
+            for kind, value in block_keys(guest):
+                keys[kind].add(value)
+
+        candidates = Guest.objects.filter(
+            Q(document_normalized__in=keys["document"])
+            | Q(email_normalized__in=keys["email"])
+            | Q(phone_normalized__in=keys["phone"])
+        ).values(*FIELDS)
+
+        blocks = defaultdict(list)
+        for candidate in candidates:
+            for key in block_keys(candidate):
+                blocks[key].append(candidate)
+
+        scores = {}
+        for guest in batch:
+            for key in block_keys(guest):
+                block = blocks[key]
+                if len(block) > MAX_BLOCK_SIZE:
+                    self.stats["skipped_blocks"] += 1
+                    continue
+                for other in block:
+                    pair = (other["id"], guest["id"])
+                    if other["id"] < guest["id"] and pair not in scores:
+                        scores[pair] = score(other, guest)
+
+        self.stats["candidates"] += len(scores)
+        matches = [
+            (older, newer, points)
+            for (older, newer), points in scores.items()
+            if points >= self.threshold
+        ]
+        self.matches.extend(matches)
+        return matches
+
+    def cluster(self, matches):
+        """
+        Agrupa los pares en componentes conexas.
+
+        Returns:
+            dict: {id_conservado: {id_duplicado: puntaje}}, donde el
+            conservado es el huésped más antiguo del grupo
+        """
+        parent = {}
+
+        def find(guest_id):
+            parent.setdefault(guest_id, guest_id)
+            while parent[guest_id] != guest_id:
+                parent[guest_id] = parent[parent[guest_id]]
+                guest_id = parent[guest_id]
+            return guest_id
+
+        for older, newer, points in matches:
+            a, b = find(older), find(newer)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+        best = defaultdict(float)
+        for older, newer, points in matches:
+            best[older] = max(best[older], points)
+            best[newer] = max(best[newer], points)
+
+        clusters = defaultdict(dict)
+        for guest_id in parent:
+            survivor = find(guest_id)
+            if guest_id != survivor:
+                clusters[survivor][guest_id] = best[guest_id]
+        return clusters
+
+    def merge(self, clusters):
+        """
+        Fusiona cada grupo en su huésped conservado.
+
+        Completa los datos faltantes del conservado con los de sus
+        duplicados (el más reciente primero), reasigna las reservas en un
+        único UPDATE, registra cada fusión en GuestMerge y elimina los
+        duplicados.
+        """
+        if not clusters:
+            return
+
+        survivor_of = {
+            duplicate: survivor
+            for survivor, duplicates in clusters.items()
+            for duplicate in duplicates
+        }
+        guests = Guest.objects.select_for_update().in_bulk(
+            [*clusters, *survivor_of]
+        )  # noqa
+
+        # Un grupo puede unir dos huéspedes conservados en ejecuciones
+        # anteriores: sus fusiones pasan al nuevo conservado
+        previous = list(GuestMerge.objects.filter(survivor_id__in=survivor_of))
+        for merge in previous:
+            merge.survivor_id = survivor_of[merge.survivor_id]
+        GuestMerge.objects.bulk_update(previous, ["survivor"])
+
+        booking_counts = self.repoint_bookings(survivor_of)
+
+        # El usuario propietario es único: se libera antes de moverlo
+        owners = {
+            pk: guests[pk].reservation_owner_id
+            for pk in survivor_of
+            if pk in guests and guests[pk].reservation_owner_id
+        }
+        if owners:
+            Guest.objects.filter(pk__in=owners).update(reservation_owner=None)
+
+        survivors = []
+        for survivor_id, duplicates in clusters.items():
+            survivor = guests.get(survivor_id)
+            if survivor is None:
+                continue
+            for duplicate_id in sorted(duplicates, reverse=True):
+                duplicate = guests.get(duplicate_id)
+                if duplicate is None:
+                    continue
+                for field in FILL_FIELDS:
+                    if not getattr(survivor, field):
+                        setattr(survivor, field, getattr(duplicate, field))
+                if not survivor.reservation_owner_id and duplicate_id in owners:  # noqa
+                    survivor.reservation_owner_id = owners[duplicate_id]
+            survivor.normalize()
+            survivors.append(survivor)
+        Guest.objects.bulk_update(
+            survivors,
+            [
+                *FILL_FIELDS,
+                "reservation_owner",
+                "phone_normalized",
+                "email_normalized",
+            ],
+        )
+
+        GuestMerge.objects.bulk_create(
+            GuestMerge(
+                survivor_id=survivor_of[duplicate_id],
+                merged_guest_id=duplicate_id,
+                merged_name=guests[duplicate_id].name,
+                merged_document=(
+                    f"{guests[duplicate_id].document_type} "
+                    f"{guests[duplicate_id].document_number}"
+                ),
+                score=clusters[survivor_of[duplicate_id]][duplicate_id],
+                bookings=booking_counts[duplicate_id],
+            )
+            for duplicate_id in survivor_of
+            if duplicate_id in guests
+        )
+        Guest.objects.filter(pk__in=survivor_of).delete()
+        self.stats["merged"] += len(survivor_of)
+
+    def repoint_bookings(self, survivor_of):
+        """
+        Reasigna las reservas de los duplicados, activas y archivadas, a su
+        huésped conservado.
+
+        Returns:
+            Counter: reservas reasignadas por ID de duplicado
+        """
+        duplicates = list(survivor_of)
+        survivors = [survivor_of[pk] for pk in duplicates]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                REPOINT_SQL.format(bookings=Booking._meta.db_table),
+                [timezone.now(), duplicates, survivors],
+            )
+            repointed = cursor.fetchall()
+            cursor.execute(
+                REPOINT_ARCHIVED_SQL.format(
+                    bookings=ArchivedBooking._meta.db_table
+                ),  # noqa
+                [duplicates, survivors],
+            )
+            archived = cursor.fetchall()
+
+        booking_ids = [booking_id for booking_id, duplicate_id in repointed]
+        counts = Counter(
+            duplicate_id for booking_id, duplicate_id in repointed + archived
+        )
+        if booking_ids:
+            bookings_bulk_changed.send(sender=Booking, booking_ids=booking_ids)
+        self.stats["bookings"] += len(booking_ids) + len(archived)
+        return counts
+
+
+def last_checked_guest_id():
+    """Marca de agua de la última ejecución (0 si nunca se ejecutó)."""
+    return (
+        DedupeRun.objects.order_by("-pk")
+        .values_list("last_guest_id", flat=True)
+        .first()
+        or 0
+    )
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from guests.dedupe import MERGE_THRESHOLD, GuestDeduplicator
+
+
+class Command(BaseCommand):
+    help = (
+        "Detecta y fusiona huéspedes duplicados. Solo revisa los huéspedes "
+        "creados desde la ejecución anterior, por lo que puede programarse "
+        "a diario (p. ej. desde cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=MERGE_THRESHOLD,
+            help="Puntaje mínimo para fusionar dos huéspedes",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Revisa todos los huéspedes, no solo los nuevos",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Informa los duplicados encontrados sin fusionarlos",
+        )
+
+    def handle(self, *args, **options):
+        deduplicator = GuestDeduplicator(
+            batch_size=options["batch_size"],
+            threshold=options["threshold"],
+            dry_run=options["dry_run"],
+        )
+        start = time.perf_counter()
+        for last_guest_id in deduplicator.run(0 if options["full"] else None):
+            self.stdout.write(
+                f"Revisados hasta el huésped {last_guest_id}: "
+                f"{deduplicator.stats['checked']} huéspedes, "
+                f"{deduplicator.stats['candidates']} pares candidatos"
+            )
+
+        if options["dry_run"]:
+            for older, newer, points in deduplicator.matches:
+                self.stdout.write(f"{newer} -> {older} ({points:.3f})")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Duplicados fusionados: {deduplicator.stats['merged']}, "
+                f"reservas reasignadas: {deduplicator.stats['bookings']} "
+                f"({time.perf_counter() - start:.1f}s)."
+            )
+        )
@@ -0,0 +1,131 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:31
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guests", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AlterModelOptions(
+            name="guest",
+            options={"verbose_name": "Huésped", "verbose_name_plural": "Huéspedes"},
+        ),
+        migrations.AddField(
+            model_name="guest",
+            name="email_normalized",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=254
+            ),
+        ),
+        migrations.AddField(
+            model_name="guest",
+            name="phone_normalized",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=20
+            ),
+        ),
+        migrations.RunSQL(
+            # Carga inicial de las columnas normalizadas
+            """
+            UPDATE guests_guest
+            SET phone_normalized = regexp_replace(phone_number, '\\D', '', 'g'),
+                email_normalized = lower(trim(coalesce(email, '')))
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="birth_date",
+            field=models.DateField(
+                blank=True, null=True, verbose_name="Fecha de nacimiento"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="document_number",
+            field=models.CharField(max_length=20, verbose_name="Número de documento"),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="document_type",
+            field=models.CharField(
+                choices=[
+                    ("DNI", "Documento Nacional de Identidad"),
+                    ("PASSPORT", "Pasaporte"),
+                ],
+                max_length=8,
+                verbose_name="Tipo de documento",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="email",
+            field=models.EmailField(
+                blank=True, max_length=254, null=True, verbose_name="Correo electrónico"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="name",
+            field=models.CharField(max_length=100, verbose_name="Nombre"),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="nationality",
+            field=models.CharField(max_length=50, verbose_name="Nacionalidad"),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="phone_number",
+            field=models.CharField(max_length=20, verbose_name="Número de teléfono"),
+        ),
+        migrations.AlterField(
+            model_name="guest",
+            name="reservation_owner",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Propietario de la reserva",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guest",
+            index=models.Index(
+                fields=["document_type", "document_number"], name="guest_document_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guest",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="guest_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guest",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["email_normalized"],
+                name="guest_email_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guest",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["phone_normalized"],
+                name="guest_phone_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
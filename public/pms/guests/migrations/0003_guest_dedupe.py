@@ -0,0 +1,120 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("guests", "0002_guest_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DedupeRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_guest_id", models.BigIntegerField(default=0)),
+                ("checked", models.PositiveIntegerField(default=0)),
+                ("merged", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "Detección de duplicados",
+                "verbose_name_plural": "Detecciones de duplicados",
+            },
+        ),
+        migrations.CreateModel(
+            name="GuestMerge",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "merged_guest_id",
+                    models.BigIntegerField(verbose_name="ID del huésped fusionado"),
+                ),
+                (
+                    "merged_name",
+                    models.CharField(max_length=100, verbose_name="Nombre"),
+                ),
+                (
+                    "merged_document",
+                    models.CharField(max_length=30, verbose_name="Documento"),
+                ),
+                (
+                    "score",
+                    models.DecimalField(
+                        decimal_places=3, max_digits=4, verbose_name="Puntaje"
+                    ),
+                ),
+                (
+                    "bookings",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Reservas reasignadas"
+                    ),
+                ),
+                (
+                    "merged_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha de fusión"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Fusión de huéspedes",
+                "verbose_name_plural": "Fusiones de huéspedes",
+            },
+        ),
+        migrations.AddField(
+            model_name="guest",
+            name="document_normalized",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=20
+            ),
+        ),
+        migrations.RunSQL(
+            # Carga inicial del documento normalizado
+            """
+            UPDATE guests_guest
+            SET document_normalized = regexp_replace(
+                upper(document_number), '[^0-9A-Z]', '', 'g'
+            )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="guest",
+            index=models.Index(
+                fields=["document_normalized"], name="guest_document_norm_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="guestmerge",
+            name="survivor",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="merges",
+                to="guests.guest",
+                verbose_name="Huésped conservado",
+            ),
+        ),
+    ]
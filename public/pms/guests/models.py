@@ -1,10 +1,27 @@
+import re
 from datetime import date
 
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
+def normalize_phone(value):
+    """Deja solo los dígitos del teléfono (sin +, espacios ni guiones)."""
+    return re.sub(r"\D", "", value or "")
+
+
+def normalize_document(value):
+    """Número de documento en mayúsculas, solo letras y dígitos."""
+    return re.sub(r"[^0-9A-Z]", "", (value or "").upper())
+
+
+def normalize_email(value):
+    """Correo en minúsculas y sin espacios alrededor."""
+    return (value or "").strip().lower()
+
+
 class Guest(models.Model):
     DOCUMENT_TYPES = [
         ("DNI", _("Documento Nacional de Identidad")),
@@ -50,6 +67,20 @@ class Guest(models.Model):
         blank=True,
     )
 
+    # Copias normalizadas para la búsqueda (ver guests.search) y la
+    # detección de duplicados (ver guests.dedupe)
+    document_normalized = models.CharField(
+        max_length=20, blank=True, default="", editable=False
+    )
+
+    phone_normalized = models.CharField(
+        max_length=20, blank=True, default="", editable=False
+    )
+
+    email_normalized = models.CharField(
+        max_length=254, blank=True, default="", editable=False
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     updated_at = models.DateTimeField(auto_now=True)
@@ -57,10 +88,58 @@ class Guest(models.Model):
     class Meta:
         verbose_name = _("Huésped")
         verbose_name_plural = _("Huéspedes")
+        indexes = [
+            models.Index(
+                fields=["document_type", "document_number"],
+                name="guest_document_idx",
+            ),
+            models.Index(
+                fields=["document_normalized"],
+                name="guest_document_norm_idx",
+            ),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="guest_name_trgm_idx",
+            ),
+            GinIndex(
+                fields=["email_normalized"],
+                opclasses=["gin_trgm_ops"],
+                name="guest_email_trgm_idx",
+            ),
+            GinIndex(
+                fields=["phone_normalized"],
+                opclasses=["gin_trgm_ops"],
+                name="guest_phone_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def normalize(self):
+        """
+        Actualiza las columnas normalizadas. Los altas masivas
+        (bulk_create) no pasan por save() y deben llamarlo explícitamente.
+        """
+        self.document_normalized = normalize_document(self.document_number)
+        self.phone_normalized = normalize_phone(self.phone_number)
+        self.email_normalized = normalize_email(self.email)
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            {"document_number", "phone_number", "email"} & set(update_fields)
+        ):
+            kwargs["update_fields"] = {
+                *update_fields,
+                "document_normalized",
+                "phone_normalized",
+                "email_normalized",
+            }
+        super().save(*args, **kwargs)
+
     def age(self):
         if self.birth_date:
             today = date.today()
@@ -73,3 +152,74 @@ class Guest(models.Model):
                 )
             )
         return None
+
+
+class GuestMerge(models.Model):
+    """
+    Registro de un huésped duplicado fusionado en otro (ver guests.dedupe).
+
+    Conserva los datos con los que se identificó al duplicado, ya que la
+    fila original se elimina al fusionarlo.
+    """
+
+    survivor = models.ForeignKey(
+        Guest,
+        on_delete=models.CASCADE,
+        related_name="merges",
+        verbose_name=_("Huésped conservado"),
+    )
+
+    merged_guest_id = models.BigIntegerField(
+        verbose_name=_("ID del huésped fusionado")
+    )  # noqa
+
+    merged_name = models.CharField(max_length=100, verbose_name=_("Nombre"))
+
+    merged_document = models.CharField(
+        max_length=30, verbose_name=_("Documento")
+    )  # noqa
+
+    score = models.DecimalField(
+        max_digits=4, decimal_places=3, verbose_name=_("Puntaje")
+    )  # noqa
+
+    bookings = models.PositiveIntegerField(
+        default=0, verbose_name=_("Reservas reasignadas")
+    )
+
+    merged_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Fecha de fusión")
+    )
+
+    class Meta:
+        verbose_name = _("Fusión de huéspedes")
+        verbose_name_plural = _("Fusiones de huéspedes")
+
+    def __str__(self):
+        return f"{self.merged_name} -> {self.survivor_id}"
+
+
+class DedupeRun(models.Model):
+    """
+    Ejecución del proceso de detección de duplicados.
+
+    last_guest_id es la marca de agua: la siguiente ejecución solo
+    revisa los huéspedes creados después de ese ID.
+    """
+
+    last_guest_id = models.BigIntegerField(default=0)
+
+    checked = models.PositiveIntegerField(default=0)
+
+    merged = models.PositiveIntegerField(default=0)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Detección de duplicados")
+        verbose_name_plural = _("Detecciones de duplicados")
+
+    def __str__(self):
+        return f"#{self.pk} hasta el huésped {self.last_guest_id}"
@@ -0,0 +1,106 @@
+from django.contrib.postgres.search import (
+    TrigramSimilarity,
+    TrigramWordSimilarity,
+)
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import Case, When
+
+from .models import (
+    Guest,
+    normalize_document,
+    normalize_email,
+    normalize_phone,
+)
+
+# Dígitos mínimos para buscar por teléfono (evita escanear con "12")
+MIN_PHONE_DIGITS = 4
+
+# Caracteres mínimos para buscar por correo
+MIN_EMAIL_LENGTH = 3
+
+# Peso de cada tipo de coincidencia en el ranking
+DOCUMENT_RANK = 2.0
+CONTACT_RANK = 1.0
+
+
+def _document_numbers(term):
+    """Variantes del número de documento tal como se guardó: tal cual y
+    en mayúsculas."""
+    return {term, term.upper()}
+
+
+def _rank(condition, weight):
+    return Case(
+        When(condition, then=Value(weight)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def search_guests(query, queryset=None, limit=None):
+    """
+    Busca huéspedes y los devuelve ordenados por relevancia.
+
+    Cada criterio se resuelve con un índice, de modo que PostgreSQL
+    combina los resultados con un BitmapOr en lugar de recorrer la tabla:
+
+    - Documento exacto: índice btree (document_type, document_number),
+      o sin puntos, espacios ni guiones contra document_normalized
+      (p. ej. 12345678 encuentra 12.345.678 y viceversa).
+    - Nombre: similitud de pg_trgm sobre el nombre completo (operador %)
+      o sobre alguna de sus palabras (operador <%); tolera errores de
+      tipeo y nombres incompletos.
+    - Teléfono: dígitos contenidos en phone_normalized (índice trigram).
+    - Correo: texto contenido en email_normalized (índice trigram).
+
+    Args:
+        query (str): Texto ingresado en recepción
+        queryset (QuerySet, optional): Huéspedes sobre los que buscar
+        limit (int, optional): Cantidad máxima de resultados
+
+    Returns:
+        QuerySet: Huéspedes anotados con search_rank, de mayor a menor
+    """
+    if queryset is None:
+        queryset = Guest.objects.all()
+
+    term = (query or "").strip()
+    if not term:
+        return queryset.none()
+
+    document = Q(
+        document_type__in=[code for code, label in Guest.DOCUMENT_TYPES],
+        document_number__in=_document_numbers(term),
+    )
+    normalized = normalize_document(term)
+    if normalized:
+        document |= Q(document_normalized=normalized)
+    name = Q(name__trigram_similar=term) | Q(name__trigram_word_similar=term)
+
+    conditions = document | name
+    ranks = [_rank(document, DOCUMENT_RANK)]
+
+    digits = normalize_phone(term)
+    if len(digits) >= MIN_PHONE_DIGITS:
+        phone = Q(phone_normalized__contains=digits)
+        conditions |= phone
+        ranks.append(_rank(phone, CONTACT_RANK))
+
+    email = normalize_email(term)
+    if len(email) >= MIN_EMAIL_LENGTH and " " not in email:
+        email_match = Q(email_normalized__contains=email)
+        conditions |= email_match
+        ranks.append(_rank(email_match, CONTACT_RANK))
+
+    rank = TrigramSimilarity("name", term) + TrigramWordSimilarity(term, "name")  # noqa
+    for extra in ranks:
+        rank = rank + extra
+
+    results = (
+        queryset.filter(conditions)
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", "name", "pk")
+    )
+    if limit is not None:
+        results = results[:limit]
+    return results
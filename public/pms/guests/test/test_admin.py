@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from guests.models import Guest, GuestMerge
+
+
+class GuestAdminQueriesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        self.client.force_login(self.user)
+
+    def seed(self, start, count):
+        Guest.objects.bulk_create(
+            Guest(
+                name=f"Guest {i}",
+                document_type="DNI",
+                document_number=f"{i:08d}",
+            )
+            for i in range(start, start + count)
+        )
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("admin:guests_guest_changelist"))  # noqa
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_guest_changelist(self):
+        self.seed(0, 2)
+        few = self.changelist_queries()
+        self.seed(2, 20)
+        self.assertEqual(self.changelist_queries(), few)
+
+
+class GuestMergeAdminTest(TestCase):
+    def test_merges_are_read_only(self):
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", password="x")
+        )
+        merge = GuestMerge.objects.create(
+            survivor=Guest.objects.create(
+                name="John Doe", document_type="DNI", document_number="1"
+            ),
+            merged_guest_id=2,
+            merged_name="Jon Doe",
+            merged_document="DNI 1",
+            score="0.950",
+        )
+
+        delete = reverse("admin:guests_guestmerge_delete", args=[merge.pk])
+        self.assertEqual(
+            self.client.post(delete, {"post": "yes"}).status_code, 403
+        )  # noqa
+        self.assertTrue(GuestMerge.objects.filter(pk=merge.pk).exists())
+        changelist = reverse("admin:guests_guestmerge_changelist")
+        self.assertEqual(self.client.get(changelist).status_code, 200)
@@ -0,0 +1,179 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import Change
+from bookings.models import ArchivedBooking, Booking
+from guests.dedupe import GuestDeduplicator, last_checked_guest_id, score
+from guests.models import DedupeRun, Guest, GuestMerge
+from rooms.models import Property, Room, Unit
+
+
+class GuestDedupeTest(TestCase):
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=Decimal("20.00"),
+        )
+        self.unit = Unit.objects.create(name="1", room=self.room)
+        self.original = self.guest(
+            "Juan Pérez",
+            document_number="12.345.678",
+            phone_number="+54 11 4555-1234",
+        )
+
+    def guest(self, name, **kwargs):
+        kwargs.setdefault("document_type", "DNI")
+        kwargs.setdefault("document_number", "00000000")
+        kwargs.setdefault("phone_number", "0")
+        kwargs.setdefault("nationality", "Argentina")
+        return Guest.objects.create(name=name, **kwargs)
+
+    def book(self, guest, days):
+        check_in = date.today() + timedelta(days=days)
+        return Booking.objects.create(
+            guest=guest,
+            unit=self.unit,
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=1),
+            total_price=Decimal("20.00"),
+        )
+
+    def dedupe(self, **kwargs):
+        deduplicator = GuestDeduplicator(**kwargs)
+        with self.captureOnCommitCallbacks(execute=True):
+            list(deduplicator.run())
+        return deduplicator
+
+    def test_score(self):
+        fields = {
+            "document_type": "DNI",
+            "document_normalized": "12345678",
+            "email_normalized": "",
+            "phone_normalized": "",
+            "birth_date": None,
+        }
+        same = score(
+            {**fields, "name": "Juan Pérez"}, {**fields, "name": "juan  perez"}
+        )
+        family = score(
+            {**fields, "name": "Juan Pérez", "birth_date": date(1980, 1, 1)},
+            {**fields, "name": "Juan Pérez", "birth_date": date(2010, 1, 1)},
+        )
+        self.assertEqual(same, 0.9)
+        self.assertLess(family, 0.8)
+
+    def test_merges_duplicates_and_repoints_bookings(self):
+        first = self.book(self.original, 1)
+        duplicate = self.guest(
+            "Juan Perez",
+            document_number="12345678",
+            email="juan@example.com",
+        )
+        second = self.book(duplicate, 5)
+
+        deduplicator = self.dedupe()
+
+        self.assertEqual(deduplicator.stats["merged"], 1)
+        self.assertFalse(Guest.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(
+            set(self.original.bookings.values_list("pk", flat=True)),
+            {first.pk, second.pk},
+        )
+        self.original.refresh_from_db()
+        self.assertEqual(self.original.email, "juan@example.com")
+
+        merge = GuestMerge.objects.get()
+        self.assertEqual(merge.survivor, self.original)
+        self.assertEqual(merge.merged_guest_id, duplicate.pk)
+        self.assertEqual(merge.bookings, 1)
+        # La reserva reasignada se publica en el feed de cambios
+        self.assertTrue(
+            Change.objects.filter(model="booking", object_id=second.pk).exists()  # noqa
+        )
+
+    def test_repoints_archived_bookings(self):
+        duplicate = self.guest("Juan Perez", document_number="12345678")
+        now = timezone.now()
+        archived = ArchivedBooking.objects.create(
+            id=1000,
+            guest=duplicate,
+            unit=self.unit,
+            check_in_date=date.today() - timedelta(days=900),
+            check_out_date=date.today() - timedelta(days=899),
+            status="CHECKED_OUT",
+            total_price=Decimal("20.00"),
+            created_at=now,
+            updated_at=now,
+        )
+
+        deduplicator = self.dedupe()
+
+        archived.refresh_from_db()
+        self.assertEqual(archived.guest, self.original)
+        self.assertEqual(archived.updated_at, now)
+        self.assertEqual(deduplicator.stats["bookings"], 1)
+        self.assertEqual(GuestMerge.objects.get().bookings, 1)
+
+    def test_matches_by_email_and_phone(self):
+        self.guest(
+            "Juan Perez",
+            document_type="PASSPORT",
+            document_number="AA000001",
+            phone_number="+54 (11) 4555 1234",
+            email="JUAN@example.com",
+        )
+        self.original.email = "juan@example.com"
+        self.original.save()
+
+        self.dedupe()
+
+        self.assertEqual(Guest.objects.count(), 1)
+
+    def test_keeps_different_people(self):
+        # Comparten teléfono, pero son personas distintas
+        self.guest(
+            "María Gómez",
+            document_number="30111222",
+            phone_number="+54 11 4555-1234",
+        )
+        self.dedupe()
+        self.assertEqual(Guest.objects.count(), 2)
+        self.assertFalse(GuestMerge.objects.exists())
+
+    def test_incremental(self):
+        self.dedupe()
+        self.assertEqual(last_checked_guest_id(), self.original.pk)
+
+        newer = self.guest("Ana Ruiz", document_number="40111222")
+        deduplicator = self.dedupe()
+        self.assertEqual(deduplicator.stats["checked"], 1)
+        self.assertEqual(last_checked_guest_id(), newer.pk)
+        self.assertIsNotNone(DedupeRun.objects.last().finished_at)
+
+    def test_transfers_reservation_owner(self):
+        user = User.objects.create_user(username="juan", password="x")
+        self.guest(
+            "Juan Pérez",
+            document_number="12345678",
+            reservation_owner=user,
+        )
+        self.dedupe()
+        self.original.refresh_from_db()
+        self.assertEqual(self.original.reservation_owner, user)
+
+    def test_dry_run(self):
+        self.guest("Juan Perez", document_number="12345678")
+        deduplicator = self.dedupe(dry_run=True)
+        self.assertEqual(len(deduplicator.matches), 1)
+        self.assertEqual(Guest.objects.count(), 2)
+        self.assertFalse(DedupeRun.objects.exists())
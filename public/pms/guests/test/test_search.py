@@ -0,0 +1,121 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from guests.models import Guest
+from guests.search import search_guests
+
+
+class GuestSearchTest(TestCase):
+    def setUp(self):
+        self.john = Guest.objects.create(
+            name="John Doe",
+            document_type="DNI",
+            document_number="12345678",
+            phone_number="+54 (11) 4555-1234",
+            nationality="Argentinian",
+            email=" John.Doe@Example.com ",
+        )
+        self.jane = Guest.objects.create(
+            name="Jane Smith",
+            document_type="PASSPORT",
+            document_number="AB123456",
+            phone_number="+1 202 555 0199",
+            nationality="American",
+        )
+
+    def test_normalized_columns(self):
+        self.assertEqual(self.john.phone_normalized, "541145551234")
+        self.assertEqual(self.john.email_normalized, "john.doe@example.com")
+        self.assertEqual(self.jane.email_normalized, "")
+
+        self.jane.email = "JANE@example.com"
+        self.jane.save(update_fields=["email"])
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.email_normalized, "jane@example.com")
+
+    def test_document_number(self):
+        self.assertEqual(list(search_guests("12.345.678")), [self.john])
+        self.assertEqual(list(search_guests("ab123456")), [self.jane])
+
+    def test_document_stored_with_dots(self):
+        dotted = Guest.objects.create(
+            name="Ana Pérez",
+            document_type="DNI",
+            document_number="23.456.789",
+            nationality="Argentinian",
+        )
+        self.assertEqual(list(search_guests("23456789")), [dotted])
+        self.assertEqual(list(search_guests("23.456.789")), [dotted])
+
+    def test_name_tolerates_typos(self):
+        self.assertEqual(list(search_guests("jhon doe")), [self.john])
+        self.assertEqual(list(search_guests("jane smiht")), [self.jane])
+        self.assertEqual(list(search_guests("smith")), [self.jane])
+
+    def test_phone_and_email(self):
+        self.assertEqual(list(search_guests("4555-1234")), [self.john])
+        self.assertEqual(list(search_guests("JOHN.DOE@")), [self.john])
+
+    def test_ranked_by_relevance(self):
+        namesake = Guest.objects.create(
+            name="Jane Doe",
+            document_type="DNI",
+            document_number="99999999",
+            phone_number="0",
+            nationality="Argentinian",
+        )
+        results = list(search_guests("jane doe"))
+        self.assertEqual(results[0], namesake)
+        self.assertIn(self.jane, results)
+        self.assertGreater(results[0].search_rank, results[1].search_rank)
+
+    def test_empty_query(self):
+        self.assertEqual(list(search_guests("  ")), [])
+
+    def test_uses_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        plan = search_guests("john").explain()
+        self.assertIn("guest_name_trgm_idx", plan)
+        self.assertIn("guest_document_idx", plan)
+        self.assertIn("guest_document_norm_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+
+class GuestAdminSearchTest(TestCase):
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", password="x")
+        )
+        Guest.objects.create(
+            name="John Doe",
+            document_type="DNI",
+            document_number="12345678",
+            phone_number="1145551234",
+            nationality="Argentinian",
+        )
+        Guest.objects.create(
+            name="Johnny Doerr",
+            document_type="DNI",
+            document_number="87654321",
+            phone_number="0",
+            nationality="Argentinian",
+        )
+
+    def test_changelist_search(self):
+        response = self.client.get(
+            reverse("admin:guests_guest_changelist"), {"q": "john doe"}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = list(response.context["cl"].result_list)
+        self.assertEqual([guest.name for guest in results][0], "John Doe")
+
+        response = self.client.get(
+            reverse("admin:guests_guest_changelist"), {"q": "87654321"}
+        )
+        self.assertEqual(
+            [guest.name for guest in response.context["cl"].result_list],
+            ["Johnny Doerr"],
+        )
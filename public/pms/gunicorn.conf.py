@@ -0,0 +1,67 @@
+"""
+Configuración de gunicorn para producción.
+
+Modo WSGI (por defecto), con workers gthread:
+
+    gunicorn -c gunicorn.conf.py
+
+Modo ASGI, con workers de uvicorn para las vistas async:
+
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+
+Cada hilo (WSGI) o worker (ASGI) abre su propia conexión a PostgreSQL:
+workers x threads debe quedar por debajo de max_connections (o del pool
+de pgbouncer, ver pms/settings_pgbouncer.py). Con DB_POOL=1 cada worker
+mantiene como máximo DB_POOL_MAX_SIZE conexiones.
+"""
+
+import multiprocessing
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pms.settings_production")
+
+mode = os.environ.get("SERVER_MODE", "wsgi")
+cpus = multiprocessing.cpu_count()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+if mode == "asgi":
+    wsgi_app = "pms.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    # Un event loop por núcleo; el ORM sincrónico corre en hilos aparte
+    workers = int(os.environ.get("WEB_WORKERS", cpus + 1))
+else:
+    wsgi_app = "pms.wsgi:application"
+    worker_class = "gthread"
+    workers = int(os.environ.get("WEB_WORKERS", cpus * 2 + 1))
+    threads = int(os.environ.get("WEB_THREADS", 4))
+
+# Django se carga una sola vez en el master y los workers arrancan con
+# fork, compartiendo la memoria de los módulos ya importados
+preload_app = True
+
+# Reciclar workers acota el crecimiento de memoria; el jitter evita que
+# todos se reinicien a la vez
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.environ.get("WEB_TIMEOUT", 30))
+graceful_timeout = timeout
+# Conexiones keep-alive con nginx
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Con preload_app las conexiones que haya abierto el master se
+    # heredarían en cada worker: se cierran antes del fork. Lo mismo con
+    # el pool de psycopg 3 (DB_POOL), cuyos hilos no sobreviven al fork;
+    # cada worker abre el suyo con la primera consulta
+    from django.db import connections
+
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        if getattr(connection, "pool", None):
+            connection.close_pool()
@@ -1,7 +1,16 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-from .models import CashRegisterEntry, Payment
+from bookings.admin import ReadOnlyAdminMixin
+
+from .models import (
+    ArchivedCashRegisterEntry,
+    ArchivedPayment,
+    CashRegisterEntry,
+    Payment,
+)
+from .services import bulk_mark_as_completed, bulk_refund
 
 
 @admin.register(Payment)
@@ -19,6 +28,7 @@ class PaymentAdmin(admin.ModelAdmin):
         "transaction_id",
         "created_by",
     )
+    list_select_related = ("booking__guest", "created_by")
     list_filter = ("payment_method", "status", "payment_date", "payment_type")
     search_fields = ("booking__guest__name", "transaction_id", "notes")
     readonly_fields = ("payment_date", "created_by")
@@ -51,11 +61,11 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def mark_as_completed(self, request, queryset):
         """Acción para marcar múltiples pagos como completados."""
-        updated_count = 0
-        for payment in queryset:
-            if payment.status != "COMPLETED":
-                payment.mark_as_completed()
-                updated_count += 1
+        try:
+            updated_count = bulk_mark_as_completed(queryset, user=request.user)
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)  # noqa
+            return
 
         if updated_count == 1:
             message = _("1 pago ha sido marcado como completado.")
@@ -72,11 +82,11 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def mark_as_refunded(self, request, queryset):
         """Acción para marcar múltiples pagos como reembolsados."""
-        updated_count = 0
-        for payment in queryset:
-            if payment.status == "COMPLETED":
-                payment.refund()
-                updated_count += 1
+        try:
+            updated_count = len(bulk_refund(queryset, user=request.user))
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)  # noqa
+            return
 
         if updated_count == 1:
             message = _("1 pago ha sido marcado como reembolsado.")
@@ -91,17 +101,6 @@ class PaymentAdmin(admin.ModelAdmin):
         "Marcar pagos seleccionados como reembolsados"
     )
 
-    def get_queryset(self, request):
-        """Optimiza las consultas para reducir el número
-        de consultas a la base de datos."""  # noqa
-        return (
-            super()
-            .get_queryset(request)
-            .select_related(
-                "booking", "booking__guest", "created_by"
-            )  # Incluir created_by en select_related
-        )
-
     def save_model(self, request, obj, form, change):
         """
         Asigna automáticamente el usuario actual
@@ -120,13 +119,15 @@ class CashRegisterEntryAdmin(admin.ModelAdmin):
         "id",
         "entry_type_display",
         "amount",
+        "balance",
         "description",
         "created_at",
         "payment_info",
     )
+    list_select_related = ("payment__booking__guest",)
     list_filter = ("entry_type", "created_at")
     search_fields = ("description", "payment__booking__guest__name")
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = ("balance", "created_at", "updated_at")
     date_hierarchy = "created_at"
     actions = ["mark_as_deposit", "mark_as_withdrawal"]
 
@@ -134,7 +135,7 @@ class CashRegisterEntryAdmin(admin.ModelAdmin):
         (None, {"fields": ("payment", "entry_type", "amount")}),
         (
             _("Información adicional"),
-            {"fields": ("description", "created_at", "updated_at")},
+            {"fields": ("description", "balance", "created_at", "updated_at")},
         ),
     )
 
@@ -154,7 +155,10 @@ class CashRegisterEntryAdmin(admin.ModelAdmin):
 
     def mark_as_deposit(self, request, queryset):
         """Acción para marcar múltiples movimientos como ingresos."""
+        since = queryset.order_by("pk").values_list("pk", flat=True).first()
         updated_count = queryset.update(entry_type="DEPOSIT")
+        # Cambiar el tipo de un movimiento altera el saldo de los posteriores
+        CashRegisterEntry.rebuild_balances(since=since)
 
         if updated_count == 1:
             message = _("1 movimiento ha sido marcado como ingreso.")
@@ -173,7 +177,10 @@ class CashRegisterEntryAdmin(admin.ModelAdmin):
 
     def mark_as_withdrawal(self, request, queryset):
         """Acción para marcar múltiples movimientos como retiros."""
+        since = queryset.order_by("pk").values_list("pk", flat=True).first()
         updated_count = queryset.update(entry_type="WITHDRAWAL")
+        # Cambiar el tipo de un movimiento altera el saldo de los posteriores
+        CashRegisterEntry.rebuild_balances(since=since)
 
         if updated_count == 1:
             message = _("1 movimiento ha sido marcado como retiro.")
@@ -190,13 +197,45 @@ class CashRegisterEntryAdmin(admin.ModelAdmin):
         "Marcar movimientos seleccionados como retiros"
     )
 
-    def get_queryset(self, request):
-        """Optimiza las consultas para reducir el número
-        de consultas a la base de datos."""  # noqa
-        return (
-            super()
-            .get_queryset(request)
-            .select_related(
-                "payment", "payment__booking", "payment__booking__guest"
-            )  # noqa
-        )
+    def delete_queryset(self, request, queryset):
+        """Elimina los movimientos y recalcula el saldo de la caja."""
+        since = queryset.order_by("pk").values_list("pk", flat=True).first()
+        super().delete_queryset(request, queryset)
+        CashRegisterEntry.rebuild_balances(since=since)
+
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin de consulta de los pagos archivados."""
+
+    list_display = (
+        "id",
+        "booking",
+        "amount",
+        "payment_date",
+        "payment_method",
+        "status",
+        "payment_type",
+    )
+    list_select_related = ("booking__guest", "booking__unit")
+    list_filter = ("status", "payment_method", "payment_type")
+    search_fields = ("=id", "=booking__id", "transaction_id", "notes")
+    date_hierarchy = "payment_date"
+
+
+@admin.register(ArchivedCashRegisterEntry)
+class ArchivedCashRegisterEntryAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin de consulta de los movimientos de caja archivados."""
+
+    list_display = (
+        "id",
+        "entry_type",
+        "amount",
+        "balance",
+        "description",
+        "created_at",
+        "payment",
+    )
+    list_filter = ("entry_type",)
+    search_fields = ("description",)
+    date_hierarchy = "created_at"
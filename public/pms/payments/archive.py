@@ -0,0 +1,256 @@
+"""
+Archivado de reservas cerradas y pagos saldados.
+
+Las reservas con salida (o canceladas) antes de una fecha, sin pagos
+pendientes y sin deuda, se mueven con sus pagos y sus movimientos de caja
+a las tablas ArchivedBooking, ArchivedPayment y ArchivedCashRegisterEntry,
+que conservan los ids originales y se consultan en modo solo lectura desde
+el admin y desde /api/v1/archive/bookings/.
+
+La caja se archiva siempre como un tramo inicial en orden de id: el saldo
+acumulado del último movimiento archivado pasa a ser el saldo de apertura
+de los que quedan (CashRegisterEntry.opening_balance), por lo que los
+saldos de la caja activa no se recalculan. Una reserva con un movimiento
+que no puede salir de la caja (reciente, o intercalado con movimientos de
+reservas que quedan) no se archiva.
+
+Las filas se borran con SQL directo, sin señales: el archivado no genera
+recálculos de indicadores ni bajas en el feed de cambios de la API.
+"""
+
+from collections import Counter
+from datetime import datetime, time
+
+from django.db import connection, transaction
+from django.db.models import Exists, Max, Min, OuterRef, Q
+from django.utils import timezone
+
+from bookings.models import ArchivedBooking, Booking, UnitNight
+
+from .models import (
+    ArchivedCashRegisterEntry,
+    ArchivedPayment,
+    CashRegisterBalance,
+    CashRegisterEntry,
+    Payment,
+)
+
+# Antigüedad mínima, en meses, de las reservas que se archivan
+ARCHIVE_AFTER_MONTHS = 24
+
+
+def closed_bookings(before):
+    """
+    Reservas que se pueden archivar: con salida o canceladas, con fecha de
+    salida anterior a `before`, sin pagos pendientes y, salvo las
+    canceladas, sin deuda.
+    """
+    pending = Payment.objects.filter(booking=OuterRef("pk"), status="PENDING")
+    return (
+        Booking.objects.filter(
+            status__in=["CHECKED_OUT", "CANCELLED"],
+            check_out_date__lt=before,
+        )
+        .exclude(Exists(pending))
+        .with_payment_summary()
+        .filter(Q(status="CANCELLED") | Q(pending_debt__lte=0))
+        .order_by()
+    )
+
+
+def _ledger_limit(before):
+    """
+    Reservas a archivar y límite del tramo de caja que se archiva con
+    ellas.
+
+    El límite es el primer movimiento (por id) que queda en la caja: uno
+    posterior a `before` o de un pago de una reserva que no se archiva. Las
+    reservas con movimientos desde el límite en adelante se descartan, lo
+    que puede adelantar el límite; se repite hasta que no cambia.
+
+    Returns:
+        tuple: QuerySet de reservas y id límite (None si se archiva toda
+            la caja)
+    """
+    start = timezone.make_aware(datetime.combine(before, time.min))
+    excluded = set()
+    while True:
+        bookings = closed_bookings(before).exclude(pk__in=excluded)
+        limit = (
+            CashRegisterEntry.objects.filter(
+                Q(created_at__gte=start)
+                | Q(payment__isnull=False)
+                & ~Q(payment__booking__in=bookings.values("pk"))
+            )
+            .order_by()
+            .aggregate(limit=Min("pk"))["limit"]
+        )
+        if limit is None:
+            return bookings, None
+        blocked = set(
+            CashRegisterEntry.objects.filter(
+                pk__gte=limit, payment__booking__in=bookings.values("pk")
+            ).values_list("payment__booking_id", flat=True)
+        )
+        if not blocked:
+            return bookings, limit
+        excluded |= blocked
+
+
+def _batches(bookings, limit, batch_size):
+    """
+    Divide el archivado en lotes de reservas y tramos de caja.
+
+    Recorre la caja hasta el límite y corta cuando ninguna reserva del lote
+    tiene movimientos pendientes más adelante, de modo que los movimientos
+    de una reserva salen en el mismo lote que ella. Las reservas sin
+    movimientos de caja van al final.
+
+    Yields:
+        tuple: IDs de reservas e id hasta el que se archiva la caja (None
+            si el lote no incluye movimientos)
+    """
+    entries = CashRegisterEntry.objects.order_by("pk")
+    if limit is not None:
+        entries = entries.filter(pk__lt=limit)
+    last_entry = dict(
+        entries.filter(payment__isnull=False)
+        .order_by()
+        .values("payment__booking_id")
+        .annotate(last=Max("pk"))
+        .values_list("payment__booking_id", "last")
+    )
+
+    batch, pending, count = [], set(), 0
+    rows = entries.values_list("pk", "payment__booking_id")
+    for pk, booking_id in rows.iterator(chunk_size=batch_size):
+        if booking_id is not None:
+            if booking_id not in pending:
+                pending.add(booking_id)
+                batch.append(booking_id)
+            if last_entry[booking_id] == pk:
+                pending.discard(booking_id)
+        count += 1
+        if not pending and count >= batch_size:
+            yield batch, pk + 1
+            batch, count = [], 0
+    if count:
+        yield batch, pk + 1
+
+    batch = []
+    for booking_id in (
+        bookings.exclude(pk__in=last_entry)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+        .iterator(chunk_size=batch_size)
+    ):
+        batch.append(booking_id)
+        if len(batch) >= batch_size:
+            yield batch, None
+            batch = []
+    if batch:
+        yield batch, None
+
+
+def _copy(target, queryset):
+    """Copia las filas de `queryset` a la tabla de archivo `target`."""
+    fields = [
+        field.attname
+        for field in target._meta.concrete_fields
+        if field.name != "archived_at"
+    ]
+    rows = [target(**row) for row in queryset.values(*fields)]
+    target.objects.bulk_create(rows)
+    return len(rows)
+
+
+def _delete(model, column, values):
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote(model._meta.db_table)} "
+            f"WHERE {quote(column)} = ANY(%s)",
+            [values],
+        )
+
+
+def _archive_batch(before, booking_ids, until):
+    """
+    Archiva un lote en su propia transacción, con la caja bloqueada.
+
+    Returns:
+        Counter: Filas archivadas, o None si desde la planificación el
+            lote cambió (una reserva dejó de cumplir las condiciones o
+            sumó movimientos de caja) y no se archivó
+    """
+    with transaction.atomic():
+        CashRegisterBalance.lock()
+        later = CashRegisterEntry.objects.filter(
+            payment__booking_id__in=booking_ids
+        )  # noqa
+        if until is not None:
+            later = later.filter(pk__gte=until)
+        bookings = closed_bookings(before).filter(pk__in=booking_ids)
+        if later.exists() or bookings.count() != len(booking_ids):
+            return None
+
+        payments = Payment.objects.filter(booking_id__in=booking_ids)
+        entries = CashRegisterEntry.objects.none()
+        if until is not None:
+            entries = CashRegisterEntry.objects.filter(pk__lt=until)
+        entry_ids = list(entries.values_list("pk", flat=True))
+
+        archived = Counter(
+            bookings=_copy(
+                ArchivedBooking, Booking.objects.filter(pk__in=booking_ids)
+            ),  # noqa
+            payments=_copy(ArchivedPayment, payments),
+            cash_entries=_copy(
+                ArchivedCashRegisterEntry,
+                CashRegisterEntry.objects.filter(pk__in=entry_ids),
+            ),
+        )
+        _delete(CashRegisterEntry, "id", entry_ids)
+        _delete(UnitNight, "booking_id", booking_ids)
+        _delete(Payment, "booking_id", booking_ids)
+        _delete(Booking, "id", booking_ids)
+    return archived
+
+
+def archive_closed(before, batch_size=1000, dry_run=False):
+    """
+    Archiva las reservas cerradas con salida anterior a `before`, sus
+    pagos y el tramo inicial de la caja que les corresponde.
+
+    Args:
+        before (date): Fecha de corte
+        batch_size (int): Movimientos de caja (o reservas, para las que no
+            tienen movimientos) por lote; cada lote es una transacción
+        dry_run (bool): Solo cuenta lo que se archivaría
+
+    Returns:
+        Counter: Reservas, pagos y movimientos de caja archivados; con
+            `interrupted` si un lote cambió durante el archivado y hay que
+            volver a ejecutarlo
+    """
+    bookings, limit = _ledger_limit(before)
+    if dry_run:
+        entries = CashRegisterEntry.objects.all()
+        if limit is not None:
+            entries = entries.filter(pk__lt=limit)
+        return Counter(
+            bookings=bookings.count(),
+            payments=Payment.objects.filter(
+                booking__in=bookings.values("pk")
+            ).count(),  # noqa
+            cash_entries=entries.count(),
+        )
+
+    archived = Counter()
+    for booking_ids, until in _batches(bookings, limit, batch_size):
+        batch = _archive_batch(before, booking_ids, until)
+        if batch is None:
+            archived["interrupted"] = 1
+            break
+        archived.update(batch)
+    return archived
@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from payments.archive import ARCHIVE_AFTER_MONTHS, archive_closed
+from pms.partitioning import add_months
+
+
+class Command(BaseCommand):
+    help = (
+        "Archiva las reservas cerradas (con salida o canceladas) y saldadas "
+        "con salida anterior a --months meses, junto con sus pagos y el "
+        "tramo inicial de la caja que les corresponde."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=ARCHIVE_AFTER_MONTHS,
+            help="Meses de antigüedad de las reservas a archivar",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Movimientos de caja (o reservas) por transacción",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa lo que se archivaría",
+        )
+
+    def handle(self, *args, **options):
+        before = add_months(date.today(), -options["months"])
+        dry_run = options["dry_run"]
+        archived = archive_closed(before, options["batch_size"], dry_run)
+
+        prefix = "Se archivarían" if dry_run else "Archivados"
+        self.stdout.write(
+            f"{prefix} (salida antes del {before:%d/%m/%Y}): "
+            f"{archived['bookings']} reservas, {archived['payments']} pagos, "
+            f"{archived['cash_entries']} movimientos de caja"
+        )
+        if archived["interrupted"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Un lote cambió durante el archivado y se detuvo: "
+                    "vuelva a ejecutar el comando."
+                )
+            )
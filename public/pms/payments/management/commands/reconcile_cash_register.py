@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Case, F, Q, Sum, Value, When, Window
+
+from payments.models import CashRegisterEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifica el saldo acumulado de la caja contra la suma completa "
+        "de los movimientos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recalcula los saldos si se encuentran diferencias",
+        )
+
+    def handle(self, *args, **options):
+        aggregate = CashRegisterEntry.get_aggregate_balance()
+        current = CashRegisterEntry.get_current_balance()
+
+        # Saldo esperado de cada movimiento con una suma acumulada desde el
+        # saldo de apertura (movimientos archivados)
+        opening = CashRegisterEntry.opening_balance()
+        expected = Value(opening) + Window(
+            Sum(
+                Case(
+                    When(entry_type="DEPOSIT", then=F("amount")),
+                    default=-F("amount"),
+                )
+            ),
+            order_by=F("pk").asc(),
+        )
+        mismatches = (
+            CashRegisterEntry.objects.annotate(expected=expected)
+            .filter(~Q(balance=F("expected")))
+            .count()
+        )
+
+        self.stdout.write(f"Saldo acumulado: ${current}")
+        self.stdout.write(f"Saldo por agregación: ${aggregate}")
+        self.stdout.write(f"Movimientos con saldo incorrecto: {mismatches}")
+
+        if current == aggregate and not mismatches:
+            self.stdout.write(self.style.SUCCESS("La caja está conciliada."))
+            return
+
+        if not options["fix"]:
+            raise CommandError(
+                "La caja no está conciliada. Ejecute con --fix para "
+                "recalcular los saldos."
+            )
+
+        balance = CashRegisterEntry.rebuild_balances()
+        self.stdout.write(
+            self.style.SUCCESS(f"Saldos recalculados. Saldo actual: ${balance}")  # noqa
+        )
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:05
+
+from django.db import migrations, models
+
+
+def compute_balances(apps, schema_editor):
+    """Calcula el saldo acumulado de los movimientos existentes."""
+    CashRegisterEntry = apps.get_model("payments", "CashRegisterEntry")
+    CashRegisterBalance = apps.get_model("payments", "CashRegisterBalance")
+
+    balance = 0
+    entries = []
+    for entry in CashRegisterEntry.objects.order_by("pk").iterator():
+        if entry.entry_type == "DEPOSIT":
+            balance += entry.amount
+        else:
+            balance -= entry.amount
+        entry.balance = balance
+        entries.append(entry)
+    CashRegisterEntry.objects.bulk_update(entries, ["balance"], batch_size=1000)
+    CashRegisterBalance.objects.create(pk=1, balance=balance)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0007_alter_payment_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CashRegisterBalance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=2, default=0, max_digits=12, verbose_name="Saldo"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Saldo de caja",
+                "verbose_name_plural": "Saldos de caja",
+            },
+        ),
+        migrations.AddField(
+            model_name="cashregisterentry",
+            name="balance",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=0,
+                editable=False,
+                max_digits=12,
+                verbose_name="Saldo",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cashregisterentry",
+            index=models.Index(
+                fields=["created_at"], name="payments_ca_created_070573_idx"
+            ),
+        ),
+        migrations.RunPython(compute_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations
+
+from pms import partitioning
+
+
+def partition_payments(apps, schema_editor):
+    # Opcional: sin DB_PARTITIONING la tabla queda como está (ver
+    # pms/partitioning.py y el comando partitions)
+    if settings.DB_PARTITIONING:
+        partitioning.partition_table(
+            schema_editor,
+            apps.get_model("payments", "Payment"),
+            settings.DB_PARTITIONING,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_partition_booking"),
+        ("payments", "0008_cashregisterentry_balance"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_payments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,171 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_archivedbooking"),
+        ("payments", "0009_partition_payment"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedPayment",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Monto"
+                    ),
+                ),
+                ("payment_date", models.DateTimeField(verbose_name="Fecha de pago")),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[
+                            ("CASH", "Efectivo"),
+                            ("CREDIT_CARD", "Tarjeta de crédito"),
+                            ("DEBIT_CARD", "Tarjeta de débito"),
+                            ("BANK_TRANSFER", "Transferencia bancaria"),
+                            ("QR", "QR"),
+                            ("OTHER", "Otro"),
+                        ],
+                        max_length=20,
+                        verbose_name="Método de pago",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Pendiente"),
+                            ("COMPLETED", "Completado"),
+                            ("FAILED", "Fallido"),
+                        ],
+                        max_length=20,
+                        verbose_name="Estado",
+                    ),
+                ),
+                (
+                    "payment_type",
+                    models.CharField(
+                        choices=[("PAYMENT", "Pago"), ("REFUND", "Reembolso")],
+                        max_length=20,
+                        verbose_name="Tipo de operación",
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.CharField(
+                        blank=True,
+                        max_length=100,
+                        null=True,
+                        verbose_name="ID de transacción",
+                    ),
+                ),
+                (
+                    "notes",
+                    models.TextField(blank=True, null=True, verbose_name="Notas"),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha de archivado"
+                    ),
+                ),
+                (
+                    "booking",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payments",
+                        to="bookings.archivedbooking",
+                        verbose_name="Reserva",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Creado por",
+                    ),
+                ),
+                (
+                    "original_payment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="refunds",
+                        to="payments.archivedpayment",
+                        verbose_name="Pago original",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Pago archivado",
+                "verbose_name_plural": "Pagos archivados",
+                "ordering": ["-payment_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedCashRegisterEntry",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "entry_type",
+                    models.CharField(
+                        choices=[("DEPOSIT", "Ingreso"), ("WITHDRAWAL", "Retiro")],
+                        max_length=20,
+                        verbose_name="Tipo de movimiento",
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Monto"
+                    ),
+                ),
+                ("description", models.TextField(verbose_name="Descripción")),
+                (
+                    "balance",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=12, verbose_name="Saldo"
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Fecha de archivado"
+                    ),
+                ),
+                (
+                    "payment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="cash_entries",
+                        to="payments.archivedpayment",
+                        verbose_name="Pago relacionado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Movimiento de caja archivado",
+                "verbose_name_plural": "Movimientos de caja archivados",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -1,11 +1,11 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 
-from bookings.models import Booking
+from bookings.models import ArchivedBooking, Booking
 
 
 class Payment(models.Model):
@@ -103,7 +103,7 @@ class Payment(models.Model):
         operation_type = (
             "Reembolso" if self.payment_type == "REFUND" else "Pago"
         )  # noqa
-        return f"{operation_type} {self.id} - Reserva {self.booking.id} - $ {abs(self.amount)}"  # noqa
+        return f"{operation_type} {self.id} - Reserva {self.booking_id} - $ {abs(self.amount)}"  # noqa
 
     def refund(
         self, amount=None, user=None, payment_method=None, transaction_id=None
@@ -180,13 +180,17 @@ class Payment(models.Model):
                 )
 
             # Obtenemos el total de pagos completados (restando los reembolsos)
-            payments = self.booking.payments.filter(status="COMPLETED")
-            total_paid = 0
-
-            if payments.exists():
-                for p in payments:
-                    # Sumamos pagos y restamos reembolsos
-                    total_paid += p.amount
+            booking = self.booking
+            if hasattr(booking, "total_paid"):
+                # Reutilizamos la anotación de with_payment_summary()
+                total_paid = booking.total_paid - booking.total_refunded
+            else:
+                total_paid = (
+                    booking.payments.filter(status="COMPLETED").aggregate(
+                        total=Sum("amount")
+                    )["total"]
+                    or 0
+                )
 
             # Calculamos la deuda pendiente
             pending_debt = float(self.booking.total_price) - float(total_paid)
@@ -244,30 +248,37 @@ class Payment(models.Model):
         super().save(*args, **kwargs)
 
         # Si el pago está completado, registrarlo en caja si es en efectivo
-        if self.status == "COMPLETED" and self.payment_method == "CASH":
-            # Determinamos el tipo de entrada
-            # en la caja según el tipo de operación
-            if self.payment_type == "PAYMENT":
-                entry_type = "DEPOSIT"
-                description = f"Pago en efectivo de reserva #{self.booking.id}"
-            elif self.payment_type == "REFUND":
-                entry_type = "WITHDRAWAL"
-                description = (
-                    f"Reembolso en efectivo de reserva #{self.booking.id}"  # noqa
-                )
-                if self.original_payment:
-                    description += (
-                        f" (pago original #{self.original_payment.id})"  # noqa
-                    )
-
+        entry = self.build_cash_entry()
+        if entry is not None:
             # Verificar si ya existe una entrada en la caja para este pago
             if not CashRegisterEntry.objects.filter(payment=self).exists():
-                CashRegisterEntry.objects.create(
-                    payment=self,
-                    entry_type=entry_type,
-                    amount=abs(self.amount),
-                    description=description,
-                )
+                entry.save()
+
+    def build_cash_entry(self):
+        """
+        Arma (sin guardar) el movimiento de caja de un pago en efectivo
+        completado, o devuelve None si el pago no pasa por la caja.
+        """
+        if self.status != "COMPLETED" or self.payment_method != "CASH":
+            return None
+
+        # Determinamos el tipo de entrada
+        # en la caja según el tipo de operación
+        if self.payment_type == "PAYMENT":
+            entry_type = "DEPOSIT"
+            description = f"Pago en efectivo de reserva #{self.booking_id}"
+        else:
+            entry_type = "WITHDRAWAL"
+            description = f"Reembolso en efectivo de reserva #{self.booking_id}"  # noqa
+            if self.original_payment_id:
+                description += f" (pago original #{self.original_payment_id})"  # noqa
+
+        return CashRegisterEntry(
+            payment=self,
+            entry_type=entry_type,
+            amount=abs(self.amount),
+            description=description,
+        )
 
 
 class CashRegisterEntry(models.Model):
@@ -299,6 +310,15 @@ class CashRegisterEntry(models.Model):
     )
     description = models.TextField(verbose_name=_("Descripción"))
 
+    # Saldo acumulado de la caja después de este movimiento
+    balance = models.DecimalField(
+        verbose_name=_("Saldo"),
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        editable=False,
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     updated_at = models.DateTimeField(auto_now=True)
@@ -307,6 +327,9 @@ class CashRegisterEntry(models.Model):
         verbose_name = _("Movimiento de caja")
         verbose_name_plural = _("Movimientos de caja")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         entry_type_display = (
@@ -314,6 +337,11 @@ class CashRegisterEntry(models.Model):
         )  # noqa
         return f"{entry_type_display} de ${self.amount} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"  # noqa
 
+    @property
+    def signed_amount(self):
+        """Monto con signo: positivo para ingresos, negativo para retiros."""
+        return self.amount if self.entry_type == "DEPOSIT" else -self.amount
+
     def clean(self):
         """Valida que haya suficiente saldo para retiros."""
         if self.entry_type == "WITHDRAWAL" and not self.pk:
@@ -328,13 +356,74 @@ class CashRegisterEntry(models.Model):
         super().clean()
 
     def save(self, *args, **kwargs):
-        """Asegura que se ejecute la validación antes de guardar."""
-        self.full_clean()
-        super().save(*args, **kwargs)
+        """
+        Asegura que se ejecute la validación antes de guardar y mantiene
+        el saldo acumulado bajo el bloqueo de la fila de saldo de la caja.
+        """
+        with transaction.atomic():
+            register = CashRegisterBalance.lock()
+            self.full_clean()
+
+            if self._state.adding:
+                self.balance = register.balance + self.signed_amount
+                super().save(*args, **kwargs)
+                register.balance = self.balance
+                register.save()
+            else:
+                # Editar un movimiento cambia el saldo de los posteriores
+                super().save(*args, **kwargs)
+                CashRegisterEntry.rebuild_balances(since=self.pk)
+
+    def delete(self, *args, **kwargs):
+        """Elimina el movimiento y recalcula el saldo de los posteriores."""
+        with transaction.atomic():
+            CashRegisterBalance.lock()
+            since = self.pk
+            result = super().delete(*args, **kwargs)
+            CashRegisterEntry.rebuild_balances(since=since)
+        return result
 
     @staticmethod
     def get_current_balance():
-        """Calcula el saldo actual de la caja."""
+        """Devuelve el saldo actual de la caja (una lectura por clave)."""
+        balance = CashRegisterBalance.objects.values_list(
+            "balance", flat=True
+        ).first()  # noqa
+        return balance or 0
+
+    @staticmethod
+    def get_balance_at(moment):
+        """Devuelve el saldo de la caja en un momento dado."""
+        for model in (CashRegisterEntry, ArchivedCashRegisterEntry):
+            balance = (
+                model.objects.filter(created_at__lte=moment)
+                .order_by("-created_at", "-pk")
+                .values_list("balance", flat=True)
+                .first()
+            )
+            if balance is not None:
+                return balance
+        return 0
+
+    @staticmethod
+    def opening_balance():
+        """
+        Saldo de apertura: el saldo acumulado del último movimiento
+        archivado (ver payments.archive), o 0 si no hay archivados.
+        """
+        balance = (
+            ArchivedCashRegisterEntry.objects.order_by("-pk")
+            .values_list("balance", flat=True)
+            .first()
+        )
+        return balance or 0
+
+    @staticmethod
+    def get_aggregate_balance():
+        """
+        Calcula el saldo sumando todos los movimientos de la caja al saldo
+        de apertura.
+        """
         deposits = (
             CashRegisterEntry.objects.filter(entry_type="DEPOSIT").aggregate(
                 total=Sum("amount")
@@ -349,4 +438,256 @@ class CashRegisterEntry(models.Model):
             or 0
         )
 
-        return deposits - withdrawals
+        return CashRegisterEntry.opening_balance() + deposits - withdrawals
+
+    @staticmethod
+    def bulk_register(entries):
+        """
+        Registra varios movimientos nuevos con un único bulk_create.
+
+        Aplica las mismas reglas que save(): bloquea la fila de saldo de la
+        caja, calcula el saldo acumulado de cada movimiento en orden y
+        rechaza los retiros que superan el saldo disponible en ese momento.
+
+        Returns:
+            list: Los movimientos creados
+        """
+        entries = list(entries)
+        if not entries:
+            return entries
+
+        with transaction.atomic():
+            register = CashRegisterBalance.lock()
+            balance = register.balance
+            for entry in entries:
+                # El pago relacionado ya existe: se evita validarlo por fila
+                entry.clean_fields(exclude=["payment"])
+                if entry.entry_type == "WITHDRAWAL" and entry.amount > balance:
+                    raise ValidationError(
+                        _(
+                            f"No hay suficiente saldo en caja. Saldo actual: ${balance}"  # noqa
+                        )
+                    )
+                balance += entry.signed_amount
+                entry.balance = balance
+
+            CashRegisterEntry.objects.bulk_create(entries)
+            register.balance = balance
+            register.save()
+        return entries
+
+    @staticmethod
+    def rebuild_balances(since=None, batch_size=1000):
+        """
+        Recalcula el saldo acumulado de los movimientos.
+
+        Args:
+            since (int, optional): Recalcula desde este movimiento (por id)
+                en adelante; si no se indica, recalcula toda la caja.
+            batch_size (int): Tamaño de los lotes de actualización
+
+        Returns:
+            Decimal: El saldo final de la caja
+        """
+        with transaction.atomic():
+            register = CashRegisterBalance.lock()
+            entries = CashRegisterEntry.objects.order_by("pk")
+
+            balance = None
+            if since is not None:
+                balance = (
+                    entries.filter(pk__lt=since)
+                    .order_by("-pk")
+                    .values_list("balance", flat=True)
+                    .first()
+                )
+                entries = entries.filter(pk__gte=since)
+            if balance is None:
+                balance = CashRegisterEntry.opening_balance()
+
+            changed = []
+            for entry in entries.only(
+                "entry_type", "amount", "balance"
+            ).iterator(  # noqa
+                chunk_size=batch_size
+            ):
+                balance += entry.signed_amount
+                if entry.balance != balance:
+                    entry.balance = balance
+                    changed.append(entry)
+                if len(changed) >= batch_size:
+                    CashRegisterEntry.objects.bulk_update(changed, ["balance"])
+                    changed = []
+            CashRegisterEntry.objects.bulk_update(changed, ["balance"])
+
+            register.balance = balance
+            register.save()
+        return balance
+
+
+class CashRegisterBalance(models.Model):
+    """
+    Saldo actual de la caja en una única fila.
+
+    Todos los movimientos bloquean esta fila (SELECT ... FOR UPDATE) antes
+    de calcular su saldo acumulado, de modo que los movimientos
+    concurrentes se serializan y el saldo actual se lee sin agregaciones.
+    """
+
+    balance = models.DecimalField(
+        verbose_name=_("Saldo"),
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Saldo de caja")
+        verbose_name_plural = _("Saldos de caja")
+
+    def __str__(self):
+        return f"Saldo de caja ${self.balance}"
+
+    @classmethod
+    def lock(cls):
+        """Obtiene la fila de saldo bloqueada hasta el fin de la transacción."""  # noqa
+        return cls.objects.select_for_update().get_or_create(pk=1)[0]
+
+
+class ArchivedPayment(models.Model):
+    """
+    Pago de una reserva archivada (ver payments.archive). Conserva el id
+    del pago original y es de solo lectura.
+    """
+
+    # El mismo id del pago original
+    id = models.BigIntegerField(primary_key=True)
+
+    booking = models.ForeignKey(
+        ArchivedBooking,
+        on_delete=models.CASCADE,
+        related_name="payments",
+        verbose_name=_("Reserva"),
+    )
+    amount = models.DecimalField(
+        verbose_name=_("Monto"),
+        max_digits=10,
+        decimal_places=2,
+    )
+    payment_date = models.DateTimeField(_("Fecha de pago"))
+    payment_method = models.CharField(
+        verbose_name=_("Método de pago"),
+        max_length=20,
+        choices=Payment.PAYMENT_METHOD_CHOICES,
+    )
+    status = models.CharField(
+        verbose_name=_("Estado"),
+        max_length=20,
+        choices=Payment.PAYMENT_STATUS_CHOICES,
+    )
+    payment_type = models.CharField(
+        verbose_name=_("Tipo de operación"),
+        max_length=20,
+        choices=Payment.PAYMENT_TYPE_CHOICES,
+    )
+    # Los reembolsos son de la misma reserva: se archivan con su pago
+    original_payment = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        related_name="refunds",
+        verbose_name=_("Pago original"),
+        null=True,
+        blank=True,
+    )
+    transaction_id = models.CharField(
+        verbose_name=_("ID de transacción"),
+        max_length=100,
+        blank=True,
+        null=True,
+    )
+    notes = models.TextField(_("Notas"), blank=True, null=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Creado por"),
+        null=True,
+    )
+
+    created_at = models.DateTimeField()
+
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Fecha de archivado")
+    )
+
+    class Meta:
+        verbose_name = _("Pago archivado")
+        verbose_name_plural = _("Pagos archivados")
+        ordering = ["-payment_date"]
+
+    def __str__(self):
+        operation_type = (
+            "Reembolso" if self.payment_type == "REFUND" else "Pago"
+        )  # noqa
+        return f"{operation_type} {self.id} - Reserva {self.booking_id} - $ {abs(self.amount)}"  # noqa
+
+
+class ArchivedCashRegisterEntry(models.Model):
+    """
+    Movimiento de caja archivado (ver payments.archive).
+
+    Se archiva siempre un tramo inicial de la caja, en orden de id: el
+    saldo acumulado del último movimiento archivado es el saldo de
+    apertura de los que quedan (CashRegisterEntry.opening_balance).
+    """
+
+    # El mismo id del movimiento original
+    id = models.BigIntegerField(primary_key=True)
+
+    payment = models.ForeignKey(
+        ArchivedPayment,
+        on_delete=models.SET_NULL,
+        related_name="cash_entries",
+        verbose_name=_("Pago relacionado"),
+        null=True,
+        blank=True,
+    )
+    entry_type = models.CharField(
+        verbose_name=_("Tipo de movimiento"),
+        max_length=20,
+        choices=CashRegisterEntry.ENTRY_TYPE_CHOICES,
+    )
+    amount = models.DecimalField(
+        verbose_name=_("Monto"),
+        max_digits=10,
+        decimal_places=2,
+    )
+    description = models.TextField(verbose_name=_("Descripción"))
+    balance = models.DecimalField(
+        verbose_name=_("Saldo"),
+        max_digits=12,
+        decimal_places=2,
+    )
+
+    created_at = models.DateTimeField()
+
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(
+        auto_now_add=True, verbose_name=_("Fecha de archivado")
+    )
+
+    class Meta:
+        verbose_name = _("Movimiento de caja archivado")
+        verbose_name_plural = _("Movimientos de caja archivados")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        entry_type_display = (
+            "Ingreso" if self.entry_type == "DEPOSIT" else "Retiro"
+        )  # noqa
+        return f"{entry_type_display} de ${self.amount} - {self.created_at.strftime('%d/%m/%Y %H:%M')}"  # noqa
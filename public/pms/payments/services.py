@@ -0,0 +1,157 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import TextField, Value
+from django.db.models.functions import Coalesce, Concat
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .models import CashRegisterEntry, Payment
+from .signals import payments_bulk_changed
+
+
+def bulk_mark_as_completed(payments, user=None):
+    """
+    Marca como completados los pagos indicados con un único UPDATE.
+
+    Equivale a llamar a Payment.mark_as_completed() sobre cada pago, pero
+    sin guardar fila por fila: los pagos se bloquean, se actualizan en una
+    sola sentencia y los movimientos de caja de los pagos en efectivo se
+    crean con bulk_create, todo en la misma transacción.
+
+    Args:
+        payments (QuerySet): Pagos a completar
+        user (User, optional): Usuario que marca los pagos
+
+    Returns:
+        int: Cantidad de pagos actualizados
+    """
+    with transaction.atomic():
+        pending = list(
+            payments.exclude(status="COMPLETED")
+            .select_related(None)
+            .select_for_update()
+            .only(
+                "booking_id",
+                "amount",
+                "payment_method",
+                "payment_type",
+                "original_payment_id",
+            )
+            .order_by("pk")
+        )
+        if not pending:
+            return 0
+
+        now = timezone.now()
+        changes = {"status": "COMPLETED", "updated_at": now}
+        if user:
+            changes["notes"] = Concat(
+                Coalesce("notes", Value(""), output_field=TextField()),
+                Value(
+                    f"\nMarcado como completado por {user.username} el {now}"
+                ),  # noqa
+                output_field=TextField(),
+            )
+        ids = [payment.pk for payment in pending]
+        updated = Payment.objects.filter(pk__in=ids).update(**changes)
+
+        # Movimientos de caja de los pagos en efectivo que aún no lo tienen
+        registered = set(
+            CashRegisterEntry.objects.filter(payment_id__in=ids)
+            .order_by()
+            .values_list("payment_id", flat=True)
+        )
+        entries = []
+        for payment in pending:
+            payment.status = "COMPLETED"
+            entry = payment.build_cash_entry()
+            if entry is not None and payment.pk not in registered:
+                entries.append(entry)
+        CashRegisterEntry.bulk_register(entries)
+
+        payments_bulk_changed.send(sender=Payment, payment_ids=ids)
+    return updated
+
+
+def bulk_refund(payments, user):
+    """
+    Reembolsa por completo los pagos completados indicados.
+
+    Equivale a Payment.refund() pago por pago: crea un reembolso negativo
+    por cada pago (completado si es en efectivo, pendiente en otro caso) y
+    los retiros de caja correspondientes. Las validaciones de
+    Payment.clean() para reembolsos se aplican a todo el lote antes de
+    escribir, y las inserciones se hacen con bulk_create en una única
+    transacción.
+
+    Args:
+        payments (QuerySet): Pagos a reembolsar. Se ignoran los que no
+            estén completados, los que ya son reembolsos y los que ya
+            tienen un reembolso.
+        user (User): Usuario que realiza los reembolsos (created_by)
+
+    Returns:
+        list: Los reembolsos creados
+    """
+    with transaction.atomic():
+        originals = list(
+            payments.filter(status="COMPLETED", payment_type="PAYMENT")
+            .exclude(refunds__isnull=False)
+            .select_related(None)
+            .select_for_update()
+            .only("booking_id", "amount", "payment_method")
+            .order_by("pk")
+        )
+
+        refunds = [
+            Payment(
+                booking_id=original.booking_id,
+                amount=-abs(original.amount),
+                payment_method=original.payment_method,
+                status=(
+                    "COMPLETED"
+                    if original.payment_method == "CASH"
+                    else "PENDING"  # noqa
+                ),
+                payment_type="REFUND",
+                original_payment_id=original.pk,
+                created_by=user,
+                notes=f"Reembolso del pago #{original.pk}",
+            )
+            for original in originals
+        ]
+
+        if refunds and user is None:
+            raise ValidationError(
+                {"created_by": _("Los reembolsos requieren un usuario")}
+            )
+
+        errors = []
+        for refund in refunds:
+            # Validación de campos sin consultar las relaciones fila por fila
+            try:
+                refund.clean_fields(
+                    exclude=["booking", "original_payment", "created_by"]
+                )
+            except ValidationError as error:
+                errors.extend(error.messages)
+            # Reglas de Payment.clean() para reembolsos
+            if refund.amount >= 0:
+                errors.append(
+                    _("El reembolso del pago #%(id)s debe ser negativo")
+                    % {"id": refund.original_payment_id}
+                )
+        if errors:
+            raise ValidationError(errors)
+
+        Payment.objects.bulk_create(refunds)
+        CashRegisterEntry.bulk_register(
+            entry
+            for entry in (refund.build_cash_entry() for refund in refunds)
+            if entry is not None
+        )
+
+        payments_bulk_changed.send(
+            sender=Payment, payment_ids=[refund.pk for refund in refunds]
+        )
+    return refunds
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Se envía después de modificar pagos en lote (QuerySet.update() o
+# bulk_create(), que no disparan post_save). Argumentos: payment_ids.
+payments_bulk_changed = Signal()
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import CashRegisterEntry, Payment
+from rooms.models import Property, Room, Unit
+
+
+class PaymentsAdminQueriesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        self.client.force_login(self.user)
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        self.room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        self.seeded = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            i = self.seeded = self.seeded + 1
+            check_in = date.today() + timedelta(days=1)
+            booking = Booking.objects.create(
+                guest=Guest.objects.create(
+                    name=f"Guest {i}",
+                    document_type="DNI",
+                    document_number=f"{i:08d}",
+                ),
+                unit=Unit.objects.create(name=f"{i}", room=self.room),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=2),
+                total_price=40,
+            )
+            # Los pagos en efectivo completados generan su movimiento de caja
+            Payment.objects.create(
+                booking=booking,
+                amount=Decimal("10.00"),
+                payment_method="CASH",
+                status="COMPLETED",
+                created_by=self.user,
+            )
+            CashRegisterEntry.objects.create(
+                entry_type="DEPOSIT",
+                amount=Decimal("5.00"),
+                description="Ingreso manual",
+            )
+
+    def changelist_queries(self, model):
+        url = reverse(f"admin:payments_{model}_changelist")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, model):
+        self.seed(2)
+        few = self.changelist_queries(model)
+        self.seed(20)
+        self.assertEqual(self.changelist_queries(model), few)
+
+    def test_payment_changelist(self):
+        self.assertConstantQueries("payment")
+
+    def test_cash_register_entry_changelist(self):
+        self.assertConstantQueries("cashregisterentry")
@@ -0,0 +1,204 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import ArchivedBooking, Booking, UnitNight
+from bookings.test.test_overlap_constraint import create_unit_and_guest
+from payments.archive import archive_closed
+from payments.models import (
+    ArchivedCashRegisterEntry,
+    ArchivedPayment,
+    CashRegisterEntry,
+    Payment,
+)
+from reports.kpis import refresh_property_kpis
+from reports.models import PropertyKPI
+
+
+class ArchiveClosedTest(TestCase):
+    def setUp(self):
+        self.unit, self.guest = create_unit_and_guest()
+        self.user = User.objects.create_user(username="staff")
+        self.today = date.today()
+        self.before = self.today - timedelta(days=365)
+        self.old = timezone.now() - timedelta(days=1000)
+
+    def book(self, days_ago, status="CHECKED_OUT"):
+        """Reserva pasada de dos noches, sin pasar por Booking.save()."""
+        check_in = self.today - timedelta(days=days_ago)
+        return Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=self.guest,
+                    unit=self.unit,
+                    check_in_date=check_in,
+                    check_out_date=check_in + timedelta(days=2),
+                    status=status,
+                    total_price=Decimal("40.00"),
+                )
+            ]
+        )[0]
+
+    def pay(self, booking, amount, payment_method="CASH", when=None):
+        """Pago completado, con su fecha y la de su movimiento de caja."""
+        payment = Payment.objects.create(
+            booking=booking,
+            amount=Decimal(amount),
+            payment_method=payment_method,
+            status="COMPLETED",
+            created_by=self.user,
+        )
+        when = when or self.old
+        Payment.objects.filter(pk=payment.pk).update(
+            payment_date=when, created_at=when
+        )  # noqa
+        CashRegisterEntry.objects.filter(payment=payment).update(
+            created_at=when
+        )  # noqa
+        return payment
+
+    def entry(self, entry_type, amount, when=None):
+        entry = CashRegisterEntry.objects.create(
+            entry_type=entry_type,
+            amount=Decimal(amount),
+            description="Movimiento manual",
+        )
+        CashRegisterEntry.objects.filter(pk=entry.pk).update(
+            created_at=when or self.old
+        )
+        return entry
+
+    def assertLedgerConsistent(self, balance):
+        self.assertEqual(CashRegisterEntry.get_current_balance(), balance)
+        self.assertEqual(CashRegisterEntry.get_aggregate_balance(), balance)
+        self.assertEqual(CashRegisterEntry.rebuild_balances(), balance)
+        call_command("reconcile_cash_register", stdout=StringIO())
+
+    def test_archives_closed_and_settled_bookings(self):
+        opening = self.entry("DEPOSIT", "100.00")
+        paid = self.book(900)
+        payment = self.pay(paid, "40.00")
+        paid_entry = payment.cash_entries.get()
+        card = self.pay(paid, "40.00", payment_method="CREDIT_CARD")
+        card.refund(user=self.user).mark_as_completed()
+        cancelled = self.book(800, status="CANCELLED")
+        in_debt = self.book(700)
+        self.pay(in_debt, "10.00", when=self.old + timedelta(days=1))
+        recent = self.book(30)
+        self.pay(recent, "40.00", when=timezone.now())
+        balance = CashRegisterEntry.get_current_balance()
+
+        archived = archive_closed(self.before)
+
+        self.assertEqual(
+            archived,
+            {"bookings": 2, "payments": 3, "cash_entries": 2},
+        )
+        self.assertCountEqual(
+            Booking.objects.values_list("pk", flat=True),
+            [in_debt.pk, recent.pk],
+        )
+        self.assertCountEqual(
+            ArchivedBooking.objects.values_list("pk", flat=True),
+            [paid.pk, cancelled.pk],
+        )
+        archived_payment = ArchivedPayment.objects.get(pk=payment.pk)
+        self.assertEqual(archived_payment.booking_id, paid.pk)
+        self.assertEqual(archived_payment.created_by, self.user)
+        refund = ArchivedPayment.objects.get(payment_type="REFUND")
+        self.assertEqual(refund.original_payment_id, card.pk)
+        self.assertEqual(
+            list(
+                ArchivedCashRegisterEntry.objects.order_by("pk").values_list(
+                    "pk", flat=True
+                )
+            ),
+            [opening.pk, paid_entry.pk],
+        )
+        self.assertFalse(UnitNight.objects.filter(booking_id=paid.pk).exists())
+
+        # El saldo de apertura es el del último movimiento archivado
+        self.assertEqual(CashRegisterEntry.opening_balance(), Decimal("140.00"))  # noqa
+        self.assertLedgerConsistent(balance)
+        self.assertEqual(
+            CashRegisterEntry.get_balance_at(self.old), Decimal("140.00")
+        )  # noqa
+
+    def test_ledger_is_archived_as_a_prefix(self):
+        interleaved = self.book(900)
+        self.pay(interleaved, "20.00")
+        in_debt = self.book(800)
+        self.pay(in_debt, "10.00")
+        self.pay(interleaved, "20.00")
+        balance = CashRegisterEntry.get_current_balance()
+
+        archived = archive_closed(self.before)
+
+        # La reserva saldada tiene un movimiento después de uno que queda
+        self.assertEqual(archived, {})
+        self.assertEqual(Booking.objects.count(), 2)
+        self.assertLedgerConsistent(balance)
+
+    def test_recent_entries_stay(self):
+        paid = self.book(900)
+        self.pay(paid, "40.00")
+        self.entry("WITHDRAWAL", "5.00", when=timezone.now())
+        later = self.book(800)
+        self.pay(later, "40.00")
+
+        archived = archive_closed(self.before)
+
+        self.assertEqual(archived["bookings"], 1)
+        self.assertTrue(Booking.objects.filter(pk=later.pk).exists())
+        self.assertLedgerConsistent(Decimal("75.00"))
+
+    def test_batches(self):
+        bookings = [self.book(900 - i * 10) for i in range(5)]
+        for booking in bookings:
+            self.pay(booking, "40.00")
+        self.book(700, status="CANCELLED")
+
+        archived = archive_closed(self.before, batch_size=2)
+
+        self.assertEqual(
+            archived, {"bookings": 6, "payments": 5, "cash_entries": 5}
+        )  # noqa
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(CashRegisterEntry.objects.exists())
+        self.assertLedgerConsistent(Decimal("200.00"))
+
+        # Los movimientos nuevos siguen desde el saldo de apertura
+        self.entry("DEPOSIT", "10.00")
+        self.assertLedgerConsistent(Decimal("210.00"))
+
+    def test_property_cash_balance_includes_archive(self):
+        self.pay(self.book(900), "40.00")
+        self.pay(self.book(30), "15.00", when=timezone.now())
+        property_id = self.unit.room.property_id
+        refresh_property_kpis([property_id])
+        kpi = PropertyKPI.objects.get(property_id=property_id)
+        self.assertEqual(kpi.cash_balance, Decimal("55.00"))
+
+        archive_closed(self.before)
+        refresh_property_kpis([property_id])
+
+        kpi.refresh_from_db()
+        self.assertEqual(kpi.cash_balance, Decimal("55.00"))
+
+    def test_command(self):
+        self.pay(self.book(900), "40.00")
+
+        output = StringIO()
+        call_command(
+            "archive_closed", "--months", "12", "--dry-run", stdout=output
+        )  # noqa
+        self.assertIn("1 reservas, 1 pagos, 1 movimientos", output.getvalue())
+        self.assertFalse(ArchivedBooking.objects.exists())
+
+        call_command("archive_closed", "--months", "12", stdout=StringIO())
+        self.assertEqual(ArchivedBooking.objects.count(), 1)
@@ -0,0 +1,103 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from payments.models import CashRegisterBalance, CashRegisterEntry
+
+
+class CashRegisterRunningBalanceTest(TestCase):
+    """Pruebas para el saldo acumulado de la caja."""
+
+    def entry(self, entry_type, amount):
+        return CashRegisterEntry.objects.create(
+            entry_type=entry_type,
+            amount=Decimal(amount),
+            description="Movimiento de prueba",
+        )
+
+    def setUp(self):
+        self.first = self.entry("DEPOSIT", "100.00")
+        self.second = self.entry("WITHDRAWAL", "30.00")
+        self.third = self.entry("DEPOSIT", "10.00")
+
+    def balances(self):
+        return list(
+            CashRegisterEntry.objects.order_by("pk").values_list(
+                "balance", flat=True
+            )  # noqa
+        )
+
+    def test_each_entry_stores_the_running_balance(self):
+        self.assertEqual(
+            self.balances(),
+            [Decimal("100.00"), Decimal("70.00"), Decimal("80.00")],
+        )
+        self.assertEqual(
+            CashRegisterBalance.objects.get().balance, Decimal("80.00")
+        )  # noqa
+
+    def test_current_balance_is_a_single_lookup(self):
+        with self.assertNumQueries(1):
+            balance = CashRegisterEntry.get_current_balance()
+        self.assertEqual(balance, Decimal("80.00"))
+        self.assertEqual(balance, CashRegisterEntry.get_aggregate_balance())
+
+    def test_balance_at_a_given_moment(self):
+        before = timezone.now() - timezone.timedelta(days=1)
+        self.assertEqual(CashRegisterEntry.get_balance_at(before), 0)
+        self.assertEqual(
+            CashRegisterEntry.get_balance_at(self.second.created_at),
+            Decimal("70.00"),
+        )
+
+    def test_withdrawal_exceeding_balance_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            self.entry("WITHDRAWAL", "80.01")
+        self.assertEqual(
+            CashRegisterEntry.get_current_balance(), Decimal("80.00")
+        )  # noqa
+
+    def test_editing_an_entry_updates_the_following_balances(self):
+        self.first.amount = Decimal("50.00")
+        self.first.save()
+        self.assertEqual(
+            self.balances(),
+            [Decimal("50.00"), Decimal("20.00"), Decimal("30.00")],
+        )
+        self.assertEqual(
+            CashRegisterEntry.get_current_balance(), Decimal("30.00")
+        )  # noqa
+
+    def test_deleting_an_entry_updates_the_following_balances(self):
+        self.second.delete()
+        self.assertEqual(
+            self.balances(), [Decimal("100.00"), Decimal("110.00")]
+        )  # noqa
+        self.assertEqual(
+            CashRegisterEntry.get_current_balance(), Decimal("110.00")
+        )  # noqa
+
+    def test_reconcile_command(self):
+        out = StringIO()
+        call_command("reconcile_cash_register", stdout=out)
+        self.assertIn("conciliada", out.getvalue())
+
+        # Un UPDATE directo deja los saldos desfasados
+        CashRegisterEntry.objects.filter(pk=self.second.pk).update(
+            entry_type="DEPOSIT"
+        )  # noqa
+        with self.assertRaises(CommandError):
+            call_command("reconcile_cash_register", stdout=StringIO())
+
+        call_command("reconcile_cash_register", "--fix", stdout=StringIO())
+        self.assertEqual(
+            self.balances(),
+            [Decimal("100.00"), Decimal("130.00"), Decimal("140.00")],
+        )
+        self.assertEqual(
+            CashRegisterEntry.get_current_balance(), Decimal("140.00")
+        )  # noqa
@@ -0,0 +1,158 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import CashRegisterEntry, Payment
+from payments.services import bulk_mark_as_completed, bulk_refund
+from rooms.models import Property, Room, Unit
+
+
+class BulkPaymentServicesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        check_in = date.today() + timedelta(days=1)
+        self.bookings = [
+            Booking.objects.create(
+                guest=guest,
+                unit=Unit.objects.create(name=f"{i}", room=room),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=2),
+                total_price=Decimal("100.00"),
+            )
+            for i in range(5)
+        ]
+
+    def pay(self, booking, method="CREDIT_CARD", status="PENDING", amount=40):
+        return Payment.objects.create(
+            booking=booking,
+            amount=Decimal(amount),
+            payment_method=method,
+            status=status,
+            created_by=self.user,
+        )
+
+    def test_mark_as_completed_runs_a_constant_number_of_queries(self):
+        for booking in self.bookings[:2]:
+            self.pay(booking)
+        # Savepoint, bloqueo, UPDATE, cajas existentes, feed de cambios y
+        # liberación del savepoint
+        with self.assertNumQueries(6):
+            bulk_mark_as_completed(Payment.objects.all())
+
+        for booking in self.bookings:
+            self.pay(booking)
+        with self.assertNumQueries(6):
+            updated = bulk_mark_as_completed(Payment.objects.all())
+
+        self.assertEqual(updated, 5)
+        self.assertFalse(Payment.objects.exclude(status="COMPLETED").exists())
+
+    def test_mark_as_completed_appends_the_user_to_the_notes(self):
+        payment = self.pay(self.bookings[0])
+        bulk_mark_as_completed(Payment.objects.all(), user=self.user)
+        payment.refresh_from_db()
+        self.assertIn("Marcado como completado por admin", payment.notes)
+
+    def test_refund_creates_refunds_and_cash_withdrawals(self):
+        cash = [
+            self.pay(booking, method="CASH", status="COMPLETED")
+            for booking in self.bookings[:3]
+        ]
+        card = self.pay(self.bookings[3], status="COMPLETED")
+        self.assertEqual(CashRegisterEntry.get_current_balance(), 120)
+
+        refunds = bulk_refund(Payment.objects.all(), user=self.user)
+
+        self.assertEqual(len(refunds), 4)
+        by_original = {refund.original_payment_id: refund for refund in refunds}  # noqa
+        self.assertEqual(by_original[card.pk].status, "PENDING")
+        self.assertEqual(by_original[cash[0].pk].status, "COMPLETED")
+        self.assertEqual(by_original[cash[0].pk].amount, Decimal("-40"))
+
+        withdrawals = CashRegisterEntry.objects.filter(entry_type="WITHDRAWAL")
+        self.assertEqual(withdrawals.count(), 3)
+        self.assertEqual(CashRegisterEntry.get_current_balance(), 0)
+        self.assertEqual(
+            CashRegisterEntry.get_aggregate_balance(),
+            CashRegisterEntry.get_current_balance(),
+        )
+        self.assertEqual(
+            list(
+                CashRegisterEntry.objects.order_by("pk").values_list(
+                    "balance", flat=True
+                )
+            ),
+            [40, 80, 120, 80, 40, 0],
+        )
+
+    def test_refund_skips_refunded_and_pending_payments(self):
+        payment = self.pay(self.bookings[0], method="CASH", status="COMPLETED")
+        payment.refund(user=self.user)
+        self.pay(self.bookings[1])
+
+        self.assertEqual(bulk_refund(Payment.objects.all(), self.user), [])
+
+    def test_refund_is_rejected_when_the_register_lacks_cash(self):
+        self.pay(self.bookings[0], method="CASH", status="COMPLETED")
+        CashRegisterEntry.objects.create(
+            entry_type="WITHDRAWAL",
+            amount=Decimal("30.00"),
+            description="Retiro",  # noqa
+        )
+
+        with self.assertRaises(ValidationError):
+            bulk_refund(Payment.objects.all(), self.user)
+        self.assertFalse(Payment.objects.filter(payment_type="REFUND").exists())  # noqa
+        self.assertEqual(CashRegisterEntry.get_current_balance(), 10)
+
+    def test_admin_actions_use_the_bulk_services(self):
+        self.client.force_login(self.user)
+        payments = [self.pay(booking) for booking in self.bookings]
+        response = self.client.post(
+            reverse("admin:payments_payment_changelist"),
+            {
+                "action": "mark_as_completed",
+                "_selected_action": [payment.pk for payment in payments],
+            },
+            follow=True,
+        )
+        self.assertContains(
+            response, "5 pagos han sido marcados como completados"
+        )  # noqa
+
+        response = self.client.post(
+            reverse("admin:payments_payment_changelist"),
+            {
+                "action": "mark_as_refunded",
+                "_selected_action": [payment.pk for payment in payments],
+            },
+            follow=True,
+        )
+        self.assertContains(
+            response, "5 pagos han sido marcados como reembolsados"
+        )  # noqa
+        self.assertEqual(
+            Payment.objects.filter(
+                payment_type="REFUND", created_by=self.user
+            ).count(),  # noqa
+            5,
+        )
@@ -0,0 +1,139 @@
+import logging
+import time
+from contextlib import ExitStack
+from fnmatch import fnmatchcase
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("pms.queries")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Una vista ejecutó más consultas que las permitidas por su budget."""
+
+
+class QueryCollector:
+    """Cuenta las consultas y acumula su duración (execute_wrapper)."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def get_query_budget(view_name):
+    """
+    Budget de consultas de una vista según QUERY_BUDGETS.
+
+    Las claves son nombres de vista (request.resolver_match.view_name) y
+    admiten comodines, por ejemplo "admin:*_changelist". Gana la primera
+    clave que coincida; si ninguna coincide se usa QUERY_BUDGET_DEFAULT.
+    """
+    for pattern, budget in getattr(settings, "QUERY_BUDGETS", {}).items():
+        if fnmatchcase(view_name, pattern):
+            return budget
+    return getattr(settings, "QUERY_BUDGET_DEFAULT", None)
+
+
+class QueryBudgetMiddleware:
+    """
+    Mide la cantidad de consultas, el tiempo de base de datos y el tiempo
+    total de cada request.
+
+    Las métricas se publican en el encabezado Server-Timing y en una línea
+    de log del logger "pms.queries". Si la vista supera su budget de
+    consultas se registra una advertencia y, con QUERY_BUDGET_STRICT
+    activado (durante los tests), se lanza QueryBudgetExceeded para que la
+    regresión (por ejemplo, un N+1) haga fallar el test.
+
+    Debe ubicarse primero en MIDDLEWARE para contar también las consultas
+    de sesión y autenticación. Admite vistas async (ver api.async_views)
+    sin forzar el paso a modo sincrónico de toda la cadena.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self.collect(stack, collector)
+            response = self.get_response(request)
+        return self.measure(request, response, collector, start)
+
+    async def __acall__(self, request):
+        # El ORM (también sus métodos async) ejecuta las consultas en el
+        # hilo sincrónico del request: los execute_wrapper se instalan en
+        # las conexiones de ese hilo
+        collector = QueryCollector()
+        start = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self.collect)(stack, collector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.measure(request, response, collector, start)
+
+    def collect(self, stack, collector):
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(collector))
+
+    def measure(self, request, response, collector, start):
+        total = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else ""
+
+        response["Server-Timing"] = (
+            f'db;dur={collector.duration * 1000:.1f};desc="{collector.count} queries", '  # noqa
+            f"total;dur={total * 1000:.1f}"
+        )
+
+        metrics = {
+            "view": view_name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": collector.count,
+            "db_ms": round(collector.duration * 1000, 1),
+            "total_ms": round(total * 1000, 1),
+        }
+        logger.info(
+            " ".join(f"{key}={value}" for key, value in metrics.items()),
+            extra=metrics,
+        )
+
+        budget = get_query_budget(view_name) if view_name else None
+        if budget is not None and collector.count > budget:
+            message = (
+                f"La vista {view_name} ejecutó {collector.count} consultas "
+                f"(budget: {budget})"
+            )
+            logger.warning(message, extra=metrics)
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+
+        return response
@@ -0,0 +1,403 @@
+"""
+Particionado declarativo por rango de fecha de las tablas que crecen sin
+límite (Booking por check_in_date, Payment por payment_date).
+
+Es opcional: con DB_PARTITIONING ("monthly" o "yearly", ver settings) las
+migraciones bookings.0005 y payments.0009 convierten las tablas, y el
+comando `partitions` crea las particiones futuras y separa las viejas.
+
+PostgreSQL exige que la clave de partición forme parte de la clave
+primaria y de toda restricción única, por lo que al convertir una tabla:
+
+- La clave primaria pasa a ser (id, clave de partición); el id sigue
+  siendo único porque sale de una secuencia.
+- Las claves foráneas que apuntan a la tabla se eliminan. Django sigue
+  aplicando on_delete desde el ORM; las que se agreguen en el futuro
+  deben declararse con db_constraint=False.
+- Las restricciones únicas y de exclusión (exclude_overlapping_bookings)
+  se crean en cada partición. Entre particiones, la superposición de
+  reservas la sigue impidiendo unique_active_unit_night (UnitNight).
+"""
+
+import gzip
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.db import connection, models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from pms.pgcopy import copy_to
+
+# Modelo particionado y su clave de partición
+PARTITION_KEYS = {
+    "bookings.Booking": "check_in_date",
+    "payments.Payment": "payment_date",
+}
+
+INTERVALS = ("monthly", "yearly")
+
+# Meses hacia adelante para los que se crean particiones
+AHEAD_MONTHS = 12
+
+
+def partitioned_models():
+    return [apps.get_model(label) for label in PARTITION_KEYS]
+
+
+def period_start(day, interval):
+    """Primer día del mes o del año que contiene a `day`."""
+    if interval == "yearly":
+        return day.replace(month=1, day=1)
+    return day.replace(day=1)
+
+
+def next_period(start, interval):
+    if interval == "yearly":
+        return start.replace(year=start.year + 1)
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table, start, interval):
+    if interval == "yearly":
+        return f"{table}_p{start:%Y}"
+    return f"{table}_p{start:%Y_%m}"
+
+
+def is_partitioned(table, using=connection):
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass(%s)",  # noqa
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(model, using=connection):
+    """
+    Particiones con rango de la tabla del modelo, ordenadas por fecha.
+
+    Returns:
+        list: Tuplas (nombre, inicio, intervalo); la partición por
+            defecto no se incluye
+    """
+    table = model._meta.db_table
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    result = []
+    for name in names:
+        suffix = name.removeprefix(f"{table}_p")
+        if suffix == name:
+            continue
+        if len(suffix) == 4:
+            result.append((name, date(int(suffix), 1, 1), "yearly"))
+        else:
+            year, month = suffix.split("_")
+            result.append((name, date(int(year), int(month), 1), "monthly"))
+    return sorted(result, key=lambda partition: partition[1])
+
+
+def _key(model):
+    return model._meta.get_field(PARTITION_KEYS[model._meta.label])
+
+
+def _bound(field, day):
+    """Límite de una partición en el tipo de la clave de partición."""
+    if isinstance(field, models.DateTimeField):
+        return timezone.make_aware(datetime.combine(day, time.min))
+    return day
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return timezone.localdate(value)
+    return value
+
+
+def _local_constraints(schema_editor, model, table):
+    """
+    Crea en una partición las restricciones únicas y de exclusión del
+    modelo, que PostgreSQL no admite en la tabla particionada.
+    """
+    for constraint in model._meta.constraints:
+        if not isinstance(
+            constraint, (ExclusionConstraint, models.UniqueConstraint)
+        ):  # noqa
+            continue
+        path, args, kwargs = constraint.deconstruct()
+        # El nombre conserva el de la restricción para reconocer el error
+        # (ver OVERLAP_CONSTRAINTS en bookings.models)
+        kwargs["name"] = f"{table}_{constraint.name}"[-63:]
+        statement = type(constraint)(*args, **kwargs).create_sql(
+            model, schema_editor
+        )  # noqa
+        statement.rename_table_references(model._meta.db_table, table)
+        schema_editor.execute(statement)
+
+
+def _create_partition(schema_editor, model, start, interval):
+    """
+    Crea la partición del período que empieza en `start`.
+
+    Se arma como tabla aparte y se adjunta después, moviendo antes las
+    filas del período que hayan caído en la partición por defecto.
+    """
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    key = _key(model)
+    name = partition_name(table, start, interval)
+    bounds = [_bound(key, start), _bound(key, next_period(start, interval))]
+
+    schema_editor.execute(
+        f"CREATE TABLE {quote(name)} (LIKE {quote(table)} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    default = quote(f"{table}_default")
+    schema_editor.execute(
+        f"WITH moved AS (DELETE FROM {default} "
+        f"WHERE {quote(key.column)} >= %s AND {quote(key.column)} < %s "
+        f"RETURNING *) INSERT INTO {quote(name)} SELECT * FROM moved",
+        bounds,
+    )
+    # Los índices de la tabla particionada se crean al adjuntar
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} "
+        "FOR VALUES FROM (%s) TO (%s)",
+        bounds,
+    )
+    _local_constraints(schema_editor, model, name)
+    return name
+
+
+def partition_table(schema_editor, model, interval, months=AHEAD_MONTHS):
+    """
+    Convierte la tabla del modelo en una tabla particionada por rango.
+
+    Copia las filas a una partición por período, desde la más antigua
+    hasta `months` meses adelante, más una partición por defecto para
+    las fechas fuera de rango. Bloquea la tabla mientras copia: correr
+    en una ventana de mantenimiento.
+
+    Returns:
+        list: Claves foráneas de otras tablas que se eliminaron
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Intervalo de partición inválido: {interval!r}")
+    using = schema_editor.connection
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    old = f"{table}_unpartitioned"
+    pk = model._meta.pk.column
+    key = _key(model)
+
+    schema_editor.execute(f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE")  # noqa
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT conrelid::regclass::text || '.' || conname "
+            "FROM pg_constraint WHERE contype = 'f' "
+            "AND confrelid = to_regclass(%s) AND conrelid <> confrelid",
+            [table],
+        )
+        dropped = [name for (name,) in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT MIN({quote(key.column)}), MAX({quote(key.column)}) "
+            f"FROM {quote(table)}"
+        )
+        first, last = (_as_date(value) for value in cursor.fetchone())
+
+    schema_editor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(old)}")
+    schema_editor.execute(
+        f"CREATE TABLE {quote(table)} (LIKE {quote(old)} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({quote(key.column)})"
+    )
+    today = date.today()
+    start = period_start(min(first or today, today), interval)
+    until = max(last or today, add_months(today, months))
+    names = []
+    while start <= until:
+        names.append(partition_name(table, start, interval))
+        schema_editor.execute(
+            f"CREATE TABLE {quote(names[-1])} PARTITION OF {quote(table)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [_bound(key, start), _bound(key, next_period(start, interval))],
+        )
+        start = next_period(start, interval)
+    names.append(f"{table}_default")
+    schema_editor.execute(
+        f"CREATE TABLE {quote(names[-1])} PARTITION OF {quote(table)} DEFAULT"
+    )
+
+    # Los índices y restricciones se construyen después de copiar
+    schema_editor.execute(
+        f"INSERT INTO {quote(table)} SELECT * FROM {quote(old)}"
+    )  # noqa
+    # Las claves foráneas de Django son diferidas: se verifican antes de
+    # eliminar la tabla original y se vuelven a diferir
+    schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    schema_editor.execute(f"DROP TABLE {quote(old)} CASCADE")
+    schema_editor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+    # La identidad de la columna se eliminó con la tabla original
+    sequence = f"{table}_{pk}_seq"
+    schema_editor.execute(
+        f"CREATE SEQUENCE {quote(sequence)} "
+        f"OWNED BY {quote(table)}.{quote(pk)}"  # noqa
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ALTER COLUMN {quote(pk)} "
+        f"SET DEFAULT nextval('{quote(sequence)}')"
+    )
+    schema_editor.execute(
+        f"SELECT setval('{quote(sequence)}', COALESCE(MAX({quote(pk)}), 0) + 1, "  # noqa
+        f"false) FROM {quote(table)}"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} "
+        f"ADD PRIMARY KEY ({quote(pk)}, {quote(key.column)})"
+    )
+    for statement in schema_editor._model_indexes_sql(model):
+        schema_editor.execute(statement)
+    for field in model._meta.local_concrete_fields:
+        if not field.remote_field or not field.db_constraint:
+            continue
+        # Una clave foránea no puede apuntar a una tabla particionada
+        if is_partitioned(field.related_model._meta.db_table, using):
+            continue
+        schema_editor.execute(
+            schema_editor._create_fk_sql(
+                model, field, "_fk_%(to_table)s_%(to_column)s"
+            )  # noqa
+        )
+    for name in names:
+        _local_constraints(schema_editor, model, name)
+    schema_editor.execute(f"ANALYZE {quote(table)}")
+    return dropped
+
+
+def create_partitions(schema_editor, model, months=AHEAD_MONTHS):
+    """
+    Crea las particiones que falten desde el período actual hasta
+    `months` meses adelante, con el intervalo de las existentes.
+
+    Returns:
+        list: Nombres de las particiones creadas
+    """
+    existing = partitions(model, schema_editor.connection)
+    if not existing:
+        return []
+    interval = existing[-1][2]
+    starts = {start for name, start, _ in existing}
+    start = period_start(date.today(), interval)
+    until = add_months(date.today(), months)
+    created = []
+    while start <= until:
+        if start not in starts:
+            created.append(
+                _create_partition(schema_editor, model, start, interval)
+            )  # noqa
+        start = next_period(start, interval)
+    return created
+
+
+def _in_use(model, rows, start, end):
+    """
+    Indica si alguna fila de la partición sigue en uso desde las tablas
+    vivas y no se puede separar.
+
+    Las claves foráneas hacia la tabla particionada ya no existen en la
+    base (ver partition_table), así que separar filas referenciadas
+    dejaría colgados pagos, noches o movimientos de caja. Cuentan como en
+    uso las filas referenciadas desde otras particiones u otras tablas,
+    las que referencian a otra tabla particionada (un pago de una reserva
+    viva) y las reservas activas.
+    """
+    key = _key(model)
+    conditions = Q()
+    for rel in model._meta.related_objects:
+        related = rel.related_model._base_manager.filter(
+            **{rel.field.name: OuterRef("pk")}
+        )
+        if rel.related_model is model:
+            # Las referencias dentro de la misma partición salen con ella
+            related = related.exclude(
+                **{
+                    f"{key.name}__gte": _bound(key, start),
+                    f"{key.name}__lt": _bound(key, end),
+                }
+            )
+        conditions |= Q(Exists(related))
+    for field in model._meta.concrete_fields:
+        target = field.related_model
+        if (
+            field.many_to_one
+            and target is not model
+            and target._meta.label in PARTITION_KEYS
+        ):
+            conditions |= Q(
+                Exists(target._base_manager.filter(pk=OuterRef(field.attname)))
+            )
+    active = getattr(model, "ACTIVE_STATUSES", None)
+    if active:
+        conditions |= Q(status__in=active)
+    return rows.filter(conditions).exists()
+
+
+def detach_partitions(schema_editor, model, before, archive=None):
+    """
+    Separa de la tabla las particiones que terminan antes de `before`.
+
+    Las particiones separadas quedan como tablas sueltas, fuera del
+    alcance del ORM. Con `archive` (un directorio) se exportan antes a
+    <partición>.csv.gz con COPY y se eliminan.
+
+    Una partición con reservas activas o con filas todavía referenciadas
+    (ver _in_use) se conserva: primero hay que archivar sus reservas y
+    pagos con archive_closed (ver payments.archive), que las saca de las
+    tablas vivas junto con sus dependencias.
+
+    Returns:
+        tuple: Nombres de las particiones separadas y de las conservadas
+    """
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    key = _key(model)
+    detached, kept = [], []
+    for name, start, interval in partitions(model, schema_editor.connection):
+        end = next_period(start, interval)
+        if end > before:
+            break
+        rows = model._base_manager.filter(
+            **{
+                f"{key.name}__gte": _bound(key, start),
+                f"{key.name}__lt": _bound(key, end),
+            }
+        ).order_by(model._meta.pk.name)
+        if _in_use(model, rows, start, end):
+            kept.append(name)
+            continue
+        if archive is not None:
+            with gzip.open(Path(archive, f"{name}.csv.gz"), "wt") as output:
+                copy_to(rows, output)
+        schema_editor.execute(
+            f"ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}"
+        )
+        if archive is not None:
+            schema_editor.execute(f"DROP TABLE {quote(name)}")
+        detached.append(name)
+    return detached, kept
@@ -0,0 +1,96 @@
+import io
+from datetime import date, datetime
+
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+
+def _copy_value(value):
+    """Convierte un valor al formato de texto de COPY."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_lines(rows):
+    for row in rows:
+        yield "\t".join(_copy_value(value) for value in row) + "\n"
+
+
+class _RowReader:
+    """Archivo de solo lectura que genera las líneas de COPY bajo demanda."""
+
+    def __init__(self, rows):
+        self._lines = _copy_lines(rows)
+        self._buffer = ""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+    readline = read
+
+
+def copy_rows(model, columns, rows):
+    """
+    Inserta filas con COPY ... FROM STDIN, sin armar objetos del modelo.
+
+    Funciona con psycopg2 (copy_expert) y con psycopg 3 (cursor.copy),
+    necesario para usar el pool de conexiones (ver DB_POOL en settings).
+
+    Args:
+        model: Modelo destino
+        columns (list): Columnas de la tabla, en el orden de cada fila
+        rows (iterable): Tuplas de valores
+
+    Returns:
+        int: Cantidad de filas insertadas
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ", ".join(connection.ops.quote_name(column) for column in columns)
+    sql = f"COPY {table} ({names}) FROM STDIN"
+    with connection.cursor() as cursor:
+        if is_psycopg3:
+            with cursor.copy(sql) as copy:
+                for line in _copy_lines(rows):
+                    copy.write(line)
+        else:
+            cursor.copy_expert(sql, _RowReader(rows))
+        return cursor.rowcount
+
+
+def copy_to(queryset, output):
+    """
+    Exporta el resultado de un QuerySet en CSV con COPY ... TO STDOUT.
+
+    El servidor genera el CSV y lo escribe en `output` a medida que lo
+    produce, sin materializar filas ni objetos en Python.
+    """
+    sql = "COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER)".format(
+        connection.ops.compose_sql(*queryset.query.sql_with_params())
+    )
+    with connection.cursor() as cursor:
+        if not is_psycopg3:
+            cursor.copy_expert(sql, output)
+            return
+        text = isinstance(output, io.TextIOBase)
+        with cursor.copy(sql) as copy:
+            for data in copy:
+                output.write(bytes(data).decode() if text else bytes(data))
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,15 +39,22 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "guests",
     "rooms",
     "bookings",
     "payments",
     "accounts",
+    "reports",
+    "api",
     "axes",
+    "rest_framework",
+    "django_filters",
+    "knox",
 ]
 
 MIDDLEWARE = [
+    "pms.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -59,6 +67,51 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "pms.urls"
 
+# Budget de consultas SQL por vista (pms.middleware.QueryBudgetMiddleware).
+# Las claves son nombres de vista y admiten comodines.
+QUERY_BUDGETS = {
+    "dashboard": 10,
+    "booking_calendar": 10,
+    "admin:*_changelist": 15,
+    # El login de knox registra el acceso (axes) y crea el token
+    "api_login": 20,
+    # Incluye el alta de reservas (POST), que valida y sincroniza noches
+    "booking-list": 20,
+    # Una búsqueda por propiedad activa
+    "api_async_availability": None,
+    "api_*": 10,
+    "*-list": 10,
+    "*-detail": 10,
+}
+QUERY_BUDGET_DEFAULT = None
+
+# Durante los tests, superar un budget hace fallar el test
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+QUERY_BUDGET_STRICT = TESTING
+
+# Nivel de las métricas por request del logger "pms.queries"
+QUERY_LOG_LEVEL = (
+    "ERROR" if TESTING else os.environ.get("QUERY_LOG_LEVEL", "INFO")
+)  # noqa
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "metrics": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},  # noqa
+    },
+    "handlers": {
+        "metrics": {"class": "logging.StreamHandler", "formatter": "metrics"},
+    },
+    "loggers": {
+        "pms.queries": {
+            "handlers": ["metrics"],
+            "level": QUERY_LOG_LEVEL,
+            "propagate": False,
+        },
+    },
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -88,9 +141,35 @@ DATABASES = {
         "USER": os.environ["USER"],
         "PASSWORD": os.environ["PASS"],
         "HOST": os.environ["HOST"],
+        "PORT": os.environ.get("DATABASE_PORT", ""),
+        # Segundos que cada hilo reutiliza su conexión (0: una por request)
+        "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE", 0)),
+        # Verifica una conexión persistente antes de reutilizarla
+        "CONN_HEALTH_CHECKS": os.environ.get("CONN_HEALTH_CHECKS") == "1",
     }
 }
 
+# Pool de conexiones de psycopg 3 (requiere psycopg[pool], no psycopg2).
+# Con DB_POOL=1 los hilos toman conexiones ya abiertas del pool y las
+# devuelven al terminar el request, en lugar de mantener una conexión
+# persistente cada uno: es incompatible con CONN_MAX_AGE
+DB_POOL = os.environ.get("DB_POOL") == "1"
+if DB_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            # Segundos de espera por una conexión libre antes de fallar
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        }
+    }
+
+# Particionado por rango de fecha de reservas y pagos (ver
+# pms/partitioning.py): "monthly", "yearly" o vacío para no particionar.
+# Las migraciones convierten las tablas solo si está definido
+DB_PARTITIONING = os.environ.get("DB_PARTITIONING", "")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -152,3 +231,29 @@ AXES_FAILURE_LIMIT = 5  # Número de intentos fallidos permitidos
 AXES_COOLOFF_TIME = 0.1  # Tiempo de espera para volver a intentar
 AXES_LOCKOUT_TEMPLATE = "accounts/lockout.html"  # Opcional
 AXES_RESET_ON_SUCCESS = True
+
+
+# Django REST Framework
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "knox.auth.TokenAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "rest_framework.permissions.IsAuthenticated",
+    ],
+    "DEFAULT_FILTER_BACKENDS": [
+        "django_filters.rest_framework.DjangoFilterBackend",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.IdCursorPagination",
+    "PAGE_SIZE": 50,
+}
+
+# Caché de datos de referencia de habitaciones, unidades y planes (ver
+# rooms.cache): segundos de vida en el backend de caché y cantidad máxima
+# de entradas del LRU en memoria de cada proceso
+ROOMS_CACHE_TIMEOUT = int(os.environ.get("ROOMS_CACHE_TIMEOUT", 300))
+ROOMS_CACHE_LOCAL_SIZE = int(os.environ.get("ROOMS_CACHE_LOCAL_SIZE", 10_000))
+
+# Segundos que accounts.backends.CachedModelBackend conserva en la caché
+# el usuario de la sesión (ver pms/settings_production.py)
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", 300))
@@ -0,0 +1,37 @@
+"""
+Perfil de producción detrás de pgbouncer.
+
+Se activa con DJANGO_SETTINGS_MODULE=pms.settings_pgbouncer y parte de
+pms/settings_production.py. La aplicación se conecta a pgbouncer
+(servicio pgbouncer de docker-compose.prod.yml, perfil "pgbouncer") en
+lugar de PostgreSQL, y pgbouncer reparte un número acotado de conexiones
+al servidor entre todos los workers de gunicorn.
+
+pgbouncer corre en modo transaction: una conexión al servidor se asigna
+solo mientras dura cada transacción, por lo que:
+
+- No se usan cursores del lado del servidor (QuerySet.iterator() los
+  usa por defecto), que viven fuera de una transacción. Sin ellos,
+  iterator() trae el resultado completo en la primera lectura: las
+  exportaciones CSV (reports.exports) leen entonces por páginas de id,
+  una consulta corta por página, y `export_csv --copy` genera el CSV
+  con COPY TO en una sola sentencia. Otros recorridos con iterator()
+  sobre tablas grandes conviene hacerlos contra PostgreSQL directo
+  (con pms.settings_production).
+- No hace falta el pool de psycopg 3 (DB_POOL): abrir una conexión a
+  pgbouncer es barato y las conexiones persistentes (CONN_MAX_AGE)
+  alcanzan para no reconectar en cada request.
+"""
+
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import DATABASES, os
+
+DATABASES = {
+    "default": {
+        **DATABASES["default"],
+        "HOST": os.environ.get("PGBOUNCER_HOST", "pgbouncer"),
+        "PORT": os.environ.get("PGBOUNCER_PORT", "6432"),
+        # Ver arriba: iterator() deja de leer por lotes desde el servidor
+        "DISABLE_SERVER_SIDE_CURSORS": True,
+    }
+}
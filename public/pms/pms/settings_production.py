@@ -0,0 +1,112 @@
+"""
+Perfil de producción.
+
+Se activa con DJANGO_SETTINGS_MODULE=pms.settings_production y parte de
+pms/settings.py. Agrega un backend de caché real, sesiones cacheadas y
+el usuario de la sesión en la caché, de modo que un request autenticado
+no consulta django_session ni auth_user (ver el comando
+benchmark_sessions).
+
+Backends de caché (variable CACHE_BACKEND):
+
+- "file" (por defecto): FileBasedCache en CACHE_LOCATION, compartido por
+  todos los workers del mismo host.
+- "locmem": LocMemCache, solo para un único proceso.
+- "redis": RedisCache en REDIS_URL (requiere el paquete redis). En
+  desarrollo puede usarse el servicio redis de docker-compose.dev.yml
+  (`docker compose --profile redis up`).
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import AUTHENTICATION_BACKENDS, DATABASES, DB_POOL, LOGGING, os
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost").split(",")
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "file")
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL", "redis://redis:6379/1"),
+            "KEY_PREFIX": "pms",
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pms",
+            "OPTIONS": {"MAX_ENTRIES": 10_000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", "/var/tmp/pms_cache"),
+            "OPTIONS": {"MAX_ENTRIES": 10_000},
+        }
+    }
+
+# Estáticos con el hash del contenido en el nombre y versiones .gz/.br
+# generadas por collectstatic (pms.storage), que nginx sirve con caché
+# sin vencimiento. Requiere ejecutar collectstatic antes de servir
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "pms.storage.CompressedManifestStaticFilesStorage"
+    },  # noqa
+}
+
+# La sesión se lee de la caché y solo se consulta la base de datos si no
+# está cacheada; las escrituras siguen persistiendo en django_session
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# El usuario de la sesión se toma de la caché (accounts.backends)
+AUTHENTICATION_BACKENDS = [
+    (
+        "accounts.backends.CachedModelBackend"
+        if backend == "django.contrib.auth.backends.ModelBackend"
+        else backend
+    )
+    for backend in AUTHENTICATION_BACKENDS
+]
+
+# Los intentos de login se registran en la caché en lugar de la base de
+# datos. django-axes solo lo admite con una caché compartida y atómica
+# (Redis); con file o locmem se mantiene el registro en la base de datos
+if CACHE_BACKEND == "redis":
+    AXES_HANDLER = "axes.handlers.cache.AxesCacheHandler"
+
+# Conexiones persistentes a PostgreSQL con verificación antes de reusarlas.
+# Con ASGI (SERVER_MODE=asgi, ver gunicorn.conf.py) Django recomienda no
+# usarlas: cada request async puede correr en un hilo distinto. Con el pool
+# de psycopg 3 (DB_POOL=1) tampoco: las conexiones se reutilizan del pool
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi")
+CONN_MAX_AGE = int(os.environ.get("CONN_MAX_AGE", 60))
+if SERVER_MODE == "asgi" or DB_POOL:
+    CONN_MAX_AGE = 0
+DATABASES = {
+    "default": {
+        **DATABASES["default"],
+        "CONN_MAX_AGE": CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Sin DEBUG, Django no muestra los errores de las vistas: se envían a la
+# salida de error para que queden en el log de gunicorn
+LOGGING = {
+    **LOGGING,
+    "handlers": {
+        **LOGGING["handlers"],
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        **LOGGING["loggers"],
+        "django": {"handlers": ["console"], "level": "ERROR"},
+    },
+}
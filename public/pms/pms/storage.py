@@ -0,0 +1,57 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+# Extensiones de texto que vale la pena comprimir; las imágenes y fuentes
+# ya vienen comprimidas
+COMPRESS_EXTENSIONS = (".css", ".js", ".map", ".svg", ".json", ".txt", ".html")
+
+# Archivos más chicos no compensan la compresión
+COMPRESS_MIN_SIZE = 512
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Archivos estáticos con el hash del contenido en el nombre y versiones
+    precomprimidas.
+
+    Además de lo que hace ManifestStaticFilesStorage (copiar cada archivo
+    con su hash, p. ej. css/styles.55e7cbb9ba48.css, y reescribir las
+    referencias entre archivos), collectstatic genera junto a cada archivo
+    de texto un .gz y, si está instalado el paquete brotli, un .br. nginx
+    los sirve directamente (gzip_static, ver docker/nginx/default.conf)
+    sin comprimir en cada request, y como el nombre cambia con el
+    contenido se pueden cachear sin vencimiento.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in [*paths, *self.hashed_files.values()]:
+            if name.endswith(COMPRESS_EXTENSIONS) and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        """Guarda name.gz (y name.br) si son más chicos que el original."""
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < COMPRESS_MIN_SIZE:
+            return
+
+        # mtime=0: el .gz no cambia si no cambia el archivo
+        compressed = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed[".br"] = brotli.compress(content)
+
+        for extension, data in compressed.items():
+            if self.exists(name + extension):
+                self.delete(name + extension)
+            if len(data) < len(content):
+                self._save(name + extension, ContentFile(data))
@@ -0,0 +1,64 @@
+import logging
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from pms.middleware import QueryBudgetExceeded, get_query_budget
+from rooms.models import Property
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin", password="secret123"
+        )  # noqa
+        self.client.force_login(self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("dashboard"))
+        timing = response["Server-Timing"]
+        self.assertRegex(
+            timing, r'^db;dur=[\d.]+;desc="\d+ queries", total;dur=[\d.]+$'
+        )  # noqa
+
+    def test_logs_metrics_per_view(self):
+        logger = logging.getLogger("pms.queries")
+        with self.assertLogs(logger, level="INFO") as logs:
+            self.client.get(reverse("dashboard"))
+        self.assertIn("view=dashboard", logs.output[0])
+        self.assertEqual(logs.records[0].status, 200)
+        self.assertGreater(logs.records[0].queries, 0)
+
+    @override_settings(QUERY_BUDGETS={"dashboard": 1})
+    def test_exceeding_the_budget_fails_in_strict_mode(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("dashboard"))
+
+    @override_settings(
+        QUERY_BUDGETS={"dashboard": 1}, QUERY_BUDGET_STRICT=False
+    )  # noqa
+    def test_exceeding_the_budget_only_warns_outside_tests(self):
+        with self.assertLogs("pms.queries", level="WARNING") as logs:
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("budget: 1", logs.output[0])
+
+    @override_settings(
+        QUERY_BUDGETS={"admin:*_changelist": 15, "dashboard": 10},
+        QUERY_BUDGET_DEFAULT=None,
+    )
+    def test_budget_patterns(self):
+        self.assertEqual(
+            get_query_budget("admin:payments_payment_changelist"), 15
+        )  # noqa
+        self.assertEqual(get_query_budget("dashboard"), 10)
+        self.assertIsNone(get_query_budget("booking_calendar"))
+
+    def test_dashboard_stays_within_budget_with_many_properties(self):
+        Property.objects.bulk_create(
+            Property(name=f"Hostel {i}", property_type="HOSTEL")
+            for i in range(30)  # noqa
+        )
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
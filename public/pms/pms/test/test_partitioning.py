@@ -0,0 +1,232 @@
+import gzip
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import skipIf
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from bookings.models import Booking
+from bookings.test.test_overlap_constraint import create_unit_and_guest
+from payments.models import Payment
+from pms import partitioning
+
+
+def partition_of(model, pk):
+    """Tabla física (partición) en la que está la fila."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {model._meta.db_table} "
+            "WHERE id = %s",
+            [pk],
+        )
+        return cursor.fetchone()[0]
+
+
+@skipIf(settings.DB_PARTITIONING, "Las migraciones ya particionaron")
+class PartitioningTest(TestCase):
+    """
+    Convierte las tablas dentro de la transacción de cada prueba: el DDL
+    de PostgreSQL es transaccional y se revierte al terminar.
+    """
+
+    def setUp(self):
+        self.unit, self.guest = create_unit_and_guest()
+        self.today = date.today()
+        # Las reservas pasadas no pasan por Booking.save()
+        self.past = Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=self.guest,
+                    unit=self.unit,
+                    check_in_date=date(self.today.year - 4, 3, 1),
+                    check_out_date=date(self.today.year - 4, 3, 3),
+                    status="CHECKED_OUT",
+                    total_price=Decimal("40.00"),
+                )
+            ]
+        )[0]
+        self.booking = self.book(self.today + timedelta(days=1))
+        self.payment = Payment.objects.create(
+            booking=self.booking,
+            amount=Decimal("10.00"),
+            status="COMPLETED",
+            created_by=User.objects.create_user(username="staff"),
+        )
+
+    def book(self, check_in, nights=2):
+        booking = Booking(
+            guest=self.guest,
+            unit=self.unit,
+            check_in_date=check_in,
+            check_out_date=check_in + timedelta(days=nights),
+            total_price=Decimal("40.00"),
+        )
+        booking.save()
+        return booking
+
+    def partition(self, interval="yearly", months=partitioning.AHEAD_MONTHS):
+        dropped = []
+        with connection.schema_editor() as schema_editor:
+            for model in (Booking, Payment):
+                dropped += partitioning.partition_table(
+                    schema_editor, model, interval, months
+                )
+        return dropped
+
+    def test_convert(self):
+        dropped = self.partition()
+
+        self.assertTrue(partitioning.is_partitioned("bookings_booking"))
+        self.assertTrue(partitioning.is_partitioned("payments_payment"))
+        # Claves foráneas hacia las tablas particionadas
+        self.assertEqual(
+            sorted(name.split(".")[0] for name in dropped),
+            [
+                "bookings_unitnight",
+                "payments_cashregisterentry",
+                "payments_payment",
+            ],
+        )
+        names = [name for name, _, _ in partitioning.partitions(Booking)]
+        self.assertEqual(names[0], f"bookings_booking_p{self.today.year - 4}")
+        self.assertEqual(partition_of(Booking, self.past.pk), names[0])
+
+        # Las filas y las secuencias se conservan
+        self.assertEqual(Booking.objects.count(), 2)
+        self.assertEqual(self.booking.payments.get(), self.payment)
+        booking = self.book(self.today + timedelta(days=10))
+        self.assertGreater(booking.pk, self.booking.pk)
+
+    def test_overlaps_are_rejected_within_and_across_partitions(self):
+        self.partition(months=36)
+        with self.assertRaises(ValidationError):
+            self.book(self.today + timedelta(days=2))
+
+        year = self.today.year + 1
+        self.book(date(year, 12, 30), nights=3)
+        with self.assertRaises(ValidationError):
+            self.book(date(year + 1, 1, 1))
+        self.assertEqual(Booking.objects.count(), 3)
+
+    def test_orm_cascade_without_foreign_keys(self):
+        self.partition(interval="monthly")
+        self.booking.delete()
+        self.assertFalse(Payment.objects.exists())
+
+    def test_create_partitions_moves_rows_from_default(self):
+        self.partition(months=0)
+        booking = self.book(self.today + timedelta(days=400))
+        self.assertEqual(
+            partition_of(Booking, booking.pk), "bookings_booking_default"
+        )  # noqa
+
+        with connection.schema_editor() as schema_editor:
+            created = partitioning.create_partitions(
+                schema_editor, Booking, months=24
+            )  # noqa
+        self.assertEqual(len(created), 2)
+        self.assertEqual(
+            partition_of(Booking, booking.pk),
+            f"bookings_booking_p{booking.check_in_date.year}",
+        )
+        with self.assertRaises(ValidationError):
+            self.book(booking.check_in_date)
+
+    def test_detach_and_archive(self):
+        self.partition()
+        before = partitioning.add_months(self.today, -24)
+        with tempfile.TemporaryDirectory() as archive:
+            with connection.schema_editor() as schema_editor:
+                detached, kept = partitioning.detach_partitions(
+                    schema_editor, Booking, before, archive
+                )
+            # Las de hace cuatro y tres años terminan antes del límite
+            name = f"bookings_booking_p{self.today.year - 4}"
+            self.assertEqual(
+                detached, [name, f"bookings_booking_p{self.today.year - 3}"]
+            )
+            self.assertEqual(kept, [])
+            with gzip.open(Path(archive, f"{name}.csv.gz"), "rt") as file:
+                rows = file.read().splitlines()
+
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[1].startswith(f"{self.past.pk},"))
+        self.assertFalse(Booking.objects.filter(pk=self.past.pk).exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_detach_keeps_partitions_in_use(self):
+        user = User.objects.get(username="staff")
+        # Reserva vieja todavía pendiente y pago de una reserva pasada
+        pending = Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=self.guest,
+                    unit=self.unit,
+                    check_in_date=date(self.today.year - 3, 5, 1),
+                    check_out_date=date(self.today.year - 3, 5, 3),
+                    status="PENDING",
+                    total_price=Decimal("40.00"),
+                )
+            ]
+        )[0]
+        payment = Payment.objects.create(
+            booking=self.past,
+            amount=Decimal("40.00"),
+            status="COMPLETED",
+            created_by=user,
+        )
+        Payment.objects.filter(pk=payment.pk).update(
+            payment_date=self.past.check_in_date.isoformat() + "T12:00:00Z"
+        )
+        self.partition()
+        before = partitioning.add_months(self.today, -24)
+
+        with connection.schema_editor() as schema_editor:
+            detached, kept = partitioning.detach_partitions(
+                schema_editor, Booking, before
+            )
+            self.assertEqual(detached, [])
+            self.assertEqual(
+                kept,
+                [
+                    f"bookings_booking_p{self.today.year - 4}",
+                    f"bookings_booking_p{self.today.year - 3}",
+                ],
+            )
+            # El pago viejo es de una reserva que sigue en la tabla; la
+            # partición vacía del año siguiente sí se separa
+            detached, kept = partitioning.detach_partitions(
+                schema_editor, Payment, before
+            )
+            self.assertEqual(
+                detached, [f"payments_payment_p{self.today.year - 3}"]
+            )  # noqa
+            self.assertEqual(kept, [f"payments_payment_p{self.today.year - 4}"])  # noqa
+
+        self.assertTrue(Booking.objects.filter(pk=pending.pk).exists())
+        self.assertEqual(Payment.objects.get(pk=payment.pk).booking, self.past)
+
+    def test_command(self):
+        output = StringIO()
+        call_command("partitions", stdout=output)
+        self.assertIn("bookings_booking: sin particionar", output.getvalue())
+
+        with override_settings(DB_PARTITIONING="yearly"):
+            call_command("partitions", "convert", stdout=StringIO())
+        output = StringIO()
+        call_command("partitions", "status", stdout=output)
+        self.assertIn(
+            f"bookings_booking: 6 particiones (bookings_booking_p"
+            f"{self.today.year - 4} a bookings_booking_p{self.today.year + 1})",  # noqa
+            output.getvalue(),
+        )
@@ -0,0 +1,109 @@
+import importlib
+import os
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+def load_production(**env):
+    with mock.patch.dict(os.environ, env):
+        from pms import settings_production
+
+        return importlib.reload(settings_production)
+
+
+def load_profiles(**env):
+    """Recarga pms/settings.py y los perfiles que parten de él."""
+    from pms import settings as base
+    from pms import settings_pgbouncer, settings_production
+
+    with mock.patch.dict(os.environ, env):
+        return [
+            importlib.reload(module)
+            for module in (base, settings_production, settings_pgbouncer)
+        ]
+
+
+class ProductionSettingsTest(SimpleTestCase):
+    def test_defaults(self):
+        production = load_production(CACHE_BACKEND="file", SERVER_MODE="wsgi")
+        self.assertFalse(production.DEBUG)
+        self.assertEqual(
+            production.CACHES["default"]["BACKEND"],
+            "django.core.cache.backends.filebased.FileBasedCache",
+        )
+        self.assertEqual(
+            production.SESSION_ENGINE,
+            "django.contrib.sessions.backends.cached_db",
+        )
+        self.assertIn(
+            "accounts.backends.CachedModelBackend",
+            production.AUTHENTICATION_BACKENDS,
+        )
+        self.assertNotIn(
+            "django.contrib.auth.backends.ModelBackend",
+            production.AUTHENTICATION_BACKENDS,
+        )
+        self.assertFalse(hasattr(production, "AXES_HANDLER"))
+        self.assertEqual(production.DATABASES["default"]["CONN_MAX_AGE"], 60)
+        self.assertTrue(production.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+
+    def test_redis_uses_axes_cache_handler(self):
+        production = load_production(CACHE_BACKEND="redis")
+        self.assertEqual(
+            production.AXES_HANDLER, "axes.handlers.cache.AxesCacheHandler"
+        )
+
+    def test_asgi_disables_persistent_connections(self):
+        production = load_production(SERVER_MODE="asgi")
+        self.assertEqual(production.DATABASES["default"]["CONN_MAX_AGE"], 0)
+
+    def test_base_settings_untouched(self):
+        load_production(SERVER_MODE="wsgi")
+        self.assertFalse(settings.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("django", settings.LOGGING["loggers"])
+
+
+class DatabaseSettingsTest(SimpleTestCase):
+    def setUp(self):
+        # Vuelve a cargar los módulos con las variables de entorno reales
+        self.addCleanup(load_profiles)
+
+    def test_defaults(self):
+        base, production, pgbouncer = load_profiles()
+        self.assertEqual(base.DATABASES["default"]["CONN_MAX_AGE"], 0)
+        self.assertFalse(base.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("OPTIONS", base.DATABASES["default"])
+
+    def test_persistent_connections(self):
+        base, production, pgbouncer = load_profiles(
+            CONN_MAX_AGE="120", CONN_HEALTH_CHECKS="1"
+        )
+        self.assertEqual(base.DATABASES["default"]["CONN_MAX_AGE"], 120)
+        self.assertTrue(base.DATABASES["default"]["CONN_HEALTH_CHECKS"])
+
+    def test_pool(self):
+        base, production, pgbouncer = load_profiles(
+            DB_POOL="1", DB_POOL_MAX_SIZE="4", CONN_MAX_AGE="60"
+        )
+        for module in (base, production):
+            database = module.DATABASES["default"]
+            self.assertEqual(database["CONN_MAX_AGE"], 0)
+            self.assertEqual(
+                database["OPTIONS"]["pool"],
+                {"min_size": 2, "max_size": 4, "timeout": 10},
+            )
+
+    def test_pgbouncer(self):
+        base, production, pgbouncer = load_profiles(
+            SERVER_MODE="wsgi", PGBOUNCER_HOST="127.0.0.1"
+        )
+        database = pgbouncer.DATABASES["default"]
+        self.assertEqual(database["HOST"], "127.0.0.1")
+        self.assertEqual(database["PORT"], "6432")
+        self.assertTrue(database["DISABLE_SERVER_SIDE_CURSORS"])
+        self.assertEqual(database["CONN_MAX_AGE"], 60)
+        self.assertNotIn(
+            "DISABLE_SERVER_SIDE_CURSORS", production.DATABASES["default"]
+        )  # noqa
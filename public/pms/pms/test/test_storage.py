@@ -0,0 +1,63 @@
+import gzip
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from pms import storage
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "pms.storage.CompressedManifestStaticFilesStorage"
+    },  # noqa
+}
+
+
+class CompressedManifestStaticFilesStorageTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls.root.cleanup)
+        cls.enterClassContext(
+            override_settings(STATIC_ROOT=cls.root.name, STORAGES=STORAGES)
+        )
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def path(self, name):
+        return Path(self.root.name, name)
+
+    def test_hashed_urls(self):
+        url = staticfiles_storage.url("css/styles.css")
+        self.assertRegex(url, r"^/static/css/styles\.[0-9a-f]{12}\.css$")
+        self.assertTrue(self.path(url.removeprefix("/static/")).exists())
+
+    def test_gzip_siblings(self):
+        name = staticfiles_storage.stored_name("css/bootstrap.min.css")
+        original = self.path(name).read_bytes()
+        compressed = self.path(name + ".gz").read_bytes()
+        self.assertLess(len(compressed), len(original))
+        self.assertEqual(gzip.decompress(compressed), original)
+        self.assertTrue(self.path("css/bootstrap.min.css.gz").exists())
+
+    def test_brotli_siblings(self):
+        name = staticfiles_storage.stored_name("js/vue.runtime.global.prod.js")
+        sibling = self.path(name + ".br")
+        if storage.brotli is None:
+            self.assertFalse(sibling.exists())
+        else:
+            self.assertEqual(
+                storage.brotli.decompress(sibling.read_bytes()),
+                self.path(name).read_bytes(),
+            )
+
+    def test_skips_binary_and_small_files(self):
+        for path in Path(self.root.name).rglob("*.gz"):
+            original = path.with_suffix("")
+            self.assertTrue(original.name.endswith(storage.COMPRESS_EXTENSIONS))  # noqa
+            self.assertGreaterEqual(
+                original.stat().st_size, storage.COMPRESS_MIN_SIZE
+            )  # noqa
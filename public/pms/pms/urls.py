@@ -7,4 +7,7 @@ from accounts import urls  # noqa
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("accounts.urls")),
+    path("bookings/", include("bookings.urls")),
+    path("reports/", include("reports.urls")),
+    path("api/v1/", include("api.urls")),
 ]
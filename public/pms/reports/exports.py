@@ -0,0 +1,167 @@
+import csv
+from datetime import datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from bookings.models import Booking
+from payments.models import CashRegisterEntry, Payment
+from pms.pgcopy import copy_to
+
+# Tamaño de los lotes leídos del cursor del servidor (o de las páginas,
+# sin cursores del servidor)
+CHUNK_SIZE = 2000
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time()))
+
+
+def _between(field, start, end):
+    """Filtro por rango de días [start, end] sobre un campo fecha/hora."""
+    filters = {}
+    if start:
+        filters[f"{field}__gte"] = _day_start(start)
+    if end:
+        filters[f"{field}__lt"] = _day_start(end + timedelta(days=1))
+    return filters
+
+
+def _payments(start, end):
+    return Payment.objects.filter(**_between("payment_date", start, end))
+
+
+def _cash(start, end):
+    return CashRegisterEntry.objects.filter(
+        **_between("created_at", start, end)
+    )  # noqa
+
+
+def _bookings(start, end):
+    filters = {}
+    if start:
+        filters["check_in_date__gte"] = start
+    if end:
+        filters["check_in_date__lte"] = end
+    return Booking.objects.filter(**filters)
+
+
+# Exportaciones disponibles: consulta por rango de fechas y columnas
+# (encabezado, campo)
+EXPORTS = {
+    "payments": (
+        _payments,
+        [
+            ("pago", "id"),
+            ("fecha", "payment_date"),
+            ("reserva", "booking_id"),
+            ("huesped", "booking__guest__name"),
+            ("tipo", "payment_type"),
+            ("metodo", "payment_method"),
+            ("estado", "status"),
+            ("monto", "amount"),
+            ("pago_original", "original_payment_id"),
+            ("transaccion", "transaction_id"),
+            ("usuario", "created_by__username"),
+        ],
+    ),
+    "cash": (
+        _cash,
+        [
+            ("movimiento", "id"),
+            ("fecha", "created_at"),
+            ("tipo", "entry_type"),
+            ("monto", "amount"),
+            ("saldo", "balance"),
+            ("pago", "payment_id"),
+            ("descripcion", "description"),
+        ],
+    ),
+    "bookings": (
+        _bookings,
+        [
+            ("reserva", "id"),
+            ("huesped", "guest__name"),
+            ("documento", "guest__document_number"),
+            ("propiedad", "unit__room__property__name"),
+            ("habitacion", "unit__room__name"),
+            ("unidad", "unit__name"),
+            ("entrada", "check_in_date"),
+            ("salida", "check_out_date"),
+            ("estado", "status"),
+            ("precio_total", "total_price"),
+        ],
+    ),
+}
+
+
+def export_queryset(kind, start=None, end=None):
+    """Consulta de la exportación, ordenada por id y con los encabezados
+    como alias de columna."""
+    queryset, columns = EXPORTS[kind]
+    return (
+        queryset(start, end)
+        .order_by("pk")
+        .values(**{header: F(field) for header, field in columns})
+    )
+
+
+class Echo:
+    """Pseudo-archivo que devuelve lo escrito (para csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _format(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat()
+    return value
+
+
+def _pages(queryset, headers, chunk_size):
+    """
+    Filas de `queryset` en páginas de `chunk_size` por id, una consulta
+    corta por página: cada una toma la conexión solo mientras se ejecuta.
+    """
+    rows = queryset.values(*headers, "pk")
+    last = None
+    while True:
+        page = rows if last is None else rows.filter(pk__gt=last)
+        page = list(page[:chunk_size])
+        yield from page
+        if len(page) < chunk_size:
+            return
+        last = page[-1]["pk"]
+
+
+def export_rows(kind, start=None, end=None, chunk_size=CHUNK_SIZE):
+    """
+    Genera las líneas CSV de una exportación con memoria constante.
+
+    Las filas se leen con un cursor del servidor de a `chunk_size` con
+    QuerySet.iterator(), por lo que nunca se cargan todas a la vez. Sin
+    cursores del servidor (DISABLE_SERVER_SIDE_CURSORS, detrás de
+    pgbouncer) iterator() traería todo el resultado de una vez; en ese
+    caso se lee por páginas de `chunk_size` ordenadas por id.
+    """
+    headers = [header for header, _ in EXPORTS[kind][1]]
+    queryset = export_queryset(kind, start, end)
+    if connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        rows = _pages(queryset, headers, chunk_size)
+    else:
+        rows = queryset.iterator(chunk_size=chunk_size)
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_format(row[header]) for header in headers])
+
+
+def copy_export(kind, output, start=None, end=None):
+    """Escribe la exportación en `output` con COPY TO del lado del servidor.
+
+    Las fechas con hora se escriben en UTC (zona de la conexión).
+    """
+    copy_to(export_queryset(kind, start, end), output)
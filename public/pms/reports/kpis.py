@@ -0,0 +1,511 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from bookings.models import Booking, UnitNight
+from payments.models import ArchivedCashRegisterEntry, CashRegisterEntry
+from rooms.models import Property, Room, Unit
+
+from .models import BookingKPI, DailyKPI, PropertyKPI
+
+# Días hacia atrás que se promedian en el dashboard
+PERIOD_DAYS = 30
+
+# Unidades activas por propiedad
+UNITS_SQL = """
+    SELECT r.property_id, COUNT(*) AS units
+    FROM {units} un JOIN {rooms} r ON r.id = un.room_id
+    WHERE un.is_active AND r.is_active
+    GROUP BY r.property_id
+"""
+
+REFRESH_SQL = """
+    INSERT INTO {kpis} (
+        property_id, date, units, occupied, revenue, arrivals, departures,
+        updated_at
+    )
+    SELECT
+        p.id,
+        day::date,
+        COALESCE(u.units, 0),
+        COALESCE(n.occupied, 0),
+        COALESCE(n.revenue, 0),
+        COALESCE(m.arrivals, 0),
+        COALESCE(m.departures, 0),
+        NOW()
+    FROM {properties} p
+    CROSS JOIN generate_series(%(start)s, %(end)s, interval '1 day') AS day
+    LEFT JOIN ({units_by_property}) u ON u.property_id = p.id
+    LEFT JOIN (
+        SELECT
+            r.property_id,
+            n.date,
+            COUNT(*) AS occupied,
+            SUM(
+                ROUND(b.total_price / (b.check_out_date - b.check_in_date), 2)
+            ) AS revenue
+        FROM {nights} n
+        JOIN {bookings} b ON b.id = n.booking_id
+        JOIN {units} un ON un.id = n.unit_id
+        JOIN {rooms} r ON r.id = un.room_id
+        WHERE n.date BETWEEN %(start)s AND %(end)s
+        GROUP BY r.property_id, n.date
+    ) n ON n.property_id = p.id AND n.date = day::date
+    LEFT JOIN (
+        SELECT property_id, date, SUM(arrival) AS arrivals,
+            SUM(1 - arrival) AS departures
+        FROM (
+            SELECT r.property_id, b.check_in_date AS date, 1 AS arrival
+            FROM {bookings} b
+            JOIN {units} un ON un.id = b.unit_id
+            JOIN {rooms} r ON r.id = un.room_id
+            WHERE b.status <> 'CANCELLED'
+                AND b.check_in_date BETWEEN %(start)s AND %(end)s
+            UNION ALL
+            SELECT r.property_id, b.check_out_date, 0
+            FROM {bookings} b
+            JOIN {units} un ON un.id = b.unit_id
+            JOIN {rooms} r ON r.id = un.room_id
+            WHERE b.status <> 'CANCELLED'
+                AND b.check_out_date BETWEEN %(start)s AND %(end)s
+        ) moves
+        GROUP BY property_id, date
+    ) m ON m.property_id = p.id AND m.date = day::date
+    {where}
+    ON CONFLICT (property_id, date) DO UPDATE SET
+        units = EXCLUDED.units,
+        occupied = EXCLUDED.occupied,
+        revenue = EXCLUDED.revenue,
+        arrivals = EXCLUDED.arrivals,
+        departures = EXCLUDED.departures,
+        updated_at = EXCLUDED.updated_at
+"""
+
+# Suma diferencias a los indicadores diarios: actualiza las filas que
+# existen e inserta el resto (sin bajar de cero) con las unidades activas
+DELTA_SQL = """
+    WITH delta AS (
+        SELECT * FROM unnest(
+            %(properties)s::bigint[], %(dates)s::date[],
+            %(occupied)s::integer[], %(revenue)s::numeric[],
+            %(arrivals)s::integer[], %(departures)s::integer[]
+        ) AS d(property_id, date, occupied, revenue, arrivals, departures)
+    ),
+    updated AS (
+        UPDATE {kpis} k SET
+            occupied = GREATEST(k.occupied + d.occupied, 0),
+            revenue = k.revenue + d.revenue,
+            arrivals = GREATEST(k.arrivals + d.arrivals, 0),
+            departures = GREATEST(k.departures + d.departures, 0),
+            updated_at = NOW()
+        FROM delta d
+        WHERE k.property_id = d.property_id AND k.date = d.date
+        RETURNING k.property_id, k.date
+    )
+    INSERT INTO {kpis} (
+        property_id, date, units, occupied, revenue, arrivals, departures,
+        updated_at
+    )
+    SELECT
+        d.property_id,
+        d.date,
+        COALESCE(u.units, 0),
+        GREATEST(d.occupied, 0),
+        GREATEST(d.revenue, 0),
+        GREATEST(d.arrivals, 0),
+        GREATEST(d.departures, 0),
+        NOW()
+    FROM delta d
+    LEFT JOIN ({units_by_property}) u ON u.property_id = d.property_id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM updated x
+        WHERE x.property_id = d.property_id AND x.date = d.date
+    )
+    ON CONFLICT (property_id, date) DO UPDATE SET
+        occupied = {kpis}.occupied + EXCLUDED.occupied,
+        revenue = {kpis}.revenue + EXCLUDED.revenue,
+        arrivals = {kpis}.arrivals + EXCLUDED.arrivals,
+        departures = {kpis}.departures + EXCLUDED.departures,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def _units_by_property():
+    return UNITS_SQL.format(
+        units=Unit._meta.db_table, rooms=Room._meta.db_table
+    )  # noqa
+
+
+def refresh_daily_kpis(start_date, end_date, properties=None):
+    """
+    Recalcula los indicadores diarios de [start_date, end_date] (inclusive).
+
+    Ocupación e ingresos se leen del inventario por noche (UnitNight) y las
+    llegadas/salidas de las reservas no canceladas, en una única sentencia
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE. El ingreso de cada noche
+    es el precio total de la reserva dividido por su cantidad de noches.
+
+    Args:
+        properties (list, optional): IDs de propiedades a recalcular. Si no
+            se indica, se recalculan todas.
+
+    Returns:
+        int: Cantidad de filas insertadas o actualizadas
+    """
+    if start_date > end_date:
+        return 0
+
+    sql = REFRESH_SQL.format(
+        kpis=DailyKPI._meta.db_table,
+        properties=Property._meta.db_table,
+        units_by_property=_units_by_property(),
+        units=Unit._meta.db_table,
+        rooms=Room._meta.db_table,
+        nights=UnitNight._meta.db_table,
+        bookings=Booking._meta.db_table,
+        where=(
+            "WHERE p.id = ANY(%(properties)s)" if properties is not None else ""  # noqa
+        ),  # noqa
+    )
+    params = {
+        "start": start_date,
+        "end": end_date,
+        "properties": list(properties or []),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def refresh_property_kpis(properties=None):
+    """
+    Recalcula el saldo pendiente de cobro y el saldo de caja por propiedad
+    sobre todo su historial. Los cambios puntuales se aplican como
+    diferencias con apply_booking_kpis; esto queda para rebuild_kpis.
+
+    Args:
+        properties (list, optional): IDs de propiedades a recalcular. Si no
+            se indica, se recalculan todas.
+    """
+    if properties is None:
+        properties = Property.objects.values_list("pk", flat=True)
+
+    for property_id in properties:
+        pending = (
+            Booking.objects.filter(unit__room__property_id=property_id)
+            .exclude(status="CANCELLED")
+            .with_payment_summary()
+            .filter(pending_debt__gt=0)
+            .aggregate(bookings=Count("pk"), amount=Sum("pending_debt"))
+        )
+        # Los movimientos archivados (ver payments.archive) siguen sumando
+        # al saldo de caja de la propiedad
+        cash_balance = 0
+        for model in (CashRegisterEntry, ArchivedCashRegisterEntry):
+            cash = model.objects.filter(
+                payment__booking__unit__room__property_id=property_id
+            ).aggregate(
+                balance=Sum(
+                    Case(
+                        When(entry_type="DEPOSIT", then=F("amount")),
+                        default=-F("amount"),
+                    )
+                )
+            )
+            cash_balance += cash["balance"] or 0
+        PropertyKPI.objects.update_or_create(
+            property_id=property_id,
+            defaults={
+                "pending_bookings": pending["bookings"],
+                "pending_amount": pending["amount"] or 0,
+                "cash_balance": cash_balance,
+            },
+        )
+
+
+def _booking_kpis(bookings):
+    """
+    Aporte actual de cada reserva de `bookings`, como filas de BookingKPI
+    sin guardar.
+    """
+    money = DecimalField(max_digits=12, decimal_places=2)
+    cash = (
+        CashRegisterEntry.objects.filter(payment__booking=OuterRef("pk"))
+        .order_by()
+        .values("payment__booking")
+        .annotate(
+            total=Sum(
+                Case(
+                    When(entry_type="DEPOSIT", then=F("amount")),
+                    default=-F("amount"),
+                )
+            )
+        )
+        .values("total")
+    )
+    rows = (
+        bookings.with_payment_summary()
+        .annotate(cash=Coalesce(Subquery(cash), Value(0), output_field=money))  # noqa
+        .order_by()
+        .values_list(
+            "pk",
+            "unit__room__property_id",
+            "check_in_date",
+            "check_out_date",
+            "status",
+            "total_price",
+            "pending_debt",
+            "cash",
+        )
+        .iterator(chunk_size=2000)
+    )
+    for pk, property_id, check_in, check_out, status, total, debt, cash in rows:  # noqa
+        counted = status != "CANCELLED"
+        yield BookingKPI(
+            booking_id=pk,
+            property_id=property_id,
+            check_in_date=check_in,
+            check_out_date=check_out,
+            counted=counted,
+            total_price=total,
+            pending_debt=debt if counted and debt > 0 else 0,
+            cash_balance=cash,
+        )
+
+
+def _add_contribution(kpi, sign, daily, totals):
+    """
+    Suma (sign=1) o resta (sign=-1) el aporte de una reserva a las
+    diferencias por día y por propiedad, con los mismos criterios que
+    refresh_daily_kpis y refresh_property_kpis.
+    """
+    if kpi.counted:
+        nights = (kpi.check_out_date - kpi.check_in_date).days
+        revenue = (kpi.total_price / nights).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+        for offset in range(nights):
+            day = daily[
+                (kpi.property_id, kpi.check_in_date + timedelta(offset))
+            ]  # noqa
+            day[0] += sign
+            day[1] += sign * revenue
+        daily[(kpi.property_id, kpi.check_in_date)][2] += sign
+        daily[(kpi.property_id, kpi.check_out_date)][3] += sign
+
+    total = totals[kpi.property_id]
+    total[0] += sign * (kpi.pending_debt > 0)
+    total[1] += sign * kpi.pending_debt
+    total[2] += sign * kpi.cash_balance
+
+
+def _apply_daily(daily):
+    daily = {key: delta for key, delta in daily.items() if any(delta)}
+    if not daily:
+        return
+    sql = DELTA_SQL.format(
+        kpis=DailyKPI._meta.db_table, units_by_property=_units_by_property()
+    )
+    keys = sorted(daily)
+    params = {
+        "properties": [property_id for property_id, _ in keys],
+        "dates": [day for _, day in keys],
+        "occupied": [daily[key][0] for key in keys],
+        "revenue": [daily[key][1] for key in keys],
+        "arrivals": [daily[key][2] for key in keys],
+        "departures": [daily[key][3] for key in keys],
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _apply_totals(totals):
+    for property_id, (bookings, amount, cash) in sorted(totals.items()):
+        if not (bookings or amount or cash):
+            continue
+        PropertyKPI.objects.get_or_create(property_id=property_id)
+        PropertyKPI.objects.filter(property_id=property_id).update(
+            pending_bookings=Greatest(F("pending_bookings") + bookings, 0),
+            pending_amount=F("pending_amount") + amount,
+            cash_balance=F("cash_balance") + cash,
+            updated_at=timezone.now(),
+        )
+
+
+def apply_booking_kpis(booking_ids):
+    """
+    Aplica a DailyKPI y PropertyKPI la diferencia entre el aporte actual de
+    las reservas y el registrado en BookingKPI, y actualiza ese registro.
+
+    El costo depende de las reservas que cambiaron (y de sus noches), no
+    del historial de la propiedad. Una reserva borrada resta su aporte; las
+    archivadas (ver payments.archive) se borran sin señales y su aporte,
+    en particular la caja, se mantiene.
+
+    Las reservas y sus filas de BookingKPI se bloquean para que dos
+    transacciones que cambian la misma reserva no apliquen dos veces la
+    misma diferencia.
+    """
+    booking_ids = sorted(set(booking_ids))
+    if not booking_ids:
+        return
+    with transaction.atomic():
+        list(
+            Booking.objects.filter(pk__in=booking_ids)
+            .order_by("pk")
+            .select_for_update()
+            .values_list("pk", flat=True)
+        )
+        previous = BookingKPI.objects.select_for_update().in_bulk(booking_ids)  # noqa
+        current = {
+            kpi.booking_id: kpi
+            for kpi in _booking_kpis(Booking.objects.filter(pk__in=booking_ids))  # noqa
+        }
+
+        fields = [
+            "property_id",
+            "check_in_date",
+            "check_out_date",
+            "counted",
+            "total_price",
+            "pending_debt",
+            "cash_balance",
+        ]
+        daily = defaultdict(lambda: [0, Decimal("0"), 0, 0])
+        totals = defaultdict(lambda: [0, Decimal("0"), Decimal("0")])
+        changed = []
+        for booking_id in booking_ids:
+            old, new = previous.get(booking_id), current.get(booking_id)
+            if (
+                old
+                and new
+                and all(getattr(old, f) == getattr(new, f) for f in fields)  # noqa
+            ):  # noqa
+                continue
+            if old:
+                _add_contribution(old, -1, daily, totals)
+            if new:
+                _add_contribution(new, 1, daily, totals)
+                changed.append(new)
+
+        _apply_daily(daily)
+        _apply_totals(totals)
+        BookingKPI.objects.filter(
+            booking_id__in=set(previous) - set(current)
+        ).delete()  # noqa
+        BookingKPI.objects.bulk_create(
+            changed,
+            update_conflicts=True,
+            unique_fields=["booking"],
+            update_fields=[f.removesuffix("_id") for f in fields],
+        )
+
+
+def refresh_booking_kpis(batch_size=1000):
+    """
+    Vuelve a registrar en BookingKPI el aporte actual de todas las
+    reservas, a la par del recálculo completo de rebuild_kpis.
+
+    Returns:
+        int: Cantidad de reservas registradas
+    """
+    count = 0
+    with transaction.atomic():
+        BookingKPI.objects.all().delete()
+        batch = []
+        for kpi in _booking_kpis(Booking.objects.all()):
+            batch.append(kpi)
+            if len(batch) >= batch_size:
+                count += len(BookingKPI.objects.bulk_create(batch))
+                batch = []
+        count += len(BookingKPI.objects.bulk_create(batch))
+    return count
+
+
+def _ratio(numerator, denominator):
+    if not denominator:
+        return Decimal("0")
+    return (Decimal(numerator) / denominator).quantize(Decimal("0.01"))
+
+
+def dashboard_kpis(today):
+    """
+    Indicadores del dashboard por propiedad activa, leídos de las tablas
+    precalculadas con una cantidad fija de consultas.
+
+    Ocupación, ADR y RevPAR se informan para el día y para los últimos
+    PERIOD_DAYS días; los del período se calculan sobre las unidades
+    activas hoy por PERIOD_DAYS noches.
+
+    Returns:
+        list: Un diccionario por propiedad
+    """
+    # Unidades activas hoy, con el mismo criterio que UNITS_SQL: el
+    # denominador del período no depende de qué días tienen fila en
+    # DailyKPI (las diferencias solo crean los días con reservas)
+    units = Count(
+        "rooms__units",
+        filter=Q(rooms__is_active=True, rooms__units__is_active=True),
+    )
+    properties = list(
+        Property.objects.filter(is_active=True)
+        .select_related("kpi")
+        .annotate(active_units=units)
+        .order_by("name")  # noqa
+    )
+    daily = {
+        kpi.property_id: kpi
+        for kpi in DailyKPI.objects.filter(date=today, property__in=properties)  # noqa
+    }
+    period = {
+        row["property"]: row
+        for row in DailyKPI.objects.filter(
+            date__gt=today - timedelta(days=PERIOD_DAYS),
+            date__lte=today,
+            property__in=properties,
+        )
+        .values("property")
+        .annotate(occupied=Sum("occupied"), revenue=Sum("revenue"))
+    }
+
+    rows = []
+    for prop in properties:
+        day = daily.get(prop.pk) or DailyKPI(property=prop, date=today)
+        month = period.get(prop.pk, {"occupied": 0, "revenue": Decimal("0")})
+        month["units"] = prop.active_units * PERIOD_DAYS
+        summary = getattr(prop, "kpi", None) or PropertyKPI(property=prop)
+        rows.append(
+            {
+                "property": prop,
+                "occupancy": _ratio(day.occupied * 100, day.units),
+                "adr": _ratio(day.revenue, day.occupied),
+                "revpar": _ratio(day.revenue, day.units),
+                "period_occupancy": _ratio(
+                    month["occupied"] * 100, month["units"]
+                ),  # noqa
+                "period_adr": _ratio(month["revenue"], month["occupied"]),
+                "period_revpar": _ratio(month["revenue"], month["units"]),
+                "arrivals": day.arrivals,
+                "departures": day.departures,
+                "pending_bookings": summary.pending_bookings,
+                "pending_amount": summary.pending_amount,
+                "cash_balance": summary.cash_balance,
+            }
+        )
+    return rows
@@ -0,0 +1,93 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reports.kpis import dashboard_kpis
+from reports.models import DailyKPI, PropertyKPI
+from rooms.models import Property
+
+
+class _Rollback(Exception):
+    """Se usa para descartar los datos sembrados al terminar."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra varios años de indicadores diarios y mide el tiempo de "
+        "armado del dashboard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--properties", type=int, default=20)
+        parser.add_argument("--years", type=int, default=5)
+        parser.add_argument("--runs", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Conserva los datos sembrados en lugar de descartarlos",
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                self.seed(options)
+                self.run(options)
+                if not options["keep"]:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write("Datos sembrados descartados.")
+
+    def seed(self, options):
+        today = timezone.localdate()
+        properties = Property.objects.bulk_create(
+            Property(name=f"Bench {i}", property_type="HOSTEL")
+            for i in range(options["properties"])
+        )
+        PropertyKPI.objects.bulk_create(
+            PropertyKPI(property=prop) for prop in properties
+        )
+
+        days = options["years"] * 365
+        for prop in properties:
+            DailyKPI.objects.bulk_create(
+                DailyKPI(
+                    property=prop,
+                    date=today - timedelta(days=offset),
+                    units=40,
+                    occupied=(occupied := random.randint(0, 40)),
+                    revenue=Decimal("20.00") * occupied,
+                    arrivals=random.randint(0, 10),
+                    departures=random.randint(0, 10),
+                )
+                for offset in range(days)
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(
+            f"Sembrados {len(properties) * days} indicadores diarios."
+        )  # noqa
+
+    def run(self, options):
+        today = timezone.localdate()
+        timings = []
+        for _ in range(options["runs"]):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                dashboard_kpis(today)
+                timings.append(time.perf_counter() - start)
+
+        timings.sort()
+        self.stdout.write(
+            f"Dashboard: {len(ctx.captured_queries)} consultas, "
+            f"p50={timings[len(timings) // 2] * 1000:.1f}ms "
+            f"max={timings[-1] * 1000:.1f}ms"
+        )
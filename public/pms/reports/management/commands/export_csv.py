@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from reports.exports import CHUNK_SIZE, EXPORTS, copy_export, export_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Exporta pagos, movimientos de caja o reservas en CSV con memoria "
+        "constante (cursor del servidor o COPY TO)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument("--start", help="Primer día (AAAA-MM-DD)")
+        parser.add_argument("--end", help="Último día (AAAA-MM-DD)")
+        parser.add_argument(
+            "--output",
+            help="Archivo de salida (por defecto, la salida estándar)",  # noqa
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Genera el CSV en el servidor con COPY TO (fechas en UTC)",
+        )
+
+    def handle(self, *args, **options):
+        start = self.parse(options["start"])
+        end = self.parse(options["end"])
+
+        if options["output"]:
+            output = open(options["output"], "w", newline="", encoding="utf-8")  # noqa
+        else:
+            output = self.stdout
+            output.ending = ""
+        try:
+            if options["copy"]:
+                copy_export(options["kind"], output, start, end)
+            else:
+                for line in export_rows(
+                    options["kind"], start, end, options["chunk_size"]
+                ):
+                    output.write(line)
+        finally:
+            if options["output"]:
+                output.close()
+
+    def parse(self, value):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f"Fecha inválida: {value}")
+        return parsed
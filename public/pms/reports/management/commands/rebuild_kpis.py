@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from bookings.models import Booking
+from reports.kpis import (
+    refresh_booking_kpis,
+    refresh_daily_kpis,
+    refresh_property_kpis,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los indicadores diarios y por propiedad del dashboard "
+        "sobre todo el historial (las señales solo aplican diferencias). "
+        "Conviene ejecutarlo a diario para reflejar altas y bajas de "
+        "unidades en los días sin cambios de reservas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            help="Primer día (AAAA-MM-DD). Por defecto, la primera reserva",
+        )
+        parser.add_argument(
+            "--end",
+            help="Último día (AAAA-MM-DD). Por defecto, la última salida",
+        )
+
+    def handle(self, *args, **options):
+        bounds = Booking.objects.aggregate(
+            start=Min("check_in_date"), end=Max("check_out_date")
+        )
+        today = timezone.localdate()
+        start = self.parse(options["start"]) or bounds["start"] or today
+        end = self.parse(options["end"]) or max(
+            bounds["end"] or today, today + timedelta(days=30)
+        )
+
+        with transaction.atomic():
+            rows = refresh_daily_kpis(start, end)
+            refresh_property_kpis()
+            refresh_booking_kpis()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indicadores recalculados: {rows} filas ({start} a {end})."
+            )
+        )
+
+    def parse(self, value):
+        if not value:
+            return None
+        parsed = parse_date(value)
+        if parsed is None:
+            raise CommandError(f"Fecha inválida: {value}")
+        return parsed
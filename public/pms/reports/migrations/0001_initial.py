@@ -0,0 +1,131 @@
+# Generated by Django 5.1.6 on 2026-10-17 03:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PropertyKPI",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "pending_bookings",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Reservas con saldo pendiente"
+                    ),
+                ),
+                (
+                    "pending_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Saldo pendiente de cobro",
+                    ),
+                ),
+                (
+                    "cash_balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Saldo de caja",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "property",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="kpi",
+                        to="rooms.property",
+                        verbose_name="Propiedad",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Indicador de propiedad",
+                "verbose_name_plural": "Indicadores de propiedad",
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyKPI",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Fecha")),
+                (
+                    "units",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Unidades disponibles"
+                    ),
+                ),
+                (
+                    "occupied",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Unidades ocupadas"
+                    ),
+                ),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Ingresos por alojamiento",
+                    ),
+                ),
+                (
+                    "arrivals",
+                    models.PositiveIntegerField(default=0, verbose_name="Llegadas"),
+                ),
+                (
+                    "departures",
+                    models.PositiveIntegerField(default=0, verbose_name="Salidas"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_kpis",
+                        to="rooms.property",
+                        verbose_name="Propiedad",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Indicador diario",
+                "verbose_name_plural": "Indicadores diarios",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("property", "date"), name="unique_property_daily_kpi"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.6 on 2026-10-17 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from reports.kpis import refresh_booking_kpis
+
+
+def register_bookings(apps, schema_editor):
+    # Aporte de las reservas existentes, que ya está sumado en DailyKPI y
+    # PropertyKPI: desde acá las señales aplican solo diferencias
+    refresh_booking_kpis()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_archivedbooking"),
+        ("payments", "0010_archivedpayment_archivedcashregisterentry"),
+        ("reports", "0001_initial"),
+        ("rooms", "0006_alter_room_unique_together"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookingKPI",
+            fields=[
+                (
+                    "booking",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="bookings.booking",
+                        verbose_name="Reserva",
+                    ),
+                ),
+                ("check_in_date", models.DateField(verbose_name="Fecha de entrada")),
+                ("check_out_date", models.DateField(verbose_name="Fecha de salida")),
+                (
+                    "counted",
+                    models.BooleanField(
+                        default=True, verbose_name="Cuenta en ocupación"
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Precio total"
+                    ),
+                ),
+                (
+                    "pending_debt",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Saldo pendiente de cobro",
+                    ),
+                ),
+                (
+                    "cash_balance",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Saldo de caja",
+                    ),
+                ),
+                (
+                    "property",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="rooms.property",
+                        verbose_name="Propiedad",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Aporte de reserva a indicadores",
+                "verbose_name_plural": "Aportes de reservas a indicadores",
+            },
+        ),
+        migrations.RunPython(register_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,166 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from bookings.models import Booking
+from rooms.models import Property
+
+
+class DailyKPI(models.Model):
+    """
+    Indicadores diarios precalculados de una propiedad.
+
+    Se actualizan de forma incremental ante cambios en las reservas (ver
+    reports.kpis.apply_booking_kpis), de modo que el dashboard lee filas
+    ya agregadas en lugar de recorrer todo el historial. El recálculo
+    completo (reports.kpis.refresh_daily_kpis) queda para rebuild_kpis.
+    """
+
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="daily_kpis",
+        verbose_name=_("Propiedad"),
+    )
+
+    date = models.DateField(verbose_name=_("Fecha"))
+
+    units = models.PositiveIntegerField(
+        default=0, verbose_name=_("Unidades disponibles")
+    )
+
+    occupied = models.PositiveIntegerField(
+        default=0, verbose_name=_("Unidades ocupadas")
+    )
+
+    revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Ingresos por alojamiento"),
+    )
+
+    arrivals = models.PositiveIntegerField(
+        default=0, verbose_name=_("Llegadas")
+    )  # noqa
+
+    departures = models.PositiveIntegerField(
+        default=0, verbose_name=_("Salidas")
+    )  # noqa
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Indicador diario")
+        verbose_name_plural = _("Indicadores diarios")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["property", "date"],
+                name="unique_property_daily_kpi",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.property} - {self.date}"
+
+
+class PropertyKPI(models.Model):
+    """
+    Indicadores actuales de una propiedad que no dependen de la fecha:
+    saldo pendiente de cobro y movimientos de caja asociados a sus pagos.
+    """
+
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="kpi",
+        verbose_name=_("Propiedad"),
+    )
+
+    pending_bookings = models.PositiveIntegerField(
+        default=0, verbose_name=_("Reservas con saldo pendiente")
+    )
+
+    pending_amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Saldo pendiente de cobro"),
+    )
+
+    cash_balance = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Saldo de caja"),
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Indicador de propiedad")
+        verbose_name_plural = _("Indicadores de propiedad")
+
+    def __str__(self):
+        return str(self.property)
+
+
+class BookingKPI(models.Model):
+    """
+    Aporte de una reserva a DailyKPI y PropertyKPI tal como se aplicó por
+    última vez.
+
+    Ante un cambio en la reserva o en sus pagos se compara su estado actual
+    con esta fila y se aplica solo la diferencia (ver
+    reports.kpis.apply_booking_kpis). La relación con la reserva no tiene
+    clave foránea en la base, que no admite referencias a una tabla
+    particionada (ver pms/partitioning.py).
+    """
+
+    booking = models.OneToOneField(
+        Booking,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        primary_key=True,
+        related_name="+",
+        verbose_name=_("Reserva"),
+    )
+
+    property = models.ForeignKey(
+        Property,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Propiedad"),
+    )
+
+    check_in_date = models.DateField(verbose_name=_("Fecha de entrada"))
+
+    check_out_date = models.DateField(verbose_name=_("Fecha de salida"))
+
+    counted = models.BooleanField(
+        default=True, verbose_name=_("Cuenta en ocupación")
+    )  # noqa
+
+    total_price = models.DecimalField(
+        max_digits=10, decimal_places=2, verbose_name=_("Precio total")
+    )
+
+    pending_debt = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Saldo pendiente de cobro"),
+    )
+
+    cash_balance = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Saldo de caja"),
+    )
+
+    class Meta:
+        verbose_name = _("Aporte de reserva a indicadores")
+        verbose_name_plural = _("Aportes de reservas a indicadores")
+
+    def __str__(self):
+        return str(self.booking_id)
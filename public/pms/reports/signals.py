@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from bookings.models import Booking
+from bookings.signals import bookings_bulk_changed
+from payments.models import CashRegisterEntry, Payment
+from payments.signals import payments_bulk_changed
+
+from .kpis import apply_booking_kpis
+
+
+def _schedule(booking_ids):
+    """
+    Aplica las diferencias de indicadores de las reservas al confirmarse
+    la transacción, cuando su inventario por noche y sus pagos ya están
+    actualizados.
+    """
+    booking_ids = [pk for pk in booking_ids if pk is not None]
+    if booking_ids:
+        transaction.on_commit(lambda: apply_booking_kpis(booking_ids))
+
+
+def on_booking_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _schedule([instance.pk])
+
+
+def on_payment_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if isinstance(instance, CashRegisterEntry):
+        if not instance.payment_id:
+            return
+        booking_id = (
+            Payment.objects.filter(pk=instance.payment_id)
+            .values_list("booking_id", flat=True)
+            .first()
+        )
+    else:
+        booking_id = instance.booking_id
+    _schedule([booking_id])
+
+
+def on_bookings_bulk_changed(sender, booking_ids, **kwargs):
+    _schedule(booking_ids)
+
+
+def on_payments_bulk_changed(sender, payment_ids, **kwargs):
+    def apply():
+        apply_booking_kpis(
+            Payment.objects.filter(pk__in=payment_ids).values_list(
+                "booking_id", flat=True
+            )
+        )
+
+    transaction.on_commit(apply)
+
+
+def connect_signals():
+    bookings_bulk_changed.connect(
+        on_bookings_bulk_changed, dispatch_uid="kpi_bookings_bulk"
+    )
+    payments_bulk_changed.connect(
+        on_payments_bulk_changed, dispatch_uid="kpi_payments_bulk"
+    )
+    post_save.connect(
+        on_booking_change, sender=Booking, dispatch_uid="kpi_save"
+    )  # noqa
+    post_delete.connect(
+        on_booking_change, sender=Booking, dispatch_uid="kpi_delete"
+    )  # noqa
+    for model in (Payment, CashRegisterEntry):
+        post_save.connect(
+            on_payment_change, sender=model, dispatch_uid=f"kpi_save_{model}"
+        )
+        post_delete.connect(
+            on_payment_change, sender=model, dispatch_uid=f"kpi_delete_{model}"
+        )
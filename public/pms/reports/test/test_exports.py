@@ -0,0 +1,140 @@
+import csv
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import Payment
+from reports.exports import export_rows
+from rooms.models import Property, Room, Unit
+
+
+class ExportsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        prop = Property.objects.create(name="Hostel", property_type="HOSTEL")
+        room = Room.objects.create(
+            property=prop,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=20,
+        )
+        guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        check_in = date.today() + timedelta(days=1)
+        self.bookings = [
+            Booking.objects.create(
+                guest=guest,
+                unit=Unit.objects.create(name=f"{i}", room=room),
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=2),
+                total_price=Decimal("40.00"),
+            )
+            for i in range(3)
+        ]
+        for booking in self.bookings:
+            Payment.objects.create(
+                booking=booking,
+                amount=Decimal("10.00"),
+                payment_method="CASH",
+                status="COMPLETED",
+                created_by=self.user,
+            )
+        # Un pago de otro mes queda fuera del rango exportado
+        Payment.objects.filter(pk=Payment.objects.order_by("pk")[0].pk).update(
+            payment_date="2020-01-15T12:00:00Z"
+        )
+
+    def read(self, content):
+        return list(csv.DictReader(StringIO(content)))
+
+    def test_streaming_endpoint(self):
+        self.client.force_login(self.user)
+        today = date.today()
+        response = self.client.get(
+            reverse("export_csv", args=["payments"]),
+            {"start": today.replace(day=1), "end": today},
+        )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = self.read(b"".join(response.streaming_content).decode())
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["huesped"], "John Doe")
+        self.assertEqual(rows[0]["monto"], "10.00")
+
+    def test_endpoint_requires_staff(self):
+        staff = reverse("export_csv", args=["cash"])
+        self.assertEqual(self.client.get(staff).status_code, 302)
+
+        self.client.force_login(self.user)
+        unknown = reverse("export_csv", args=["guests"])
+        self.assertEqual(self.client.get(unknown).status_code, 404)
+
+    def test_endpoint_rejects_invalid_dates(self):
+        self.client.force_login(self.user)
+        url = reverse("export_csv", args=["payments"])
+        for params in ({"start": "2024-02-30"}, {"end": "ayer"}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_pages_without_server_side_cursors(self):
+        streamed = list(export_rows("bookings", chunk_size=2))
+        settings = {"DISABLE_SERVER_SIDE_CURSORS": True}
+        with mock.patch.dict(connection.settings_dict, settings):
+            # Tres reservas en páginas de dos: una consulta por página
+            with self.assertNumQueries(2):
+                paged = list(export_rows("bookings", chunk_size=2))
+        self.assertEqual(paged, streamed)
+        self.assertEqual(len(paged), 4)
+
+    def test_command_streams_and_copies_the_same_rows(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        streamed = os.path.join(directory.name, "streamed.csv")
+        copied = os.path.join(directory.name, "copied.csv")
+
+        call_command(
+            "export_csv", "cash", "--output", streamed, "--chunk-size", "1"
+        )  # noqa
+        call_command("export_csv", "cash", "--output", copied, "--copy")
+
+        with open(streamed) as first, open(copied) as second:
+            streamed_rows = list(csv.DictReader(first))
+            copied_rows = list(csv.DictReader(second))
+        self.assertEqual(len(streamed_rows), 3)
+        self.assertEqual(
+            [
+                (row["movimiento"], row["monto"], row["saldo"])
+                for row in streamed_rows  # noqa
+            ],  # noqa
+            [
+                (row["movimiento"], row["monto"], row["saldo"])
+                for row in copied_rows  # noqa
+            ],  # noqa
+        )
+
+    def test_command_writes_to_stdout(self):
+        output = StringIO()
+        call_command("export_csv", "bookings", "--copy", stdout=output)
+        rows = self.read(output.getvalue())
+        self.assertEqual(
+            [int(row["reserva"]) for row in rows], [b.pk for b in self.bookings]  # noqa
+        )  # noqa
+        self.assertEqual(rows[0]["propiedad"], "Hostel")
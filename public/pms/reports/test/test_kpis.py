@@ -0,0 +1,220 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings.models import Booking
+from guests.models import Guest
+from payments.models import Payment
+from reports.kpis import dashboard_kpis, refresh_daily_kpis
+from reports.models import DailyKPI, PropertyKPI
+from rooms.models import Property, Room, Unit
+
+
+class DailyKPITest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="admin", password="secret123"
+        )  # noqa
+        self.property = Property.objects.create(
+            name="Hostel Example", property_type="HOSTEL"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            capacity=4,
+            base_price=Decimal("20.00"),
+        )
+        self.units = [
+            Unit.objects.create(name=f"{i}", room=self.room) for i in range(4)
+        ]
+        self.guest = Guest.objects.create(
+            name="John Doe", document_type="DNI", document_number="12345678"
+        )
+        self.today = timezone.localdate()
+
+    def book(self, unit, check_in, nights, total, status="CONFIRMED"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                guest=self.guest,
+                unit=unit,
+                check_in_date=check_in,
+                check_out_date=check_in + timedelta(days=nights),
+                status=status,
+                total_price=total,
+            )
+
+    def kpi(self, day):
+        return DailyKPI.objects.get(property=self.property, date=day)
+
+    def test_booking_updates_daily_rows(self):
+        self.book(self.units[0], self.today, 2, Decimal("50.00"))
+
+        today = self.kpi(self.today)
+        self.assertEqual(today.units, 4)
+        self.assertEqual(today.occupied, 1)
+        self.assertEqual(today.revenue, Decimal("25.00"))
+        self.assertEqual(today.arrivals, 1)
+
+        checkout = self.kpi(self.today + timedelta(days=2))
+        self.assertEqual(checkout.occupied, 0)
+        self.assertEqual(checkout.departures, 1)
+
+    def test_moving_a_booking_releases_the_previous_dates(self):
+        booking = self.book(self.units[0], self.today, 1, Decimal("20.00"))
+
+        booking.check_in_date = self.today + timedelta(days=5)
+        booking.check_out_date = self.today + timedelta(days=6)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+
+        self.assertEqual(self.kpi(self.today).occupied, 0)
+        self.assertEqual(self.kpi(self.today).arrivals, 0)
+        self.assertEqual(self.kpi(self.today + timedelta(days=5)).occupied, 1)
+
+    def test_cancelled_bookings_are_not_counted(self):
+        booking = self.book(self.units[0], self.today, 1, Decimal("20.00"))
+        booking.status = "CANCELLED"
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+
+        today = self.kpi(self.today)
+        self.assertEqual((today.occupied, today.arrivals), (0, 0))
+
+    def test_payments_update_pending_and_cash(self):
+        booking = self.book(self.units[0], self.today, 2, Decimal("50.00"))
+        summary = PropertyKPI.objects.get(property=self.property)
+        self.assertEqual(summary.pending_bookings, 1)
+        self.assertEqual(summary.pending_amount, Decimal("50.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(
+                booking=booking,
+                amount=Decimal("30.00"),
+                payment_method="CASH",
+                status="COMPLETED",
+                created_by=self.user,
+            )
+
+        summary.refresh_from_db()
+        self.assertEqual(summary.pending_amount, Decimal("20.00"))
+        self.assertEqual(summary.cash_balance, Decimal("30.00"))
+
+    def test_signals_only_apply_the_changed_booking(self):
+        booking = self.book(self.units[0], self.today, 2, Decimal("50.00"))
+        # Reserva cargada sin señales: las diferencias no la recorren
+        Booking.objects.bulk_create(
+            [
+                Booking(
+                    guest=self.guest,
+                    unit=self.units[1],
+                    check_in_date=self.today,
+                    check_out_date=self.today + timedelta(days=1),
+                    status="CONFIRMED",
+                    total_price=Decimal("20.00"),
+                )
+            ]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(
+                booking=booking,
+                amount=Decimal("10.00"),
+                payment_method="CASH",
+                status="COMPLETED",
+                created_by=self.user,
+            )
+
+        summary = PropertyKPI.objects.get(property=self.property)
+        self.assertEqual(summary.pending_bookings, 1)
+        self.assertEqual(summary.pending_amount, Decimal("40.00"))
+        self.assertEqual(self.kpi(self.today).arrivals, 1)
+
+        call_command("rebuild_kpis", stdout=StringIO())
+        summary.refresh_from_db()
+        self.assertEqual(summary.pending_bookings, 2)
+        self.assertEqual(summary.pending_amount, Decimal("60.00"))
+        self.assertEqual(self.kpi(self.today).arrivals, 2)
+
+    def test_deltas_match_a_full_rebuild(self):
+        kept = self.book(self.units[0], self.today, 3, Decimal("100.00"))
+        moved = self.book(self.units[1], self.today, 2, Decimal("45.00"))
+        cancelled = self.book(self.units[2], self.today, 1, Decimal("20.00"))
+        deleted = self.book(self.units[3], self.today, 2, Decimal("30.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            payment = Payment.objects.create(
+                booking=kept,
+                amount=Decimal("60.00"),
+                payment_method="CASH",
+                status="COMPLETED",
+                created_by=self.user,
+            )
+            refund = payment.refund(amount=Decimal("10.00"), user=self.user)
+            refund.mark_as_completed()
+            moved.check_in_date += timedelta(days=1)
+            moved.check_out_date += timedelta(days=2)
+            moved.save()
+            cancelled.status = "CANCELLED"
+            cancelled.save()
+            deleted.delete()
+
+        def snapshot():
+            daily = DailyKPI.objects.order_by("date").values_list(
+                "date", "occupied", "revenue", "arrivals", "departures"
+            )
+            summary = PropertyKPI.objects.values_list(
+                "pending_bookings", "pending_amount", "cash_balance"
+            )
+            return [row for row in daily if any(row[1:])], list(summary)
+
+        incremental = snapshot()
+        call_command("rebuild_kpis", stdout=StringIO())
+        self.assertEqual(snapshot(), incremental)
+        self.assertEqual(
+            incremental[1], [(2, Decimal("95.00"), Decimal("50.00"))]
+        )  # noqa
+
+    def test_dashboard_metrics(self):
+        self.book(self.units[0], self.today, 1, Decimal("40.00"))
+        self.book(self.units[1], self.today, 1, Decimal("20.00"))
+
+        row = dashboard_kpis(self.today)[0]
+        self.assertEqual(row["occupancy"], Decimal("50.00"))
+        self.assertEqual(row["adr"], Decimal("30.00"))
+        self.assertEqual(row["revpar"], Decimal("15.00"))
+        self.assertEqual(row["arrivals"], 2)
+
+    def test_period_counts_days_without_rows(self):
+        # Una sola noche en el período: los demás días no tienen fila
+        self.book(self.units[0], self.today, 1, Decimal("60.00"))
+        self.assertEqual(
+            DailyKPI.objects.filter(property=self.property).count(), 2
+        )  # noqa
+
+        row = dashboard_kpis(self.today)[0]
+        # 1 noche ocupada sobre 4 unidades x 30 días
+        self.assertEqual(row["period_occupancy"], Decimal("0.83"))
+        self.assertEqual(row["period_revpar"], Decimal("0.50"))
+        self.assertEqual(row["period_adr"], Decimal("60.00"))
+
+    def test_dashboard_queries_do_not_grow_with_history(self):
+        # Dos años de historial ya agregado
+        refresh_daily_kpis(self.today - timedelta(days=730), self.today)
+        other = Property.objects.create(name="Hotel", property_type="HOTEL")
+        refresh_daily_kpis(
+            self.today - timedelta(days=730), self.today, properties=[other.pk]
+        )
+
+        self.client.force_login(self.user)
+        with self.assertNumQueries(6):
+            # Sesión, usuario, propiedades, día, período y saldo de caja
+            response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "Hostel Example")
+        self.assertContains(response, "Hotel")
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("exports/<str:kind>.csv", views.export_csv, name="export_csv"),
+]
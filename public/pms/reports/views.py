@@ -0,0 +1,45 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    StreamingHttpResponse,
+)
+from django.utils.dateparse import parse_date
+
+from .exports import EXPORTS, export_rows
+
+
+def _parse(value):
+    """Fecha AAAA-MM-DD opcional; ValueError si no es válida."""
+    if not value:
+        return None
+    parsed = parse_date(value)  # ValueError con fechas como 2024-02-30
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+@staff_member_required
+def export_csv(request, kind):
+    """
+    Descarga en CSV de pagos, movimientos de caja o reservas.
+
+    La respuesta se genera en streaming a medida que se leen las filas,
+    con memoria constante sin importar el rango exportado.
+    """
+    if kind not in EXPORTS:
+        raise Http404
+    try:
+        start = _parse(request.GET.get("start"))
+        end = _parse(request.GET.get("end"))
+    except ValueError:
+        return HttpResponseBadRequest("Fecha inválida (AAAA-MM-DD)")
+
+    response = StreamingHttpResponse(
+        export_rows(kind, start, end), content_type="text/csv"
+    )
+    suffix = f"_{start or ''}_{end or ''}" if start or end else ""
+    response["Content-Disposition"] = (
+        f'attachment; filename="{kind}{suffix}.csv"'  # noqa
+    )
+    return response
@@ -43,6 +43,7 @@ class RoomAdmin(admin.ModelAdmin):
         "is_active",
         "created_at",
     )
+    list_select_related = ("property",)
     list_filter = ("property", "room_type", "is_active")
     search_fields = ("name", "description", "property__name")
     date_hierarchy = "created_at"
@@ -69,6 +70,7 @@ class RoomAdmin(admin.ModelAdmin):
 @admin.register(Unit)
 class UnitAdmin(admin.ModelAdmin):
     list_display = ("name", "unit_type", "room", "is_active", "created_at")  # noqa
+    list_select_related = ("room",)
     list_filter = ("unit_type", "room__property", "room", "is_active")  # noqa
     search_fields = ("name", "room__name", "room__property__name")
     date_hierarchy = "created_at"
@@ -97,6 +99,7 @@ class PlanAdmin(admin.ModelAdmin):
         "is_active",
         "created_at",
     )  # noqa
+    list_select_related = ("room",)
     list_filter = ("room__property", "room", "is_active")
     search_fields = ("name", "room__name", "room__property__name")
     date_hierarchy = "created_at"
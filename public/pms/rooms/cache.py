@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Plan, Property, Room, Unit
+
+# Clave con la versión vigente de los datos de referencia. Cada cambio la
+# incrementa, con lo que las entradas anteriores (de ambos niveles) dejan
+# de usarse sin tener que borrarlas una por una
+VERSION_KEY = "rooms:version"
+
+RoomInfo = namedtuple(
+    "RoomInfo",
+    [
+        "id",
+        "property_id",
+        "name",
+        "room_type",
+        "capacity",
+        "base_price",
+        "is_active",
+        "property_is_active",
+    ],
+)
+
+UnitInfo = namedtuple(
+    "UnitInfo", ["id", "room_id", "name", "unit_type", "is_active"]
+)  # noqa
+
+PlanInfo = namedtuple(
+    "PlanInfo", ["id", "name", "start_date", "end_date", "price"]
+)  # noqa
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Si el backend descartó la versión se arranca de un valor nuevo
+        # (la hora actual) para no reutilizar entradas de una versión vieja
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate():
+    """
+    Descarta los datos de referencia cacheados en todos los procesos que
+    comparten el backend de caché.
+
+    Se llama desde las señales de rooms.models; las escrituras masivas
+    (QuerySet.update() o bulk_create()) deben llamarla explícitamente.
+    """
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+    for reference in (ROOMS, UNITS, PLANS):
+        reference.clear()
+
+
+class ReferenceCache:
+    """
+    Caché de dos niveles para datos de referencia que cambian poco.
+
+    El primer nivel es un LRU en memoria del proceso y el segundo el
+    backend de caché de Django (compartido entre procesos si se configura
+    uno, ver CACHES). Las claves incluyen la versión vigente, por lo que
+    una invalidación deja obsoletos ambos niveles a la vez. Los faltantes
+    se cargan de la base de datos en una sola consulta con `loader`, que
+    recibe una lista de IDs y devuelve {id: valor}.
+
+    Ejemplo:
+        ROOMS.get_many([1, 2])  # {1: RoomInfo(...), 2: RoomInfo(...)}
+        ROOMS.get(1)
+    """
+
+    def __init__(self, name, loader, maxsize=None):
+        self.name = name
+        self.loader = loader
+        self.maxsize = maxsize or settings.ROOMS_CACHE_LOCAL_SIZE
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, version, pk):
+        return f"rooms:{self.name}:{version}:{pk}"
+
+    def get(self, pk):
+        return self.get_many([pk]).get(pk)
+
+    def get_many(self, ids):
+        version = get_version()
+        found = {}
+        missing = []
+        with self._lock:
+            for pk in ids:
+                local_key = (version, pk)
+                if local_key in self._local:
+                    self._local.move_to_end(local_key)
+                    found[pk] = self._local[local_key]
+                else:
+                    missing.append(pk)
+        if not missing:
+            return found
+
+        keys = {self.key(version, pk): pk for pk in missing}
+        loaded = {
+            keys[key]: value for key, value in cache.get_many(keys).items()
+        }  # noqa
+        missing = [pk for pk in missing if pk not in loaded]
+        if missing:
+            fresh = self.loader(missing)
+            cache.set_many(
+                {self.key(version, pk): value for pk, value in fresh.items()},
+                timeout=settings.ROOMS_CACHE_TIMEOUT,
+            )
+            loaded.update(fresh)
+
+        with self._lock:
+            for pk, value in loaded.items():
+                self._local[(version, pk)] = value
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+        found.update(loaded)
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+def load_rooms(ids):
+    return {
+        values[0]: RoomInfo(*values)
+        for values in Room.objects.filter(pk__in=ids).values_list(
+            "pk",
+            "property_id",
+            "name",
+            "room_type",
+            "capacity",
+            "base_price",
+            "is_active",
+            "property__is_active",
+        )
+    }
+
+
+def load_units(ids):
+    return {
+        values[0]: UnitInfo(*values)
+        for values in Unit.objects.filter(pk__in=ids).values_list(
+            "pk", "room_id", "name", "unit_type", "is_active"
+        )
+    }
+
+
+def load_plans(room_ids):
+    """Planes activos por habitación, en el orden por defecto (nombre)."""
+    plans = {room_id: [] for room_id in room_ids}
+    for room_id, *values in Plan.objects.filter(
+        room_id__in=room_ids, is_active=True
+    ).values_list("room_id", "pk", "name", "start_date", "end_date", "price"):
+        plans[room_id].append(PlanInfo(*values))
+    return plans
+
+
+ROOMS = ReferenceCache("room", load_rooms)
+UNITS = ReferenceCache("unit", load_units)
+PLANS = ReferenceCache("plans", load_plans)
+
+
+def room_ids_for_units(units):
+    """
+    {unit_id: room_id} para unidades (instancias o IDs), sin consultar
+    las que ya traen room_id.
+    """
+    rooms = {}
+    missing = []
+    for unit in units:
+        if isinstance(unit, Unit):
+            rooms[unit.pk] = unit.room_id
+        else:
+            missing.append(unit)
+    if missing:
+        for pk, info in UNITS.get_many(missing).items():
+            rooms[pk] = info.room_id
+    return rooms
+
+
+def property_of_unit(unit_id):
+    """ID de la propiedad de la unidad, o None si la unidad no existe."""
+    unit = UNITS.get(unit_id)
+    room = ROOMS.get(unit.room_id) if unit else None
+    return room.property_id if room else None
+
+
+def invalidate_on_change(sender, **kwargs):
+    invalidate()
+    # Una lectura concurrente pudo volver a cachear los datos anteriores
+    # antes de confirmarse la transacción
+    transaction.on_commit(invalidate)
+
+
+def connect_signals():
+    for model in (Property, Room, Unit, Plan):
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate_on_change,
+                sender=model,
+                dispatch_uid=f"rooms_cache_{model._meta.model_name}",
+            )
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -245,39 +247,46 @@ class Plan(models.Model):
 
     @staticmethod
     def _get_active_plan(unit, start_date, end_date):
-        if not unit.room or not start_date or not end_date:
+        """
+        Primer plan activo (por nombre) que se superpone con el rango.
+
+        Los planes salen de la caché de datos de referencia (rooms.cache),
+        por lo que devuelve un PlanInfo con id, name, fechas y price.
+        """
+        from .cache import PLANS
+
+        if not unit.room_id or not start_date or not end_date:
             return None
 
-        return Plan.objects.filter(
-            room=unit.room,
-            start_date__lte=end_date,
-            end_date__gte=start_date,
-            is_active=True,
-        ).first()
+        for plan in PLANS.get(unit.room_id):
+            if plan.start_date <= end_date and plan.end_date >= start_date:
+                return plan
+        return None
 
     @staticmethod
     def get_price_room(unit, start_date, end_date):
+        from .cache import ROOMS
+
         # Use the helper method to get the active plan
         plan = Plan._get_active_plan(unit, start_date, end_date)
 
         # Return the plan's price if found, otherwise the room's base price
-        return plan.price if plan else unit.room.base_price
+        return plan.price if plan else ROOMS.get(unit.room_id).base_price
 
     @staticmethod
     def get_total_price(unit, start_date, end_date):
-        # Calculate the number of days in the reservation
-        num_days = (end_date - start_date).days + 1  # Include the start date
-
-        # Use the helper method to get the active plan
-        plan = Plan._get_active_plan(unit, start_date, end_date)
-
-        # Determine the price per day (use plan price
-        # if available, otherwise room base price)
-        price_per_day = plan.price if plan else unit.room.base_price
-
-        # Calculate and return the total price for the reservation
-        total_price = price_per_day * num_days
-        return total_price
+        """
+        Precio total de la reserva sumando el precio de cada día.
+
+        Cada día se cotiza con el plan activo que lo cubre (o el precio
+        base de la habitación), por lo que una estadía que abarca dos
+        planes se cotiza correctamente.
+        """
+        from .pricing import RateCalendar
+
+        # Include the start and end dates
+        end = end_date + timedelta(days=1)
+        return RateCalendar([unit], start_date, end).total(unit)
 
     def clean(self):
         """Validaciones personalizadas para el plan"""
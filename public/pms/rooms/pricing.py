@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from .cache import PLANS, ROOMS, room_ids_for_units
+from .models import Unit
+
+
+class RateCalendar:
+    """
+    Calendario de tarifas por noche para muchas unidades a la vez.
+
+    Toma las habitaciones y los planes activos de la caché de datos de
+    referencia (rooms.cache), que carga los faltantes en una sola
+    consulta por tipo, y resuelve el
+    precio de cada noche del rango [start_date, end_date) por habitación:
+    el precio del plan activo que cubre la noche o, si no hay ninguno, el
+    precio base de la habitación. Las unidades de una misma habitación
+    comparten el mismo arreglo de precios. Las unidades pueden pasarse
+    como instancias o como IDs.
+
+    Ejemplo:
+        calendar = RateCalendar(units, check_in, check_out)
+        calendar.total(unit)      # Precio total de la estadía
+        calendar.breakdown(unit)  # [(fecha, precio), ...]
+    """
+
+    def __init__(self, units, start_date, end_date):
+        if start_date >= end_date:
+            raise ValueError(
+                "La fecha de inicio debe ser anterior a la fecha de fin",
+            )
+
+        self.start_date = start_date
+        self.end_date = end_date
+        self.nights = (end_date - start_date).days
+        self.dates = [
+            start_date + timedelta(days=offset) for offset in range(self.nights)  # noqa
+        ]
+
+        units = list(units)
+        self._room_by_unit = room_ids_for_units(units)
+        self._rates = self._resolve(self._base_prices(units))
+
+    def _base_prices(self, units):
+        """Precio base por habitación, buscando en la caché las no cargadas."""
+        prices = {}
+        for unit in units:
+            if isinstance(unit, Unit) and Unit.room.is_cached(unit):
+                prices[unit.room_id] = unit.room.base_price
+
+        missing = set(self._room_by_unit.values()) - set(prices)
+        for room_id, room in ROOMS.get_many(missing).items():
+            prices[room_id] = room.base_price
+        return prices
+
+    def _resolve(self, base_prices):
+        """Arma el arreglo de precios por noche de cada habitación."""
+        rates = {room_id: [None] * self.nights for room_id in base_prices}
+
+        # Con el orden por defecto (nombre) gana el mismo plan que
+        # devolvería Plan._get_active_plan() ante una superposición
+        for room_id, plans in PLANS.get_many(list(base_prices)).items():
+            nightly = rates[room_id]
+            for plan in plans:
+                if plan.start_date >= self.end_date:
+                    continue
+                if plan.end_date < self.start_date:
+                    continue
+                first = max((plan.start_date - self.start_date).days, 0)
+                last = min(
+                    (plan.end_date - self.start_date).days + 1, self.nights
+                )  # noqa
+                for offset in range(first, last):
+                    if nightly[offset] is None:
+                        nightly[offset] = plan.price
+
+        for room_id, nightly in rates.items():
+            base_price = base_prices[room_id]
+            rates[room_id] = [
+                base_price if price is None else price for price in nightly
+            ]
+        return rates
+
+    def prices(self, unit):
+        """Lista de precios por noche de la unidad."""
+        return self._rates[self._room_by_unit[getattr(unit, "pk", unit)]]
+
+    def breakdown(self, unit):
+        """Lista de pares (fecha, precio) de la unidad."""
+        return list(zip(self.dates, self.prices(unit)))
+
+    def total(self, unit):
+        """Precio total de la estadía de la unidad."""
+        return sum(self.prices(unit))
+
+    def totals(self):
+        """Precio total por unidad: {unit_id: total}."""
+        return {unit_id: self.total(unit_id) for unit_id in self._room_by_unit}
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rooms.models import Plan, Property, Room, Unit
+
+
+class RoomsAdminQueriesTest(TestCase):
+    """Los changelists usan la misma cantidad de consultas sin importar
+    cuántas filas muestran."""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="secret123"
+        )  # noqa
+        self.client.force_login(self.user)
+        self.seeded = 0
+
+    def seed(self, count):
+        for _ in range(count):
+            i = self.seeded = self.seeded + 1
+            prop = Property.objects.create(
+                name=f"Hostel {i}", property_type="HOSTEL"
+            )  # noqa
+            room = Room.objects.create(
+                property=prop,
+                name=f"Dorm {i}",
+                room_type="DORM",
+                capacity=4,
+                base_price=20,
+            )
+            Unit.objects.create(name=f"{i}", room=room)
+            Plan.objects.create(
+                name=f"Plan {i}",
+                room=room,
+                start_date=date.today(),
+                end_date=date.today() + timedelta(days=30),
+                price=25,
+            )
+
+    def changelist_queries(self, model):
+        url = reverse(f"admin:rooms_{model}_changelist")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def assertConstantQueries(self, model):
+        self.seed(2)
+        few = self.changelist_queries(model)
+        self.seed(20)
+        self.assertEqual(self.changelist_queries(model), few)
+
+    def test_property_changelist(self):
+        self.assertConstantQueries("property")
+
+    def test_room_changelist(self):
+        self.assertConstantQueries("room")
+
+    def test_unit_changelist(self):
+        self.assertConstantQueries("unit")
+
+    def test_plan_changelist(self):
+        self.assertConstantQueries("plan")
@@ -0,0 +1,107 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from rooms import cache as reference
+from rooms.models import Plan, Property, Room, Unit
+from rooms.pricing import RateCalendar
+
+
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference.invalidate()
+
+        self.property = Property.objects.create(
+            name="Resort Example", property_type="RESORT"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Room 101",
+            room_type="PRIVATE_ROOM",
+            base_price=Decimal("100.00"),
+        )
+        self.unit = Unit.objects.create(room=self.room, name="1")
+        self.plan = Plan.objects.create(
+            name="Enero",
+            room=self.room,
+            price=Decimal("150.00"),
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 1, 31),
+        )
+        self.check_in = datetime.date(2025, 1, 30)
+        self.check_out = datetime.date(2025, 2, 2)
+
+    def total(self):
+        return RateCalendar(
+            [self.unit.pk], self.check_in, self.check_out
+        ).total(  # noqa
+            self.unit.pk
+        )
+
+    def test_cached_after_first_read(self):
+        with self.assertNumQueries(3):
+            self.assertEqual(self.total(), Decimal("400.00"))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.total(), Decimal("400.00"))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                Plan.get_price_room(
+                    self.unit,
+                    datetime.date(2025, 1, 5),
+                    datetime.date(2025, 1, 6),  # noqa
+                ),
+                Decimal("150.00"),
+            )
+
+    def test_shared_backend_survives_local_clear(self):
+        self.total()
+        reference.ROOMS.clear()
+        reference.UNITS.clear()
+        reference.PLANS.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.total(), Decimal("400.00"))
+
+    def test_invalidated_on_room_change(self):
+        self.total()
+        self.room.base_price = Decimal("80.00")
+        self.room.save()
+        self.assertEqual(self.total(), Decimal("380.00"))
+
+    def test_invalidated_on_plan_changes(self):
+        self.total()
+        Plan.objects.create(
+            name="Febrero",
+            room=self.room,
+            price=Decimal("120.00"),
+            start_date=datetime.date(2025, 2, 1),
+            end_date=datetime.date(2025, 2, 28),
+        )
+        self.assertEqual(self.total(), Decimal("420.00"))
+
+        self.plan.delete()
+        self.assertEqual(self.total(), Decimal("320.00"))
+
+    def test_property_of_unit(self):
+        self.assertEqual(
+            reference.property_of_unit(self.unit.pk), self.property.pk
+        )  # noqa
+        self.assertIsNone(reference.property_of_unit(0))
+
+    def test_local_lru_is_bounded(self):
+        rooms = reference.ReferenceCache(
+            "test", reference.load_rooms, maxsize=1
+        )  # noqa
+        other = Room.objects.create(
+            property=self.property, name="Room 102", room_type="PRIVATE_ROOM"
+        )
+        rooms.get_many([self.room.pk, other.pk])
+        self.assertEqual(len(rooms._local), 1)
+
+    def test_lost_version_does_not_reuse_entries(self):
+        self.total()
+        cache.delete(reference.VERSION_KEY)
+        Room.objects.filter(pk=self.room.pk).update(base_price=Decimal("80.00"))  # noqa
+        self.assertEqual(self.total(), Decimal("380.00"))
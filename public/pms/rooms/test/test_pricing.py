@@ -0,0 +1,103 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+
+from rooms.models import Plan, Property, Room, Unit
+from rooms.pricing import RateCalendar
+
+
+class RateCalendarTest(TestCase):
+    def setUp(self):
+        self.property = Property.objects.create(
+            name="Resort Example", property_type="RESORT"
+        )
+        self.room = Room.objects.create(
+            property=self.property,
+            name="Room 101",
+            room_type="PRIVATE_ROOM",
+            base_price=Decimal("100.00"),
+        )
+        self.other_room = Room.objects.create(
+            property=self.property,
+            name="Dorm 1",
+            room_type="DORM",
+            base_price=Decimal("20.00"),
+        )
+        self.unit = Unit.objects.create(room=self.room, name="1")
+        self.other_unit = Unit.objects.create(room=self.other_room, name="1")
+
+        Plan.objects.create(
+            name="Enero",
+            room=self.room,
+            price=Decimal("150.00"),
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 1, 31),
+        )
+        Plan.objects.create(
+            name="Febrero",
+            room=self.room,
+            price=Decimal("120.00"),
+            start_date=datetime.date(2025, 2, 1),
+            end_date=datetime.date(2025, 2, 10),
+        )
+
+    def test_stay_spanning_two_plans_and_base_price(self):
+        calendar = RateCalendar(
+            [self.unit], datetime.date(2025, 1, 30), datetime.date(2025, 2, 13)
+        )
+        prices = calendar.prices(self.unit)
+        self.assertEqual(prices[:2], [Decimal("150.00")] * 2)
+        self.assertEqual(prices[2:12], [Decimal("120.00")] * 10)
+        self.assertEqual(prices[12:], [Decimal("100.00")] * 2)
+        self.assertEqual(calendar.total(self.unit), Decimal("1700.00"))
+        self.assertEqual(
+            calendar.breakdown(self.unit)[0],
+            (datetime.date(2025, 1, 30), Decimal("150.00")),
+        )
+
+    def test_inactive_plans_are_ignored(self):
+        Plan.objects.filter(name="Enero").update(is_active=False)
+        calendar = RateCalendar(
+            [self.unit], datetime.date(2025, 1, 10), datetime.date(2025, 1, 12)
+        )
+        self.assertEqual(calendar.total(self.unit), Decimal("200.00"))
+
+    def test_many_units_are_quoted_with_one_query(self):
+        units = [self.unit, self.other_unit]
+        for i in range(2, 50):
+            units.append(Unit.objects.create(room=self.room, name=f"{i}"))
+        # Las habitaciones ya están cargadas: solo se consultan los planes
+        with self.assertNumQueries(1):
+            calendar = RateCalendar(
+                units, datetime.date(2025, 1, 31), datetime.date(2025, 2, 2)
+            )
+        totals = calendar.totals()
+        self.assertEqual(totals[self.unit.pk], Decimal("270.00"))
+        self.assertEqual(totals[self.other_unit.pk], Decimal("40.00"))
+
+    def test_missing_rooms_are_loaded_in_one_query(self):
+        units = list(Unit.objects.all())
+        with self.assertNumQueries(2):
+            # Una consulta para las habitaciones y otra para los planes
+            calendar = RateCalendar(
+                units, datetime.date(2025, 1, 1), datetime.date(2025, 1, 2)
+            )
+        self.assertEqual(calendar.total(self.other_unit), Decimal("20.00"))
+
+    def test_preloaded_rooms_only_need_the_plan_query(self):
+        units = Unit.objects.select_related("room")
+        with self.assertNumQueries(2):
+            # Una consulta para las unidades y otra para los planes
+            RateCalendar(
+                units,
+                datetime.date(2025, 1, 1),
+                datetime.date(2025, 1, 5),
+            )
+
+    def test_get_total_price_uses_nightly_rates(self):
+        total = Plan.get_total_price(
+            self.unit, datetime.date(2025, 1, 31), datetime.date(2025, 2, 1)
+        )
+        # Incluye el día de inicio y el de fin
+        self.assertEqual(total, Decimal("270.00"))